@@ -1,5 +1,4 @@
 import os
-print("RUNNING APP:", os.path.abspath(__file__))
 
 # -------------------------------------------------
 # Project root toevoegen aan PYTHONPATH
@@ -17,14 +16,30 @@ if str(PROJECT_ROOT) not in sys.path:
 # -------------------------------------------------
 import json
 import hashlib
-import os
-import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 import streamlit as st
 
-from core.llm import call_peet_text
+from core.llm import call_peet_text, stream_peet_text
+from core.json_utils import IncrementalJSONParser
+from peet_engine.shared.image_store import variant_path
+from peet_engine.shared.parsing import parse_ingredients
 from peet_engine.engine import plan
-from peet_engine.render_pdf import build_plan_pdf
-from core.image_generator import generate_food_image
+from peet_engine.render_pdf import (
+    build_plan_pdf,
+    cached_plan_pdf_bytes,
+    pdf_cache_key,
+    pdf_filename,
+    render_plan_pdf_bytes,
+)
+from core.image_generator import get_image_service
+from core.logging_utils import get_logger, log_payload, log_stage
+from core.tracing import render_trace_panel, span, trace_request
+
+
+log = get_logger("card")
+log.debug("app geladen: %s", os.path.abspath(__file__))
 
 
 # -------------------------------------------------
@@ -204,6 +219,77 @@ def fetch_peet_choice(context_text: str):
     return call_peet_text(context_text)
 
 
+# -------------------------------------------------
+# Streaming LLM call (live opbouw van de kaart)
+# -------------------------------------------------
+STREAM_ENABLED = os.getenv("PEET_CARD_STREAM", "1") != "0"
+
+# PDF in het geheugen (PEET_PDF_IN_MEMORY=0 → oude output/-bestanden)
+PDF_IN_MEMORY = os.getenv("PEET_PDF_IN_MEMORY", "1") != "0"
+
+# Afbeelding al op de achtergrond maken zodra het gerecht bekend is.
+# Standaard uit: elke prefetch is een betaalde gpt-image-1 call, ook als
+# de bezoeker nooit om een afbeelding vraagt (PEET_IMAGE_PREFETCH=1 → aan)
+IMAGE_PREFETCH = os.getenv("PEET_IMAGE_PREFETCH", "0") == "1"
+
+# PDF pas maken als erom gevraagd wordt (PEET_PDF_LAZY=0 → direct, zoals eerst)
+PDF_LAZY = os.getenv("PEET_PDF_LAZY", "1") != "0"
+PDF_WORKERS = int(os.getenv("PEET_PDF_WORKERS", "2"))
+
+
+def stream_peet_choice(context_text: str, slot) -> str:
+    """
+    Streamt het antwoord en toont de kaart terwijl hij binnenkomt:
+    naam, kooktijd en voeding zodra compleet, ingrediënten en
+    stappen per stuk. Geeft de volledige tekst terug.
+    """
+    parser = IncrementalJSONParser()
+    live = {"ingredients": [], "steps": []}
+
+    for chunk in stream_peet_text(context_text):
+        events = parser.feed(chunk)
+
+        if not events:
+            continue
+
+        for kind, key, value in events:
+            if kind == "item" and key in live:
+                live[key].append(value)
+
+        render_live_card(slot, parser.fields, live)
+
+    return parser.text
+
+
+def render_live_card(slot, fields, live):
+    with slot.container():
+        dish_name = fields.get("dish_name")
+        if isinstance(dish_name, str) and dish_name.strip():
+            st.subheader(dish_name.strip())
+        else:
+            st.info("Peet is een gerecht aan het kiezen…")
+
+        cook_time = fields.get("cook_time")
+        if isinstance(cook_time, dict) and cook_time.get("min"):
+            st.caption(f"⏱️ {cook_time.get('min')}–{cook_time.get('max')} min")
+
+        nutrition = fields.get("nutrition")
+        if isinstance(nutrition, dict) and nutrition.get("calories_kcal"):
+            st.caption(f"🔥 {nutrition.get('calories_kcal')} kcal per persoon")
+
+        if live["ingredients"]:
+            st.markdown("**Ingrediënten**")
+            for ing in live["ingredients"]:
+                if isinstance(ing, dict) and ing.get("item"):
+                    st.markdown(f"- {ing.get('amount', '')} {ing['item']}".replace("-  ", "- "))
+
+        if live["steps"]:
+            st.markdown("**Bereiding**")
+            for i, step in enumerate(live["steps"], 1):
+                if isinstance(step, str) and step.strip():
+                    st.markdown(f"{i}. {step.strip()}")
+
+
 
 # -------------------------------------------------
 # JSON parser (Peet Card contract)
@@ -240,17 +326,9 @@ def parse_llm_output(raw_llm):
 
             data = json.loads(raw_llm)
 
-            print("\n===== LLM JSON OUTPUT =====")
-            print(json.dumps(data, indent=2, ensure_ascii=False))
-            print("==========================\n")
-
         elif isinstance(raw_llm, dict):
             data = raw_llm
 
-            print("\n===== LLM JSON OUTPUT =====")
-            print(json.dumps(data, indent=2, ensure_ascii=False))
-            print("==========================\n")
-
         else:
             return (
                 dish_name,
@@ -264,6 +342,7 @@ def parse_llm_output(raw_llm):
 
 
     except Exception:
+        log.warning("LLM-output is geen geldige JSON")
         return (
             dish_name,
             ingredients_clean,
@@ -274,6 +353,9 @@ def parse_llm_output(raw_llm):
             cook_time_max,
         )
 
+    # alleen bij PEET_LOG_PAYLOADS=1 (en DEBUG), gesampled
+    log_payload(log, "llm json output", data)
+
 
     # -------------------------
     # Gerechtnaam
@@ -325,45 +407,11 @@ def parse_llm_output(raw_llm):
     # Ingrediënten (clean & contract-based)
     # -------------------------
 
-    raw_ingredients = data.get("ingredients", [])
-
-    ingredients_clean = []
-
-    if isinstance(raw_ingredients, list):
-
-        for ing in raw_ingredients:
-
-            if not isinstance(ing, dict):
-                continue
-
-            amount = str(ing.get("amount", "")).strip()
-            item = str(ing.get("item", "")).strip()
-            note = str(ing.get("note", "")).strip()
-
-            if not item:
-                continue
-
-            # safety: amount kort maken, rest naar note
-            m = re.match(r"^\s*([\d/.,\-–]+)\s*(g|ml|el|tl|stuk|stuks|teen|cm)?\s*(.*)$", amount, re.IGNORECASE)
-
-            if m:
-                num = (m.group(1) or "").strip()
-                unit = (m.group(2) or "").strip()
-                rest = (m.group(3) or "").strip()
-
-                amount = f"{num} {unit}".strip() if unit else num
-
-                rest = rest.strip(" ,()")
-                if rest:
-                    note = f"{note}, {rest}".strip(", ") if note else rest
-
-            if note:
-                item = f"{item} ({note})"
-
-            ingredients_clean.append({
-                "amount": amount,
-                "item": item
-            })
+    # safety: amount kort maken, rest naar note (gedeelde parser)
+    ingredients_clean = [
+        {"amount": ing.amount, "item": ing.label}
+        for ing in parse_ingredients(data.get("ingredients", []))
+    ]
 
 
     # -------------------------
@@ -478,17 +526,301 @@ def inject_css():
 #--------------------------------------------------
 # Extra helpers
 #--------------------------------------------------
+def _image_job(dish_name: str) -> Future:
+    """Future voor de afbeelding van dit gerecht (één per sessie per gerecht)."""
+    job = st.session_state.get("_image_job")
+
+    if job is None or job[0] != dish_name:
+        job = (dish_name, get_image_service().submit(dish_name))
+        st.session_state["_image_job"] = job
+
+    return job[1]
+
+
+@st.fragment(run_every=0.5)
+def _image_pending(dish_name: str) -> None:
+    """Placeholder; pollt tot de afbeelding klaar is (blokkeert de rerun niet)."""
+    if _image_job(dish_name).done():
+        st.rerun()
+
+    st.info("Peet zet het gerecht alvast op tafel…")
+
+
+# -------------------------------------------------
+# Lazy PDF (achtergrond-render, alleen op verzoek)
+# -------------------------------------------------
 @st.cache_resource(show_spinner=False)
-def async_generate_image(dish_name):
-    return generate_food_image(dish_name)
+def _pdf_pool() -> ThreadPoolExecutor:
+    # gedeeld door alle sessies; begrensd aantal render-threads
+    return ThreadPoolExecutor(max_workers=max(1, PDF_WORKERS), thread_name_prefix="peet-pdf")
+
+
+def _render_pdf_task(pdf_input: dict) -> bytes:
+    with log_stage(log, "pdf", with_image=bool(pdf_input.get("image_path")), lazy=True):
+        return render_plan_pdf_bytes(**pdf_input)
+
+
+def _submit_pdf(key: str, pdf_input: dict) -> Future:
+    """Eén render per sleutel per sessie (dubbel klikken = zelfde future)."""
+    jobs = st.session_state.setdefault("_pdf_jobs", {})
+
+    future = jobs.get(key)
+    if future is None:
+        future = _pdf_pool().submit(_render_pdf_task, pdf_input)
+        jobs.clear()  # oudere varianten (bv. zonder beeld) zijn niet meer nodig
+        jobs[key] = future
+
+    return future
+
+
+@st.fragment(run_every=0.5)
+def _pdf_pending(key: str) -> None:
+    """Goedkope placeholder; pollt tot de render klaar is."""
+    future = st.session_state.get("_pdf_jobs", {}).get(key)
+
+    if future is None or future.done():
+        st.rerun()  # hele pagina → downloadknop
+
+    st.button(
+        "PDF wordt klaargezet…",
+        disabled=True,
+        use_container_width=True,
+        key="pdf_pending",
+    )
+
+
+def render_pdf_download(dish_name: str, pdf_input: dict, key: Optional[str] = None) -> None:
+    """
+    Downloadknop zonder vooraf te renderen:
+    - al in cache → meteen downloaden
+    - anders eerst een 'Maak PDF'-knop; render op de achtergrond
+    Is de PDF eenmaal gevraagd, dan volgt een nieuwe variant (bv. met beeld) vanzelf.
+    """
+    key = key or pdf_cache_key(pdf_input)
+
+    pdf_bytes = cached_plan_pdf_bytes(key)
+
+    if pdf_bytes is None and st.session_state.get("pdf_requested"):
+        future = _submit_pdf(key, pdf_input)
+
+        if not future.done():
+            _pdf_pending(key)
+            return
+
+        try:
+            pdf_bytes = future.result()
+        except Exception:
+            log.exception("PDF render mislukt")
+            st.session_state.pop("_pdf_jobs", None)
+            st.error("De PDF kon niet gemaakt worden. Probeer het nog eens.")
+            st.session_state["pdf_requested"] = False
+            return
+
+    if not pdf_bytes:
+        if st.button("Maak PDF", use_container_width=True):
+            st.session_state["pdf_requested"] = True
+            _submit_pdf(key, pdf_input)
+            st.rerun()
+        return
+
+    downloaded = st.download_button(
+        "Download als PDF",
+        data=pdf_bytes,
+        file_name=pdf_filename(dish_name),
+        mime="application/pdf",
+        use_container_width=True,
+    )
+
+    if downloaded:
+        st.session_state["done"] = True
+        st.rerun()
+
+# -------------------------------------------------
+# View model (één keer per gerecht, reruns alleen renderen)
+# -------------------------------------------------
+@dataclass(frozen=True)
+class CardView:
+    """Alles wat het scherm en de PDF nodig hebben, afgeleid uit raw_llm + persons."""
+
+    dish_name: str
+    ingredients: List[Dict[str, str]]
+    preparation: List[str]
+    nutrition: Dict[str, Any]
+    cook_time_min: Any
+    cook_time_max: Any
+    calories_kcal: Optional[int]
+    persons: int
+
+    protein_g: float = 0
+    fat_g: float = 0
+    carbs_g: float = 0
+    protein_pct: int = 0
+    fat_pct: int = 0
+    carbs_pct: int = 0
+
+    # engine-plan, dag 1 verrijkt met de LLM-details
+    days: List[Dict[str, Any]] = field(default_factory=list)
+
+    # image_path → (pdf_input, cache-sleutel); zelfde pad = zelfde inhoud (image store)
+    _pdf: Dict[Optional[str], Tuple[dict, str]] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def kcal_per_person(self) -> Optional[int]:
+        if self.calories_kcal is None:
+            return None
+        return round(self.calories_kcal / self.persons)
+
+    def pdf(self, image_path: Optional[str]) -> Tuple[dict, str]:
+        """PDF-input + content-hash sleutel, per afbeelding één keer berekend."""
+        cached = self._pdf.get(image_path)
+
+        if cached is None:
+            pdf_input = dict(
+                dish_name=self.dish_name,
+                nutrition=self.nutrition,
+                ingredients=self.ingredients,
+                preparation=self.preparation,
+
+                cook_time_min=self.cook_time_min,
+                cook_time_max=self.cook_time_max,
+
+                calories_kcal=self.calories_kcal,
+                persons=self.persons,
+
+                protein_g=self.protein_g,
+                fat_g=self.fat_g,
+                carbs_g=self.carbs_g,
+
+                protein_pct=self.protein_pct,
+                fat_pct=self.fat_pct,
+                carbs_pct=self.carbs_pct,
+
+                image_path=image_path,
+            )
+            cached = self._pdf[image_path] = (pdf_input, pdf_cache_key(pdf_input))
+
+        return cached
+
+
+def build_card_view(raw_llm, persons: int, allergies: List[str], nogo: List[str]) -> CardView:
+    """Parse + kcal + macro's + engine-plan. Geen UI; dish_name leeg = parse mislukt."""
+
+    with log_stage(log, "parse"):
+        (
+            dish_name,
+            ingredients,
+            preparation,
+            calories,
+            nutrition,
+            cook_time_min,
+            cook_time_max,
+        ) = parse_llm_output(raw_llm)
+
+    # -------------------------
+    # Calorieën normaliseren
+    # -------------------------
+    calories_kcal = None
+    if calories is not None:
+        try:
+            calories_kcal = int(float(str(calories).strip()))
+        except Exception:
+            calories_kcal = None
+
+    if not dish_name:
+        return CardView(dish_name, ingredients, preparation, nutrition,
+                        cook_time_min, cook_time_max, calories_kcal, persons)
+
+    # -------------------------------------------------
+    # Engine call
+    # -------------------------------------------------
+    engine_context = {
+        "days": 1,
+        "persons": persons,
+        "dish_name": dish_name,
+        "allergies": allergies,
+        "nogo": nogo,
+    }
+
+    with span("plan"):
+        result = plan(engine_context)
+
+    days = result.get("days", [])
+
+    # Verrijk dag 1 met LLM details
+    if days:
+        days[0].update({
+            "dish_name": dish_name,
+            "ingredients": ingredients,
+            "steps": preparation,
+        })
+
+    # -------------------------
+    # Macro’s per persoon
+    # -------------------------
+    protein_total = float(nutrition.get("protein_g", 0) or 0)
+    fat_total = float(nutrition.get("fat_g", 0) or 0)
+    carbs_total = float(nutrition.get("carbs_g", 0) or 0)
+
+    protein_g = round(protein_total / persons, 1)
+    fat_g = round(fat_total / persons, 1)
+    carbs_g = round(carbs_total / persons, 1)
+
+    # -------------------------
+    # Macro percentages (altijd zelf berekend)
+    # -------------------------
+    protein_kcal = protein_g * 4
+    carbs_kcal = carbs_g * 4
+    fat_kcal = fat_g * 9
+
+    total_kcal_macros = protein_kcal + carbs_kcal + fat_kcal
+
+    if total_kcal_macros > 0:
+        protein_pct = round(protein_kcal / total_kcal_macros * 100)
+        fat_pct = round(fat_kcal / total_kcal_macros * 100)
+        carbs_pct = round(carbs_kcal / total_kcal_macros * 100)
+    else:
+        protein_pct = fat_pct = carbs_pct = 0
+
+    return CardView(
+        dish_name=dish_name,
+        ingredients=ingredients,
+        preparation=preparation,
+        nutrition=nutrition,
+        cook_time_min=cook_time_min,
+        cook_time_max=cook_time_max,
+        calories_kcal=calories_kcal,
+        persons=persons,
+        protein_g=protein_g,
+        fat_g=fat_g,
+        carbs_g=carbs_g,
+        protein_pct=protein_pct,
+        fat_pct=fat_pct,
+        carbs_pct=carbs_pct,
+        days=days,
+    )
+
+
+def get_card_view(raw_llm, persons: int, allergies: List[str], nogo: List[str]) -> CardView:
+    """
+    Memoized in st.session_state: reruns door knoppen (afbeelding, PDF,
+    download) hergebruiken het view model; alleen renderen kost nog tijd.
+    """
+    key = (raw_llm, persons, tuple(allergies), tuple(nogo))
+    cached = st.session_state.get("_card_view")
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    view = build_card_view(raw_llm, persons, allergies, nogo)
+    st.session_state["_card_view"] = (key, view)
+    return view
+
 
 # -------------------------------------------------
 # Main app
 # -------------------------------------------------
 
 def main():
-    calories = None
-
     # -------------------------
     # Page config (altijd bovenaan)
     # -------------------------
@@ -542,9 +874,13 @@ def main():
     st.markdown("<h1>Peet gaat voor je kiezen.</h1>", unsafe_allow_html=True)
     st.caption("Iedere dag weer anders. Iedere keer weer iets lekkers.")
 
+    # alleen met PEET_DEV=1
+    render_trace_panel()
+
     # Build context
     # -------------------------------------------------
-    llm_context = build_llm_context()
+    with log_stage(log, "context_build"):
+        llm_context = build_llm_context()
 
     # -------------------------------------------------
     # Kooktijd uit query interpreteren (voor UI)
@@ -565,12 +901,36 @@ def main():
 
         st.session_state["context_sig"] = context_sig
 
-        with st.spinner(
-            "We hebben meer dan 1 miljoen gerechten en Peet zoekt nu de allerlekkerste voor je uit…"
-        ):
-            st.session_state["raw_llm"] = fetch_peet_choice(llm_context)
+        raw = None
+
+        with log_stage(log, "llm", streaming=STREAM_ENABLED) as stage:
+            if STREAM_ENABLED:
+                live_slot = st.empty()
+                try:
+                    raw = stream_peet_choice(llm_context, live_slot)
+                except Exception:
+                    log.warning("streaming mislukt, terugval op gewone call", exc_info=True)
+                    raw = None
+                live_slot.empty()
+
+                # stream onbruikbaar → gewone (gecachete) call
+                if raw and not parse_llm_output(raw)[0]:
+                    raw = None
+
+            if not raw:
+                stage["fallback"] = STREAM_ENABLED
+                with st.spinner(
+                    "We hebben meer dan 1 miljoen gerechten en Peet zoekt nu de allerlekkerste voor je uit…"
+                ):
+                    raw = fetch_peet_choice(llm_context)
+
+        st.session_state["raw_llm"] = raw
 
         st.session_state.pop("pdf_path", None)
+        st.session_state.pop("pdf_requested", None)
+        st.session_state.pop("_pdf_jobs", None)
+        st.session_state.pop("image_path", None)
+        st.session_state.pop("show_image", None)
 
     raw_llm = st.session_state.get("raw_llm")
 
@@ -580,120 +940,25 @@ def main():
 
 
     # -------------------------------------------------
-    # Parse LLM output
+    # View model (parse + macro's + engine, één keer per gerecht)
     # -------------------------------------------------
+    persons = max(1, min(12, to_int(qp("persons", "2"), 2)))
 
-    (
-        dish_name,
-        ingredients,
-        preparation,
-        calories,
-        nutrition,
-        cook_time_min,
-        cook_time_max,
-    ) = parse_llm_output(raw_llm)
-
+    view = get_card_view(raw_llm, persons, to_list(qp("allergies")), to_list(qp("nogo")))
+    dish_name = view.dish_name
 
     if not dish_name:
         st.error("Er ging iets mis bij het verwerken van het gerecht.")
         return
 
-    # -------------------------
-    # Calorieën normaliseren
-    # -------------------------
-    calories_kcal = None
-    if calories is not None:
-        try:
-            calories_kcal = int(float(str(calories).strip()))
-        except Exception:
-            calories_kcal = None
-
+    # afbeelding alvast op de achtergrond (klaar tegen de tijd dat erom gevraagd wordt)
+    if IMAGE_PREFETCH:
+        _image_job(dish_name)
 
-    # -------------------------------------------------
-    # Engine call (persons eerst bepalen)
-    # -------------------------------------------------
-    persons = max(1, min(12, to_int(qp("persons", "2"), 2)))
-
-    engine_context = {
-        "days": 1,
-        "persons": persons,
-        "dish_name": dish_name,
-        "allergies": to_list(qp("allergies")),
-        "nogo": to_list(qp("nogo")),
-    }
-
-    result = plan(engine_context)
-
-    days = result.get("days", [])
-    days_count = result.get("days_count", len(days))
-
-    if not days:
+    if not view.days:
         st.error("Geen gerecht gegenereerd.")
         return
 
-    # Verrijk dag 1 met LLM details
-    days[0].update({
-        "dish_name": dish_name,
-        "ingredients": ingredients,
-        "steps": preparation,
-    })
-
-    # -------------------------
-    # Macro’s per persoon
-    # -------------------------
-    protein_total = float(nutrition.get("protein_g", 0) or 0)
-    fat_total = float(nutrition.get("fat_g", 0) or 0)
-    carbs_total = float(nutrition.get("carbs_g", 0) or 0)
-
-    protein_g = round(protein_total / persons, 1)
-    fat_g = round(fat_total / persons, 1)
-    carbs_g = round(carbs_total / persons, 1)
-
-    # -------------------------
-    # Macro percentages (altijd zelf berekend)
-    # -------------------------
-    protein_kcal = protein_g * 4
-    carbs_kcal = carbs_g * 4
-    fat_kcal = fat_g * 9
-
-    total_kcal_macros = protein_kcal + carbs_kcal + fat_kcal
-
-    if total_kcal_macros > 0:
-        protein_pct = round(protein_kcal / total_kcal_macros * 100)
-        fat_pct = round(fat_kcal / total_kcal_macros * 100)
-        carbs_pct = round(carbs_kcal / total_kcal_macros * 100)
-    else:
-        protein_pct = fat_pct = carbs_pct = 0
-
-    # -------------------------------------------------
-    # Engine call
-    # -------------------------------------------------
-    persons = max(1, min(12, to_int(qp("persons", "2"), 2)))
-
-    engine_context = {
-        "days": 1,
-        "persons": persons,
-        "dish_name": dish_name,
-        "allergies": to_list(qp("allergies")),
-        "nogo": to_list(qp("nogo")),
-    }
-
-    result = plan(engine_context)
-
-    days = result.get("days", [])
-    days_count = result.get("days_count", len(days))
-
-    if not days:
-        st.error("Geen gerecht gegenereerd.")
-        return
-
-    # Verrijk dag 1 met LLM details
-    days[0].update({
-        "dish_name": dish_name,
-        "ingredients": ingredients,
-        "steps": preparation,
-    })
-
     # -------------------------------------------------
     # Screen rendering
     # -------------------------------------------------
@@ -709,32 +974,40 @@ def main():
         st.session_state["image_path"] = None
 
     if st.button("Toon afbeelding van dit gerecht"):
+        st.session_state["show_image"] = True
 
-        with st.spinner("Peet zet het gerecht alvast op tafel…"):
-            image_path = async_generate_image(dish_name)
-            st.session_state["image_path"] = image_path
+    if st.session_state.get("show_image") and not st.session_state["image_path"]:
+        future = _image_job(dish_name)
+
+        if not future.done():
+            with img_slot.container():
+                _image_pending(dish_name)
+        else:
+            try:
+                st.session_state["image_path"] = future.result()
+            except Exception:
+                st.session_state["show_image"] = False
+                st.warning("De afbeelding lukt nu even niet.")
 
     if st.session_state["image_path"] and os.path.exists(st.session_state["image_path"]):
-        img_slot.image(st.session_state["image_path"], use_column_width=True)
+        img_slot.image(variant_path(st.session_state["image_path"], "screen"), use_container_width=True)
 
     image_path = st.session_state["image_path"]
 
     # -------------------------
     # Calorieën + macro’s
     # -------------------------
-    if calories_kcal is not None:
-
-        kcal_per_person = round(calories_kcal / persons)
+    if view.calories_kcal is not None:
 
         st.caption(
-            f"Bevat {calories_kcal} kcal totaal • ongeveer {kcal_per_person} kcal per persoon"
+            f"Bevat {view.calories_kcal} kcal totaal • ongeveer {view.kcal_per_person} kcal per persoon"
         )
 
         st.markdown(
             f"""
-    **Eiwit:** {protein_g} g ({protein_pct}%)  
-    **Vet:** {fat_g} g ({fat_pct}%)  
-    **Koolhydraten:** {carbs_g} g ({carbs_pct}%)
+    **Eiwit:** {view.protein_g} g ({view.protein_pct}%)  
+    **Vet:** {view.fat_g} g ({view.fat_pct}%)  
+    **Koolhydraten:** {view.carbs_g} g ({view.carbs_pct}%)
     """
         )
 
@@ -743,11 +1016,11 @@ def main():
     # -------------------------
     st.subheader(f"Ingrediënten (voor {persons} personen)")
 
-    if ingredients:
+    if view.ingredients:
 
         st.markdown('<div class="ingredients-list">', unsafe_allow_html=True)
 
-        for ing in ingredients:
+        for ing in view.ingredients:
 
             amount = ing.get("amount", "")
             item = ing.get("item", "")
@@ -773,18 +1046,18 @@ def main():
     # Bereiding + kooktijd
     # -------------------------
 
-    if cook_time_min and cook_time_max:
+    if view.cook_time_min and view.cook_time_max:
 
-        if cook_time_min == cook_time_max:
-            st.subheader(f"Zo pak je het aan (± {cook_time_max} min)")
+        if view.cook_time_min == view.cook_time_max:
+            st.subheader(f"Zo pak je het aan (± {view.cook_time_max} min)")
         else:
-            st.subheader(f"Zo pak je het aan (± {cook_time_min}–{cook_time_max} min)")
+            st.subheader(f"Zo pak je het aan (± {view.cook_time_min}–{view.cook_time_max} min)")
 
     else:
         st.subheader("Zo pak je het aan")
 
-    if preparation:
-        for step in preparation:
+    if view.preparation:
+        for step in view.preparation:
             if str(step).strip():
                 st.write(step)
     else:
@@ -796,33 +1069,42 @@ def main():
 
     has_image = bool(image_path and os.path.exists(image_path))
 
-    if (
-        "pdf_path" not in st.session_state
-        or (has_image and not st.session_state.get("_pdf_has_image", False))
-    ):
+    pdf_input, pdf_key = view.pdf(image_path if has_image else None)
+
+    # -------------------------------------------------
+    # In-memory (default): bytes uit content-hash cache, geen output/-bestand
+    # -------------------------------------------------
+    if PDF_IN_MEMORY and PDF_LAZY:
+        render_pdf_download(dish_name, pdf_input, pdf_key)
+        return
+
+    if PDF_IN_MEMORY:
 
-        st.session_state["pdf_path"] = build_plan_pdf(
-            dish_name=dish_name,
-            nutrition=nutrition,
-            ingredients=ingredients,
-            preparation=preparation,
+        with log_stage(log, "pdf", with_image=has_image, in_memory=True):
+            pdf_bytes = render_plan_pdf_bytes(**pdf_input)
 
-            cook_time_min=cook_time_min,
-            cook_time_max=cook_time_max,
+        if pdf_bytes:
+            downloaded = st.download_button(
+                "Download als PDF",
+                data=pdf_bytes,
+                file_name=pdf_filename(dish_name),
+                mime="application/pdf",
+                use_container_width=True,
+            )
 
-            calories_kcal=calories_kcal,
-            persons=persons,
+            if downloaded:
+                st.session_state["done"] = True
+                st.rerun()
 
-            protein_g=protein_g,
-            fat_g=fat_g,
-            carbs_g=carbs_g,
+        return
 
-            protein_pct=protein_pct,
-            fat_pct=fat_pct,
-            carbs_pct=carbs_pct,
+    if (
+        "pdf_path" not in st.session_state
+        or (has_image and not st.session_state.get("_pdf_has_image", False))
+    ):
 
-            image_path=image_path if has_image else None
-        )
+        with log_stage(log, "pdf", with_image=has_image):
+            st.session_state["pdf_path"] = build_plan_pdf(**pdf_input)
 
     st.session_state["_pdf_has_image"] = has_image
 
@@ -850,5 +1132,6 @@ def main():
 # App entrypoint
 # -------------------------------------------------
 if __name__ == "__main__":
-    main()
+    with trace_request("peet_card"):
+        main()
 
@@ -5,7 +5,6 @@ from core.peet_theme import render_peet_hero
 import json
 import os
 import hashlib
-import requests
 import urllib.parse
 import streamlit as st
 
@@ -15,12 +14,17 @@ from typing import Any, Dict, List
 
 
 from core.llm import call_peet_vooruit
-from apps.Peet_Kiest_Vooruit.vooruit_context import (
+from apps.peet_kiest_vooruit.vooruit_context import (
     parse_query_params,
     compute_kitchen_plan,
+    compute_main_plan,
     next_rotation_index,
 )
-from apps.Peet_Kiest_Vooruit.pdf_vooruit import build_vooruit_pdf
+from apps.peet_kiest_vooruit.vooruit_days import generate_days
+from apps.peet_kiest_vooruit.vooruit_images import resolve_image_urls
+from apps.peet_kiest_vooruit.pdf_vooruit import render_vooruit_pdf_bytes
+from peet_engine.shared.parsing import parse_ingredients
+from peet_engine.shopping import build_shopping_list
 
 
 # -------------------------------------------------
@@ -36,107 +40,6 @@ st.set_page_config(
 # -------------------------------------------------
 # Helpers
 # -------------------------------------------------
-import re
-
-def simplify_dish_name(dish_name: str, vegetarian: bool = False) -> str:
-    name = dish_name.lower()
-
-    # Hoofdingrediënten eerst (prioriteit!)
-    primary_map = {
-        "witloof": "chicory endive",
-        "zalm": "salmon fillet",
-        "kabeljauw": "cod fillet",
-        "mosselen": "mussels",
-        "boerenkool": "kale",
-        "hutspot": "carrot potato mash",
-        "stamppot": "mashed potatoes",
-    }
-
-    # Secundaire componenten
-    secondary_map = {
-        "aardappel": "potatoes",
-        "puree": "potato puree",
-        "friet": "fries",
-        "frieten": "fries",
-        "prei": "leek",
-        "roomsaus": "cream sauce",
-        "jus": "gravy",
-        "gehakt": "ground beef",
-        "worst": "sausage",
-        "runderworst": "sausage",
-        "champignon": "mushrooms",
-    }
-
-    # Vegetarische correctie
-    if vegetarian:
-        secondary_map.update({
-            "worst": "vegetarian sausage",
-            "runderworst": "vegetarian sausage",
-            "gehakt": "plant based ground beef",
-            "jus": "vegetarian gravy",
-        })
-
-    primary = None
-    secondary = []
-
-    # Zoek primary eerst
-    for nl, en in primary_map.items():
-        if nl in name:
-            primary = en
-            break
-
-    # Zoek secundaire ingrediënten
-    for nl, en in secondary_map.items():
-        if nl in name:
-            secondary.append(en)
-
-    keywords = []
-
-    if primary:
-        keywords.append(primary)
-
-    if secondary:
-        keywords.extend(secondary[:2])  # max 2 extra
-
-    if not keywords:
-        keywords.append(name)
-
-    return " ".join(keywords) + " plated restaurant meal close up"
-
-
-def build_image_url(dish_name: str, vegetarian: bool = False) -> str:
-    api_key = os.getenv("PEXELS_API_KEY")
-
-    if not api_key or not dish_name:
-        return "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?auto=format&fit=crop&w=1200&q=80"
-
-    search_query = simplify_dish_name(dish_name, vegetarian)
-
-    try:
-        response = requests.get(
-            "https://api.pexels.com/v1/search",
-            headers={"Authorization": api_key},
-            params={
-                "query": search_query,
-                "per_page": 5,
-                "orientation": "landscape",
-                "size": "large",
-                "locale": "en-US"
-            },
-            timeout=5,
-        )
-
-        data = response.json()
-
-        if "photos" in data and len(data["photos"]) > 0:
-            return data["photos"][0]["src"]["landscape"]
-
-    except Exception:
-        pass
-
-    return "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?auto=format&fit=crop&w=1200&q=80"
-
-
 def _qp(name: str, default: str = "") -> str:
     v = st.query_params.get(name, default)
     if isinstance(v, list):
@@ -246,9 +149,6 @@ JSON SCHEMA:
       "ingredients": [{{"amount": "...", "item": "..."}}],
       "preparation": ["..."]
     }}
-  ],
-  "shopping_list": [
-    {{"zone": "AGF", "item": "uien", "amount": "..."}}
   ]
 }}
 """.strip()
@@ -259,6 +159,21 @@ def _call_llm_cached(prompt: str) -> str:
     return call_peet_vooruit(prompt, system_prompt=prompt)
 
 
+# Per dag parallel genereren (PEET_VOORUIT_PARALLEL=0 → één grote prompt)
+PARALLEL_DAYS = os.getenv("PEET_VOORUIT_PARALLEL", "1") != "0"
+
+
+@st.cache_data(show_spinner=False)
+def _generate_days_cached(context_json: str) -> str:
+    ctx = json.loads(context_json)
+    # JSON maakt van dag-keys strings
+    ctx["kitchen_plan"] = {int(k): v for k, v in ctx["kitchen_plan"].items()}
+    ctx["main_plan"] = {int(k): v for k, v in ctx.get("main_plan", {}).items()}
+
+    result = generate_days(ctx)
+    return json.dumps(result, ensure_ascii=False) if result else ""
+
+
 def _normalize_day_preparation(day: Dict[str, Any]) -> Dict[str, Any]:
     if "preparation" not in day and "steps" in day:
         day["preparation"] = day.get("steps", [])
@@ -280,7 +195,7 @@ def normalize_vooruit_output(raw: Dict[str, Any], expected_days: int):
             entry["day"] = i
             entry.setdefault("kitchen", "")
             days.append(entry)
-        return {"days": days, "shopping_list": raw.get("shopping_list", [])}
+        return {"days": days}
 
     return None
 
@@ -308,6 +223,9 @@ context = {
     "nogo": inp.nogo,
     "fridge": inp.fridge,
     "kitchen_plan": kitchen_plan,
+    "main_plan": compute_main_plan(
+        inp.days, rotation_index, inp.vegetarian, inp.nogo, inp.allergies
+    ),
 }
 
 
@@ -335,7 +253,18 @@ if should_run:
     if st.session_state.get("pk_v_sig") != sig:
         st.session_state["pk_v_sig"] = sig
         with st.spinner("Peet kiest en plant…"):
-            st.session_state["pk_v_raw"] = _call_llm_cached(prompt)
+            raw_out = ""
+
+            if PARALLEL_DAYS:
+                raw_out = _generate_days_cached(
+                    json.dumps(context, sort_keys=True, ensure_ascii=False)
+                )
+
+            # parallel mislukt → één meerdaagse prompt
+            if not raw_out:
+                raw_out = _call_llm_cached(prompt)
+
+            st.session_state["pk_v_raw"] = raw_out
         st.session_state.pop("pk_v_pdf", None)
 
 
@@ -349,22 +278,23 @@ if not normalized:
     st.stop()
 
 days_out = [_normalize_day_preparation(d) for d in normalized["days"]]
-shopping_list = normalized.get("shopping_list", [])
+# boodschappenlijst lokaal: optellen over dagen, eenheden gelijk, per zone
+shopping_list = build_shopping_list(days_out)
+
+# alle hero-afbeeldingen in één keer (gelijktijdig, disk-cache)
+image_urls = resolve_image_urls(
+    [d.get("dish_name", "") for d in days_out],
+    context["vegetarian"],
+)
 
 
-for d in days_out:
+for d, image_url in zip(days_out, image_urls):
     day_no = d.get("day", "?")
     kitchen = d.get("kitchen", "")
     dish_name = d.get("dish_name", "")
 
     nutr = d.get("nutrition", {}) or {}
 
-    #-------------------------------------------------
-    # Bouw dynamische afbeelding op basis van gerecht
-    #-------------------------------------------------
-
-    image_url = build_image_url(dish_name, context["vegetarian"])
-
     render_peet_hero(
         title=dish_name,
         subtitle=f"Dag {day_no} • {kitchen}",
@@ -384,16 +314,10 @@ for d in days_out:
 
     if ingredients:
 
-        clean_ingredients = []
-
-        for ing in ingredients:
-            if isinstance(ing, dict):
-                amount = str(ing.get("amount", "")).strip()
-                item = str(ing.get("item", "")).strip()
-                if amount and item:
-                    clean_ingredients.append(f"{amount} {item}")
-                elif item:
-                    clean_ingredients.append(item)
+        clean_ingredients = [
+            f"{ing.amount} {ing.label}" if ing.amount else ing.label
+            for ing in parse_ingredients(ingredients)
+        ]
 
         mid = (len(clean_ingredients) + 1) // 2
         col1_items = clean_ingredients[:mid]
@@ -426,3 +350,25 @@ for d in days_out:
         st.markdown(f"{i}. {step}")
 
     st.divider()
+
+
+# -------------------------------------------------
+# PDF (planning + boodschappenlijst, in het geheugen)
+# -------------------------------------------------
+if "pk_v_pdf" not in st.session_state:
+    if st.button("Maak PDF van deze planning", use_container_width=True):
+        with st.spinner("PDF maken…"):
+            st.session_state["pk_v_pdf"] = render_vooruit_pdf_bytes(
+                days_out,
+                inp.persons,
+                shopping_list,
+            )
+
+if "pk_v_pdf" in st.session_state:
+    st.download_button(
+        "Download planning als PDF",
+        data=st.session_state["pk_v_pdf"],
+        file_name="peetkiest_vooruit.pdf",
+        mime="application/pdf",
+        use_container_width=True,
+    )
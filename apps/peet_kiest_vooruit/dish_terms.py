@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Termen NL → EN (volgorde = prioriteit); groter woordenboek via PEET_DISH_TERMS
+TERMS_PATH = os.getenv("PEET_DISH_TERMS", str(Path(__file__).resolve().parent / "dish_terms.json"))
+
+QUERY_SUFFIX = " plated restaurant meal close up"
+
+
+def _trie_regex(terms: List[str]) -> str:
+    """
+    Eén regex uit een trie van alle termen: gedeelde prefixen één keer,
+    langste match per positie eerst (geen lineaire scan over de termen).
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if "" in node else body
+
+    return emit(trie)
+
+
+class TermMatcher:
+    """
+    Vindt alle termen die ergens in een naam voorkomen (substring, zoals
+    `term in name`), voor meerdere groepen tegelijk in één regex-pass.
+    De lookahead levert per positie de langste term; kortere termen op
+    dezelfde positie zijn daar prefix van en komen via _implied mee.
+    """
+
+    def __init__(self, groups: Dict[str, Dict[str, str]]):
+        # term → [(rang, groep, vertaling)]; rang = volgorde in de data (prioriteit)
+        self.entries: Dict[str, List[Tuple[int, str, str]]] = {}
+        rank = 0
+        for group, terms in groups.items():
+            for term, value in terms.items():
+                term = term.lower()
+                if term:
+                    self.entries.setdefault(term, []).append((rank, group, value))
+                    rank += 1
+
+        self._implied = {
+            term: tuple(
+                entry
+                for i in range(1, len(term) + 1)
+                for entry in self.entries.get(term[:i], ())
+            )
+            for term in self.entries
+        }
+
+        self._pattern = (
+            re.compile("(?=(" + _trie_regex(list(self.entries)) + "))")
+            if self.entries else None
+        )
+
+    def find(self, name: str) -> Dict[str, List[str]]:
+        """
+        Per groep de vertalingen in prioriteitsvolgorde, één per gevonden
+        term (twee termen met dezelfde vertaling → die vertaling twee keer,
+        net als de oude dict-scan).
+        """
+        if self._pattern is None:
+            return {}
+
+        hits = set()
+        for term in self._pattern.findall(name):
+            hits.update(self._implied[term])
+
+        out: Dict[str, List[str]] = {}
+        for _rank, group, value in sorted(hits):
+            out.setdefault(group, []).append(value)
+        return out
+
+
+class DishQueryBuilder:
+    """
+    Hoofdingrediënt (eerste primary-match) + max. 2 secundaire termen.
+    De slots zijn die van de oude dict-scan (eerste 2 secundaire matches);
+    pas daarna vallen dubbele vertalingen weg ("sausage sausage" → "sausage").
+    Vegetarisch = aparte matcher met de overrides al toegepast.
+    """
+
+    def __init__(
+        self,
+        primary: Dict[str, str],
+        secondary: Dict[str, str],
+        vegetarian: Optional[Dict[str, str]] = None,
+    ):
+        self.matcher = TermMatcher({"primary": primary, "secondary": secondary})
+        self.matcher_veg = TermMatcher({
+            "primary": primary,
+            "secondary": {**secondary, **(vegetarian or {})},
+        })
+
+    @classmethod
+    def from_file(cls, path: str = TERMS_PATH) -> "DishQueryBuilder":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            data.get("primary", {}),
+            data.get("secondary", {}),
+            data.get("vegetarian", {}),
+        )
+
+    def query(self, dish_name: str, vegetarian: bool = False) -> str:
+        name = dish_name.lower()
+
+        found = (self.matcher_veg if vegetarian else self.matcher).find(name)
+        keywords = found.get("primary", [])[:1] + found.get("secondary", [])[:2]  # max 2 extra
+        keywords = list(dict.fromkeys(keywords))  # dedup ná de slice
+
+        if not keywords:
+            keywords.append(name)
+
+        return " ".join(keywords) + QUERY_SUFFIX
+
+
+_builder: Optional[DishQueryBuilder] = None
+_builder_lock = threading.Lock()
+
+
+def get_query_builder() -> DishQueryBuilder:
+    global _builder
+    if _builder is None:
+        with _builder_lock:
+            if _builder is None:
+                _builder = DishQueryBuilder.from_file()
+    return _builder
+
+
+@lru_cache(maxsize=8192)
+def simplify_dish_name(dish_name: str, vegetarian: bool = False) -> str:
+    """Gerechtnaam → Engelse Pexels-zoekterm (gememoized; zelfde naam = dict-lookup)."""
+    return get_query_builder().query(dish_name, vegetarian)
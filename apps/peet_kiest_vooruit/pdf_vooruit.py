@@ -1,28 +1,96 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 from datetime import datetime
+from xml.sax.saxutils import escape
 
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
+from reportlab.platypus import (
+    BaseDocTemplate,
+    Flowable,
+    Frame,
+    PageBreak,
+    PageTemplate,
+    Paragraph,
+    Table,
+)
 
+from peet_engine.render_pdf import get_renderer
+from peet_engine.shared.parsing import parse_ingredients
+from peet_engine.shopping import ZONES_ORDER
 
-ZONES_ORDER = [
-    "AGF",
-    "Brood & ontbijt",
-    "Zuivel & eieren",
-    "Vlees/vis/vega",
-    "Houdbaar",
-    "Kruiden & oliën",
-    "Koeling/diepvries",
-    "Overig",
-]
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # zonder pypdf: altijd in één proces renderen
+    PdfReader = PdfWriter = None
+
+
+# Dagen parallel in worker-processen renderen (0/1 = uit; pypdf nodig om samen te voegen)
+PDF_WORKERS = int(os.getenv("PEET_VOORUIT_PDF_WORKERS", "0"))
 
 
 def _safe_str(x: Any) -> str:
     return str(x).strip() if x is not None else ""
 
 
+# woorden herhalen veel ("de", "en", "de ui") → breedte één keer meten
+_width = lru_cache(maxsize=16384)(stringWidth)
+
+
+def wrap_text(text: str, max_width: float, font_name: str = "Helvetica", font_size: float = 10) -> List[str]:
+    """
+    Woorden over regels verdelen op echte breedte (stringWidth), lineair:
+    elk woord wordt één keer gemeten, de regelbreedte loopt mee.
+    Een woord breder dan max_width wordt op tekens gesplitst.
+    """
+    words = text.split()
+    if not words:
+        return []
+
+    space = _width(" ", font_name, font_size)
+    lines: List[str] = []
+    line: List[str] = []
+    width = 0.0
+
+    for word in words:
+        word_width = _width(word, font_name, font_size)
+
+        if word_width > max_width:
+            if line:
+                lines.append(" ".join(line))
+            chunk, chunk_width = "", 0.0
+            for ch in word:
+                ch_width = _width(ch, font_name, font_size)
+                if chunk and chunk_width + ch_width > max_width:
+                    lines.append(chunk)
+                    chunk, chunk_width = "", 0.0
+                chunk += ch
+                chunk_width += ch_width
+            line, width = [chunk], chunk_width
+            continue
+
+        if line and width + space + word_width > max_width:
+            lines.append(" ".join(line))
+            line, width = [], 0.0
+
+        width += word_width + (space if line else 0.0)
+        line.append(word)
+
+    if line:
+        lines.append(" ".join(line))
+
+    return lines
+
+
 def build_vooruit_pdf(
     out_path: str,
     days: List[Dict[str, Any]],
@@ -39,23 +107,6 @@ def build_vooruit_pdf(
         c.setFont("Helvetica", 10)
         c.drawString(50, h - 78, f"Voor {persons} persoon/personen • {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
-    def wrap_lines(text: str, max_chars: int = 95) -> List[str]:
-        text = text.replace("\n", " ").strip()
-        if not text:
-            return []
-        words = text.split()
-        lines, line = [], []
-        for w0 in words:
-            trial = (" ".join(line + [w0])).strip()
-            if len(trial) <= max_chars:
-                line.append(w0)
-            else:
-                lines.append(" ".join(line))
-                line = [w0]
-        if line:
-            lines.append(" ".join(line))
-        return lines
-
     # Pagina per dag
     for d in days:
         day_no = int(d.get("day", 0) or 0)
@@ -89,10 +140,8 @@ def build_vooruit_pdf(
         y -= 16
 
         c.setFont("Helvetica", 10)
-        for ing in ingredients:
-            amount = _safe_str(ing.get("amount", "")) if isinstance(ing, dict) else ""
-            item = _safe_str(ing.get("item", "")) if isinstance(ing, dict) else _safe_str(ing)
-            line = f"• {amount} {item}".strip()
+        for ing in parse_ingredients(ingredients):
+            line = f"• {ing.amount} {ing.label}".replace("•  ", "• ")
             if y < 70:
                 c.showPage()
                 header(f"{title} • Dag {day_no} (vervolg)")
@@ -107,18 +156,19 @@ def build_vooruit_pdf(
         y -= 16
 
         c.setFont("Helvetica", 10)
-        step_no = 1
-        for step in prep:
-            for ln in wrap_lines(_safe_str(step), max_chars=100):
+        # tekstbreedte = pagina min marges min het breedste nummer ("12. ")
+        step_width = w - 55 - 50 - stringWidth(f"{len(prep)}. ", "Helvetica", 10)
+        for step_no, step in enumerate(prep, 1):
+            lines = wrap_text(_safe_str(step), step_width)
+            for i, ln in enumerate(lines):
                 if y < 70:
                     c.showPage()
                     header(f"{title} • Dag {day_no} (vervolg)")
                     y = h - 115
                     c.setFont("Helvetica", 10)
-                prefix = f"{step_no}. " if ln == wrap_lines(_safe_str(step), 100)[0] else "   "
-                c.drawString(55, y, (prefix + ln)[:130])
+                prefix = f"{step_no}. " if i == 0 else "   "
+                c.drawString(55, y, prefix + ln)
                 y -= 13
-            step_no += 1
 
         c.showPage()
 
@@ -167,3 +217,239 @@ def build_vooruit_pdf(
 
     c.save()
     return out_path
+
+
+# -------------------------------------------------
+# Platypus-renderer (gedeelde fonts/stijlen uit peet_engine.render_pdf)
+# -------------------------------------------------
+class _SectionStart(Flowable):
+    """Nul-hoogte marker: vanaf hier krijgt de paginakop deze titel."""
+
+    def __init__(self, title: str):
+        super().__init__()
+        self.title = title
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+class _VooruitDoc(BaseDocTemplate):
+    """Eén paginasjabloon; de kop volgt de laatste _SectionStart ("(vervolg)" op volgpagina's)."""
+
+    def __init__(self, target, header_line: str, **kwargs):
+        super().__init__(target, pagesize=A4, **kwargs)
+        self.header_line = header_line
+        self.section = ""
+        self.section_page = 0
+
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="body")
+        self.addPageTemplates([PageTemplate(id="page", frames=[frame], onPageEnd=self._draw_header)])
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, _SectionStart):
+            self.section = flowable.title
+            self.section_page = self.page
+
+    def _draw_header(self, c, doc):
+        _w, h = A4
+        title = self.section if self.section_page == self.page else f"{self.section} (vervolg)"
+
+        c.saveState()
+        c.setFont("RobotoCondensed-Bold", 16)
+        c.drawString(self.leftMargin, h - 1.6 * cm, title)
+        c.setFont("RobotoCondensed", 10)
+        c.drawString(self.leftMargin, h - 2.2 * cm, self.header_line)
+        c.restoreState()
+
+
+class VooruitPdfRenderer:
+    """
+    Meerdaagse planning als Platypus-document.
+    Fonts, stijlen en tabelstijl komen van de Peet Card-renderer
+    (één registry); per dag worden de flowables vooraf opgebouwd.
+    """
+
+    def __init__(self) -> None:
+        base = get_renderer()
+        styles = base.styles
+
+        self.styles = styles
+        self.ingredient_table_style = base.ingredient_table_style
+
+        self.step_style = ParagraphStyle(
+            name="VooruitStep",
+            parent=styles["Body"],
+            leftIndent=14,
+            firstLineIndent=-14,
+        )
+        self.item_style = ParagraphStyle(
+            name="VooruitItem",
+            parent=styles["Body"],
+            spaceAfter=1,
+        )
+
+    # -----------------------------
+    # Flowables
+    # -----------------------------
+    def _p(self, text: Any, style: ParagraphStyle) -> Paragraph:
+        # LLM-tekst kan & of < bevatten → escapen voor de Paragraph-markup
+        return Paragraph(escape(_safe_str(text)), style)
+
+    def day_story(self, day: Dict[str, Any], title: str) -> List[Flowable]:
+        day_no = int(day.get("day", 0) or 0)
+        nutrition = day.get("nutrition", {}) or {}
+        prep = day.get("preparation", []) or []
+
+        story: List[Flowable] = [
+            _SectionStart(f"{title} • Dag {day_no}"),
+            self._p(day.get("dish_name", ""), self.styles["DishTitle"]),
+            self._p(f"Keuken: {_safe_str(day.get('kitchen', ''))}", self.styles["Tagline"]),
+            self._p(
+                "Voeding (per gerecht, schatting toegestaan): "
+                f"{nutrition.get('calories_kcal', 0)} kcal • P {nutrition.get('protein_g', 0)} g • "
+                f"V {nutrition.get('fat_g', 0)} g • KH {nutrition.get('carbs_g', 0)} g",
+                self.styles["Macros"],
+            ),
+            Paragraph("Ingrediënten", self.styles["Section"]),
+        ]
+
+        rows = [
+            [self._p(ing.amount, self.item_style), self._p(ing.label, self.item_style)]
+            for ing in parse_ingredients(day.get("ingredients", []) or [])
+        ]
+        if rows:
+            story.append(Table(rows, colWidths=[3.2 * cm, None], style=self.ingredient_table_style))
+
+        story.append(Paragraph("Zo pak je het aan", self.styles["Section"]))
+        story.extend(
+            self._p(f"{i}. {_safe_str(step)}", self.step_style)
+            for i, step in enumerate(prep, 1)
+        )
+        story.append(PageBreak())
+        return story
+
+    def shopping_story(self, shopping_list: List[Dict[str, Any]], title: str) -> List[Flowable]:
+        by_zone: Dict[str, List[Dict[str, Any]]] = {}
+        for it in shopping_list:
+            zone = _safe_str(it.get("zone", "Overig")) or "Overig"
+            by_zone.setdefault(zone if zone in ZONES_ORDER else "Overig", []).append(it)
+
+        story: List[Flowable] = [_SectionStart(f"{title} • Boodschappenlijst")]
+
+        for zone in ZONES_ORDER:
+            items = by_zone.get(zone)
+            if not items:
+                continue
+            story.append(Paragraph(zone, self.styles["Section"]))
+            story.append(Table(
+                [
+                    [self._p(it.get("item", ""), self.item_style), self._p(it.get("amount", ""), self.item_style)]
+                    for it in items
+                ],
+                colWidths=[None, 5 * cm],
+                style=self.ingredient_table_style,
+            ))
+
+        return story
+
+    # -----------------------------
+    # Renderen
+    # -----------------------------
+    def render(self, target: Union[str, BinaryIO], story: List[Flowable], header_line: str) -> None:
+        doc = _VooruitDoc(
+            target,
+            header_line,
+            leftMargin=50,
+            rightMargin=50,
+            topMargin=2.8 * cm,
+            bottomMargin=1.8 * cm,
+        )
+        doc.build(story)
+
+    def render_bytes(self, story: List[Flowable], header_line: str) -> bytes:
+        buf = io.BytesIO()
+        self.render(buf, story, header_line)
+        return buf.getvalue()
+
+
+_vooruit_renderer: Optional[VooruitPdfRenderer] = None
+_vooruit_lock = threading.Lock()
+
+
+def get_vooruit_renderer() -> VooruitPdfRenderer:
+    """Per proces één renderer (ook in elke worker)."""
+    global _vooruit_renderer
+    if _vooruit_renderer is None:
+        with _vooruit_lock:
+            if _vooruit_renderer is None:
+                _vooruit_renderer = VooruitPdfRenderer()
+    return _vooruit_renderer
+
+
+# -------------------------------------------------
+# Parallel: dagen als losse PDF's, daarna pagina's samenvoegen
+# -------------------------------------------------
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _vooruit_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+    return _pool
+
+
+def _render_day_section(day: Dict[str, Any], title: str, header_line: str) -> bytes:
+    # draait in een worker-proces
+    renderer = get_vooruit_renderer()
+    return renderer.render_bytes(renderer.day_story(day, title)[:-1], header_line)
+
+
+def _merge_pdfs(parts: List[bytes]) -> bytes:
+    writer = PdfWriter()
+    for part in parts:
+        for page in PdfReader(io.BytesIO(part)).pages:
+            writer.add_page(page)
+    writer.compress_identical_objects()  # gelijke objecten uit de losse delen één keer
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def render_vooruit_pdf_bytes(
+    days: List[Dict[str, Any]],
+    persons: int,
+    shopping_list: List[Dict[str, Any]],
+    title: str = "PeetKiest Vooruit",
+    workers: Optional[int] = None,
+) -> bytes:
+    """
+    Meerdaagse planning + boodschappenlijst als PDF (bytes).
+    workers > 1 (default PEET_VOORUIT_PDF_WORKERS): elke dag in een eigen
+    proces, pagina's daarna samengevoegd. Zonder pypdf of bij één dag:
+    gewoon in dit proces.
+    """
+    workers = PDF_WORKERS if workers is None else workers
+    header_line = f"Voor {persons} persoon/personen • {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+    renderer = get_vooruit_renderer()
+
+    if workers > 1 and len(days) > 1 and PdfWriter is not None:
+        pool = _get_pool(workers)
+        futures = [pool.submit(_render_day_section, d, title, header_line) for d in days]
+        shopping = renderer.render_bytes(renderer.shopping_story(shopping_list, title), header_line)
+        return _merge_pdfs([f.result() for f in futures] + [shopping])
+
+    story: List[Flowable] = []
+    for d in days:
+        story.extend(renderer.day_story(d, title))
+    story.extend(renderer.shopping_story(shopping_list, title))
+
+    return renderer.render_bytes(story, header_line)
@@ -7,6 +7,10 @@ import re
 
 ACCENT_POOL: List[str] = ["Italiaans", "Mediterraans", "Aziatisch"]
 
+# Hoofdcomponent per dag (variatie bij parallel genereren)
+MAIN_POOL: List[str] = ["kip", "vis", "rund", "vega", "varkensvlees"]
+MAIN_POOL_VEG: List[str] = ["peulvruchten", "ei", "paddenstoelen", "tofu", "kaas"]
+
 
 def _safe_int(x: Any, default: int) -> int:
     try:
@@ -86,6 +90,49 @@ def compute_kitchen_plan(days: int, rotation_index: int) -> Dict[int, str]:
     return plan
 
 
+# allergie → hoofdcomponenten die er (ook zonder woordmatch) onder vallen
+ALLERGY_MAINS: Dict[str, List[str]] = {
+    "zuivel": ["kaas"],
+    "lactose": ["kaas"],
+    "melk": ["kaas"],
+    "soja": ["tofu"],
+    "schaaldieren": ["vis"],
+}
+
+
+def compute_main_plan(
+    days: int,
+    rotation_index: int,
+    vegetarian: bool,
+    nogo: List[str] | None = None,
+    allergies: List[str] | None = None,
+) -> Dict[int, str]:
+    """
+    Vaste hoofdcomponent per dag, vooraf gekozen:
+    - no-go én allergieën vallen af; daarna roteren over wat overblijft
+    - elke dag een andere zolang de gefilterde pool ≥ days;
+      is hij kleiner, dan herhaalt de rotatie (nooit twee dagen na
+      elkaar hetzelfde zolang er ≥ 2 over zijn)
+    - blijft er niets over, dan "" per dag (prompt: "vrij"); nooit
+      een geblokkeerde component vastpinnen
+    - rotatie schuift mee met de keukenrotatie
+    Zo kunnen dagen los (parallel) gegenereerd worden zonder dubbelingen.
+    """
+    pool = MAIN_POOL_VEG if vegetarian else MAIN_POOL
+
+    blocked = [n.lower().strip() for n in [*(nogo or []), *(allergies or [])] if n and n.strip()]
+    blocked += [c for b in blocked for c in ALLERGY_MAINS.get(b, [])]
+
+    usable = [c for c in pool if not any(b in c or c in b for b in blocked)]
+    if not usable:
+        return {day: "" for day in range(1, days + 1)}
+
+    return {
+        day: usable[(rotation_index + day - 1) % len(usable)]
+        for day in range(1, days + 1)
+    }
+
+
 def next_rotation_index(current: int) -> int:
     return (int(current) + 1) % len(ACCENT_POOL)
 
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from core.json_utils import extract_json
+from core.llm import acall_peet_vooruit
+
+
+# Eén dag past ruim in dit budget (meerdaagse prompt: 3000)
+DAY_MAX_OUTPUT_TOKENS = 1200
+
+
+# -------------------------------------------------
+# Prompt per dag
+# -------------------------------------------------
+def build_day_prompt(context: Dict[str, Any], day: int) -> str:
+    """
+    Prompt voor één dag uit de planning.
+    De hoofdcomponenten van de andere dagen gaan mee als uitsluiting,
+    zodat losse calls samen nog steeds gevarieerd zijn.
+    """
+    persons = int(context["persons"])
+    vegetarian = bool(context["vegetarian"])
+    allergies = context.get("allergies", [])
+    nogo = context.get("nogo", [])
+    fridge = str(context.get("fridge", "") or "").strip()
+    kitchen = context["kitchen_plan"].get(day, "NL/BE")
+
+    main_plan = context.get("main_plan", {})
+    main = main_plan.get(day, "")
+    others = list(dict.fromkeys(
+        c for d, c in sorted(main_plan.items()) if d != day and c and c != main
+    ))
+
+    diet_line = "vegetarisch" if vegetarian else "vlees/vis/vega toegestaan"
+    allergies_line = ", ".join(allergies) if allergies else "geen"
+    nogo_line = ", ".join(nogo) if nogo else "geen"
+    fridge_line = fridge if fridge else "niets specifieks"
+    main_line = main if main else "vrij"
+    avoid_line = ", ".join(others) if others else "geen"
+
+    return f"""
+Je bent PeetKiest Vooruit. Jij kiest het gerecht voor dag {day} van een meerdaagse planning. Jij kiest, geen opties.
+
+OUTPUT REGEL:
+- Je output is ALLEEN geldige JSON
+- Geen markdown, geen tekst buiten JSON
+
+Eén gerecht voor {persons} personen.
+
+KEUKEN: {kitchen}
+
+HOOFDCOMPONENT:
+- gebruik: {main_line}
+- niet gebruiken (andere dagen): {avoid_line}
+
+DIEET:
+- stijl: {diet_line}
+- allergieën: {allergies_line}
+- no-go: {nogo_line}
+- in huis: {fridge_line}
+
+KWALITEIT:
+- Exact 1 gerecht
+- Kcal en macro’s verplicht
+
+BEREIDINGSTOON:
+- De bereidingswijze is geschreven in Peet-stijl.
+- Spreek licht begeleidend, alsof Peet naast je staat.
+- Korte, duidelijke zinnen. Zelfverzekerd, rustig en praktisch.
+- Geen emoji’s, geen uitleg waarom iets gezond is.
+
+
+JSON SCHEMA:
+{{
+  "day": {day},
+  "kitchen": "{kitchen}",
+  "dish_name": "...",
+  "nutrition": {{
+    "calories_kcal": 0,
+    "protein_g": 0,
+    "fat_g": 0,
+    "carbs_g": 0
+  }},
+  "ingredients": [{{"amount": "...", "item": "..."}}],
+  "preparation": ["..."]
+}}
+""".strip()
+
+
+# -------------------------------------------------
+# Parallel genereren
+# -------------------------------------------------
+def _parse_day(raw: str, day: int, kitchen: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = extract_json(raw)
+    except Exception:
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    # soms toch de meerdaagse vorm
+    if isinstance(data.get("days"), list) and data["days"]:
+        data = data["days"][0]
+        if not isinstance(data, dict):
+            return None
+
+    if not str(data.get("dish_name", "") or "").strip():
+        return None
+
+    data["day"] = day
+    data.setdefault("kitchen", kitchen)
+    return data
+
+
+async def agenerate_days(context: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Genereert alle dagen tegelijk (één LLM-call per dag).
+    Wandkloktijd ≈ die van de traagste dag.
+    Geeft None als één dag mislukt (caller valt terug op de meerdaagse prompt).
+    """
+    days = int(context["days"])
+
+    prompts = [build_day_prompt(context, day) for day in range(1, days + 1)]
+
+    raws = await asyncio.gather(
+        *(
+            acall_peet_vooruit(
+                prompt,
+                system_prompt=prompt,
+                max_output_tokens=DAY_MAX_OUTPUT_TOKENS,
+            )
+            for prompt in prompts
+        )
+    )
+
+    out: List[Dict[str, Any]] = []
+
+    for day, raw in enumerate(raws, start=1):
+        parsed = _parse_day(raw, day, context["kitchen_plan"].get(day, "NL/BE"))
+        if parsed is None:
+            return None
+        out.append(parsed)
+
+    return out
+
+
+def generate_days(context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Sync ingang voor Streamlit.
+    Zelfde vorm als de meerdaagse output: {"days": [...]}
+    (de boodschappenlijst wordt lokaal opgebouwd, zie peet_engine.shopping)
+    """
+    days = asyncio.run(agenerate_days(context))
+
+    if days is None:
+        return None
+
+    return {"days": days}
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from apps.peet_kiest_vooruit.dish_terms import simplify_dish_name
+
+
+# Pexels-zoekopdrachten: gelijktijdig, gepoold, met disk-cache (query → URL)
+PEXELS_URL = os.getenv("PEET_PEXELS_URL", "https://api.pexels.com/v1/search")
+PEXELS_TIMEOUT = float(os.getenv("PEET_PEXELS_TIMEOUT", "5"))
+PEXELS_WORKERS = int(os.getenv("PEET_PEXELS_WORKERS", "5"))
+
+URL_CACHE_PATH = os.getenv("PEET_PEXELS_CACHE", "output/cache/pexels_urls.json")
+URL_CACHE_TTL_S = float(os.getenv("PEET_PEXELS_CACHE_TTL_H", "168")) * 3600
+
+FALLBACK_IMAGE_URL = "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?auto=format&fit=crop&w=1200&q=80"
+
+
+# -------------------------------------------------
+# Disk-cache: query → URL (met TTL)
+# -------------------------------------------------
+class UrlCache:
+    """
+    JSON-bestand {query: {"url", "ts"}}; verlopen regels tellen als miss.
+    Eén keer laden, daarna in het geheugen; schrijven atomair.
+    """
+
+    def __init__(self, path: str = URL_CACHE_PATH, ttl_s: float = URL_CACHE_TTL_S):
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self._data: Optional[Dict[str, Dict[str, object]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, object]]:
+        if self._data is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._data = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def get(self, query: str) -> Optional[str]:
+        with self._lock:
+            row = self._load().get(query)
+        if not isinstance(row, dict):
+            return None
+        if time.time() - float(row.get("ts", 0)) > self.ttl_s:
+            return None
+        url = row.get("url")
+        return url if isinstance(url, str) else None
+
+    def update(self, urls: Dict[str, str]) -> None:
+        if not urls:
+            return
+
+        now = time.time()
+        with self._lock:
+            data = self._load()
+            for query, url in urls.items():
+                data[query] = {"url": url, "ts": now}
+
+            # verlopen regels meteen opruimen
+            for query in [q for q, row in data.items() if now - float(row.get("ts", 0)) > self.ttl_s]:
+                del data[query]
+
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+
+_cache: Optional[UrlCache] = None
+_session: Optional[requests.Session] = None
+_init_lock = threading.Lock()
+
+
+def get_url_cache() -> UrlCache:
+    global _cache
+    if _cache is None:
+        with _init_lock:
+            if _cache is None:
+                _cache = UrlCache()
+    return _cache
+
+
+def get_session() -> requests.Session:
+    """Eén Session per proces: keep-alive + TLS-hergebruik over alle dagen."""
+    global _session
+    if _session is None:
+        with _init_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, PEXELS_WORKERS))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+# -------------------------------------------------
+# Pexels
+# -------------------------------------------------
+def search_image_url(query: str, api_key: str, session: Optional[requests.Session] = None) -> Optional[str]:
+    """
+    Eerste landscape-foto voor query.
+    FALLBACK_IMAGE_URL als Pexels niets vindt, None bij een fout
+    (dan niet cachen: volgende run opnieuw proberen).
+    """
+    try:
+        response = (session or get_session()).get(
+            PEXELS_URL,
+            headers={"Authorization": api_key},
+            params={
+                "query": query,
+                "per_page": 5,
+                "orientation": "landscape",
+                "size": "large",
+                "locale": "en-US"
+            },
+            timeout=PEXELS_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+    photos = data.get("photos") if isinstance(data, dict) else None
+
+    if photos:
+        try:
+            return photos[0]["src"]["landscape"]
+        except (KeyError, TypeError, IndexError):
+            return None
+
+    return FALLBACK_IMAGE_URL
+
+
+def resolve_image_urls(
+    dish_names: Iterable[str],
+    vegetarian: bool = False,
+    cache: Optional[UrlCache] = None,
+) -> List[str]:
+    """
+    Afbeelding-URL per gerecht, in dezelfde volgorde.
+    Cache-hits direct; missers gelijktijdig (max PEXELS_WORKERS),
+    dus een planning kost hooguit één timeout in plaats van één per dag.
+    """
+    names = list(dish_names)
+    api_key = os.getenv("PEXELS_API_KEY")
+
+    if not api_key:
+        return [FALLBACK_IMAGE_URL for _ in names]
+
+    cache = cache or get_url_cache()
+
+    queries = [simplify_dish_name(n, vegetarian) if n else "" for n in names]
+    found: Dict[str, str] = {}
+    missing: List[str] = []
+
+    for query in dict.fromkeys(q for q in queries if q):
+        url = cache.get(query)
+        if url is not None:
+            found[query] = url
+        else:
+            missing.append(query)
+
+    if missing:
+        session = get_session()
+        workers = max(1, min(PEXELS_WORKERS, len(missing)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="peet-pexels") as pool:
+            results = list(pool.map(lambda q: search_image_url(q, api_key, session), missing))
+
+        fetched = {q: url for q, url in zip(missing, results) if url is not None}
+        cache.update(fetched)
+        found.update(fetched)
+
+    return [found.get(q, FALLBACK_IMAGE_URL) for q in queries]
+
+
+def build_image_url(dish_name: str, vegetarian: bool = False) -> str:
+    return resolve_image_urls([dish_name], vegetarian)[0]
@@ -20,6 +20,7 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 
 from core.nutrition_prompt import NUTRITION_SYSTEM_PROMPT
+from peet_engine.shared.parsing import parse_ingredients
 
 
 # ----------------------------
@@ -125,17 +126,10 @@ def build_pdf(result: dict, moment: str, max_kcal: int) -> BytesIO:
 
     # Ingrediënten
     story.append(Paragraph("Ingrediënten", styles["Heading2"]))
-    ing_lines = []
-    for i in result.get("ingredients", []):
-        if isinstance(i, dict):
-            item = (i.get("item") or "").strip()
-            amt = (i.get("amount") or "").strip()
-            if item and amt:
-                ing_lines.append(f"{item} – {amt}")
-            elif item:
-                ing_lines.append(item)
-        else:
-            ing_lines.append(str(i))
+    ing_lines = [
+        f"{ing.label} – {ing.amount}" if ing.amount else ing.label
+        for ing in parse_ingredients(result.get("ingredients", []))
+    ]
 
     story.append(
         ListFlowable(
@@ -431,15 +425,7 @@ if isinstance(result, dict):
     ingredients = result.get("ingredients", [])
 
     # Normaliseer naar (item, amount)
-    rows = []
-    for i in ingredients:
-        if isinstance(i, dict):
-            item = (i.get("item") or "").strip()
-            amt = (i.get("amount") or "").strip()
-            if item:
-                rows.append((item, amt))
-        else:
-            rows.append((str(i), ""))
+    rows = [(ing.label, ing.amount) for ing in parse_ingredients(ingredients)]
 
     half = (len(rows) + 1) // 2
     left = rows[:half]
@@ -0,0 +1,80 @@
+# =========================================================
+# BENCHMARK — simplify_dish_name: trie-regex matcher vs dict-scan
+# Gebruik: python benchmarks/bench_dish_terms.py [aantal termen]
+# =========================================================
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from apps.peet_kiest_vooruit.dish_terms import DishQueryBuilder, QUERY_SUFFIX
+
+
+SYLLABLES = ["kip", "rund", "saus", "pan", "bo", "ter", "groen", "ste", "vis", "kaas", "room", "lin", "zen", "tof", "ei"]
+
+
+def legacy_query(primary, secondary, dish_name):
+    """Oude aanpak: per aanroep de dicts opbouwen en elke term met `in` tegen de naam."""
+    primary, secondary = dict(primary), dict(secondary)
+    name = dish_name.lower()
+    first = next((en for nl, en in primary.items() if nl in name), None)
+    extra = list(dict.fromkeys(en for nl, en in secondary.items() if nl in name))
+    keywords = ([first] if first else []) + extra[:2]
+    return " ".join(keywords or [name]) + QUERY_SUFFIX
+
+
+def make_terms(n: int, rng: random.Random) -> dict:
+    terms = {}
+    while len(terms) < n:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        terms[word] = f"term{len(terms)}"
+    return terms
+
+
+def bench(label: str, fn, names, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            fn(name)
+        best = min(best, time.perf_counter() - start)
+    per_call = best / len(names) * 1e6
+    print(f"{label:<30} {per_call:8.2f} µs/naam")
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(42)
+
+    primary = make_terms(n // 5, rng)
+    secondary = make_terms(n - n // 5, rng)
+    pool = list(primary) + list(secondary)
+
+    names = [
+        " met ".join(rng.choice(pool) for _ in range(rng.randint(2, 4)))
+        for _ in range(2000)
+    ]
+
+    start = time.perf_counter()
+    builder = DishQueryBuilder(primary, secondary)
+    print(f"{n:,} termen, {len(names):,} namen • compileren {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for name in names[:200]:
+        assert builder.query(name) == legacy_query(primary, secondary, name)
+
+    old = bench("oud: dict-scan per term", lambda s: legacy_query(primary, secondary, s), names)
+    new = bench("nieuw: trie-regex", builder.query, names)
+
+    memo = {}
+    bench("nieuw + memo (herhaalde naam)", lambda s: memo.get(s) or memo.setdefault(s, builder.query(s)), names)
+
+    print(f"trie-regex vs dict-scan: {old / new:.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# =========================================================
+# BENCHMARK — gedeelde ingrediëntparser vs de oude per-app code
+# Gebruik: python benchmarks/bench_ingredients.py [aantal ingrediënten]
+# =========================================================
+
+import re
+import sys
+import time
+import random
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine.shared.parsing import parse_ingredients
+
+
+AMOUNTS = ["200 g", "1 el", "2 tl", "1,5 kg", "2-3 teentjes", "1/2 l", "snufje", "2 grote", "250 ml", "1 stuk"]
+ITEMS = ["kipfilet", "olijfolie", "zout", "knoflook", "ui", "melk", "aardappelen", "paprika", "room", "pasta"]
+
+
+# -------------------------------------------------
+# Oude code (zoals in de apps vóór de gedeelde parser)
+# -------------------------------------------------
+def legacy_card(raw_ingredients):
+    """apps/peet_card/app.py → parse_llm_output (inline re.match per item)."""
+    ingredients_clean = []
+    for ing in raw_ingredients:
+        if not isinstance(ing, dict):
+            continue
+        amount = str(ing.get("amount", "")).strip()
+        item = str(ing.get("item", "")).strip()
+        note = str(ing.get("note", "")).strip()
+        if not item:
+            continue
+        m = re.match(r"^\s*([\d/.,\-–]+)\s*(g|ml|el|tl|stuk|stuks|teen|cm)?\s*(.*)$", amount, re.IGNORECASE)
+        if m:
+            num = (m.group(1) or "").strip()
+            unit = (m.group(2) or "").strip()
+            rest = (m.group(3) or "").strip()
+            amount = f"{num} {unit}".strip() if unit else num
+            rest = rest.strip(" ,()")
+            if rest:
+                note = f"{note}, {rest}".strip(", ") if note else rest
+        if note:
+            item = f"{item} ({note})"
+        ingredients_clean.append({"amount": amount, "item": item})
+    return ingredients_clean
+
+
+def legacy_nutrition(raw_ingredients):
+    """apps/peet_nutrition/app.py → (item, amount) rijen."""
+    rows = []
+    for i in raw_ingredients:
+        if isinstance(i, dict):
+            item = (i.get("item") or "").strip()
+            amt = (i.get("amount") or "").strip()
+            if item:
+                rows.append((item, amt))
+        else:
+            rows.append((str(i), ""))
+    return rows
+
+
+def shared_card(raw_ingredients):
+    return [{"amount": ing.amount, "item": ing.label} for ing in parse_ingredients(raw_ingredients)]
+
+
+def make_ingredients(n: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [{"amount": rng.choice(AMOUNTS), "item": rng.choice(ITEMS)} for _ in range(n)]
+
+
+def bench(label: str, fn, data, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+    rate = len(data) / best if best > 0 else 0.0
+    print(f"{label:<26} {best * 1000:8.1f} ms • {rate:>12,.0f} ingrediënten/s")
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    data = make_ingredients(n)
+
+    print(f"{n:,} ingrediënten (beste van 5)")
+    card = bench("oud: peet_card (re.match)", legacy_card, data)
+    bench("oud: peet_nutrition", legacy_nutrition, data)
+    shared = bench("nieuw: parse_ingredients", parse_ingredients, data)
+    bench("nieuw: card-weergave", shared_card, data)
+
+    print(f"parser vs oude card-code: {card / shared:.2f}×")
+
+
+if __name__ == "__main__":
+    main()
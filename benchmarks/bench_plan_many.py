@@ -0,0 +1,107 @@
+# =========================================================
+# BENCHMARK — plan() per context vs plan_many() batch
+# Gebruik: python benchmarks/bench_plan_many.py [aantal ...] [--catalog N]
+# =========================================================
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine import engine
+from peet_engine.engine import DISHES, Dish, DishCatalog, plan_many
+
+
+def plan(context: dict) -> dict:
+    """plan() zonder memo: we meten de echte kosten per context."""
+    return engine._plan_normalized(engine._normalize_context(context))
+
+
+SIZES = (10_000, 100_000)
+
+# Abonnees clusteren rond een handvol restrictiesets
+ALLERGY_SETS = [[], [], [], ["noten"], ["lactose"], ["gluten"], ["vis"], ["noten", "lactose"]]
+NOGO_SETS = [[], [], ["kip"], ["zalm"], ["citroen"]]
+
+
+def make_contexts(n: int, seed: int = 42) -> list[dict]:
+    """Realistische mix: weinig restrictiesets, veel verschillende seeds."""
+    rng = random.Random(seed)
+    contexts = []
+
+    for _ in range(n):
+        contexts.append({
+            "mode": rng.choice(["vandaag", "vooruit"]),
+            "days": rng.choice([1, 2, 3, 5]),
+            "persons": rng.randint(1, 6),
+            "vegetarian": rng.random() < 0.25,
+            "allergies": list(rng.choice(ALLERGY_SETS)),
+            "nogo": list(rng.choice(NOGO_SETS)),
+            "moment": rng.choice(["doordeweeks", "weekend"]),
+            "time": rng.choice(["snel", "normaal", "uitgebreid"]),
+            "ambition": rng.randint(1, 4),
+            "language": rng.choice(["nl", "nl", "en"]),
+            "variation_seed": rng.randint(0, 10_000),
+        })
+
+    return contexts
+
+
+def synthetic_catalog(n: int, seed: int = 7) -> DishCatalog:
+    """Grote catalogus (duizenden gerechten) op basis van DISHES."""
+    rng = random.Random(seed)
+    extra = ["met noten", "met kaas", "uit de wok", "met gluten", "met lactose", ""]
+    dishes = []
+
+    for i in range(n):
+        base = DISHES[i % len(DISHES)]
+        suffix = f" {rng.choice(extra)} #{i}".replace("  ", " ")
+        dishes.append(
+            Dish(
+                base.name_nl + suffix,
+                base.name_en + suffix,
+                base.profile,
+                base.veg,
+                tags=base.tags,
+            )
+        )
+
+    return DishCatalog(dishes)
+
+
+def bench(n: int) -> None:
+    contexts = make_contexts(n)
+
+    start = time.perf_counter()
+    single = [plan(c) for c in contexts]
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = list(plan_many(contexts))
+    t_batch = time.perf_counter() - start
+
+    assert single == batch, "plan_many wijkt af van plan()"
+
+    print(
+        f"{n:>8} contexts | plan(): {t_single / n * 1e6:6.2f} µs/plan "
+        f"| plan_many(): {t_batch / n * 1e6:6.2f} µs/plan "
+        f"| x{t_single / t_batch:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sizes", nargs="*", type=int, default=list(SIZES))
+    parser.add_argument("--catalog", type=int, default=0, help="synthetische catalogusgrootte")
+    args = parser.parse_args()
+
+    if args.catalog:
+        engine.CATALOG = synthetic_catalog(args.catalog)
+
+    print(f"catalogus: {len(engine.CATALOG.dishes)} gerechten")
+    for n in args.sizes:
+        bench(n)
@@ -0,0 +1,89 @@
+# =========================================================
+# BENCHMARK — Peet Card PDF's per seconde
+# Voor: stylesheet + stijlen per PDF opnieuw (oude build_plan_pdf)
+# Na:   gedeelde PlanPdfRenderer
+# Gebruik: python benchmarks/bench_render_pdf.py [aantal PDF's]
+# =========================================================
+
+import io
+import sys
+import time
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine.render_pdf import PlanPdfRenderer, get_renderer
+
+
+# Typisch recept: 12 ingrediënten, 7 stappen
+RECIPE = dict(
+    dish_name="Romige kip met prei en krieltjes",
+    nutrition={"calories_kcal": 1280, "protein_g": 84, "fat_g": 52, "carbs_g": 110},
+    ingredients=[
+        {"amount": "400 g", "item": "kipfilet (in blokjes)"},
+        {"amount": "2 stuks", "item": "prei"},
+        {"amount": "600 g", "item": "krieltjes"},
+        {"amount": "1", "item": "ui"},
+        {"amount": "2 tenen", "item": "knoflook"},
+        {"amount": "200 ml", "item": "kookroom"},
+        {"amount": "150 ml", "item": "kippenbouillon"},
+        {"amount": "1 el", "item": "mosterd"},
+        {"amount": "2 el", "item": "olijfolie"},
+        {"amount": "1 tl", "item": "tijm"},
+        {"amount": "1/2 bos", "item": "peterselie"},
+        {"amount": "snufje", "item": "zout en peper"},
+    ],
+    preparation=[
+        "Kook de krieltjes in 15 minuten gaar in water met zout.",
+        "Snijd de prei in ringen en snipper de ui.",
+        "Bak de kip in de olie rondom goudbruin en zet apart.",
+        "Fruit ui en knoflook kort aan in dezelfde pan.",
+        "Voeg de prei toe en bak 5 minuten mee tot hij zacht is.",
+        "Blus af met bouillon en room, roer de mosterd en tijm erdoor.",
+        "Schep de kip en krieltjes erdoor en maak af met peterselie.",
+    ],
+    cook_time_min=30,
+    cook_time_max=35,
+    calories_kcal=1280,
+    persons=2,
+    protein_g=42.0,
+    fat_g=26.0,
+    carbs_g=55.0,
+    protein_pct=30,
+    fat_pct=41,
+    carbs_pct=29,
+)
+
+
+def before() -> None:
+    # oude situatie: elke PDF bouwt stylesheet, stijlen en tabelstijl opnieuw
+    PlanPdfRenderer().render(io.BytesIO(), **RECIPE)
+
+
+def after() -> None:
+    get_renderer().render(io.BytesIO(), **RECIPE)
+
+
+def bench(label: str, fn, n: int) -> float:
+    fn()  # warm-up (fonts, imports)
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed > 0 else 0.0
+    print(f"{label:<28} {elapsed:6.2f} s • {rate:7.1f} PDF/s")
+    return rate
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{n} PDF's (12 ingrediënten, 7 stappen)")
+    old = bench("voor: renderer per PDF", before, n)
+    new = bench("na: gedeelde renderer", after, n)
+    print(f"winst: {new / old:.2f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# =========================================================
+# BENCHMARK — Vooruit-PDF: canvas vs Platypus (sequentieel / parallel)
+# Gebruik: python benchmarks/bench_vooruit_pdf.py [dagen] [woorden per stap] [workers]
+# Parallel heeft pypdf nodig en loont pas bij meerdere cores en grote plannen.
+# =========================================================
+
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from apps.peet_kiest_vooruit.pdf_vooruit import PdfWriter, build_vooruit_pdf, render_vooruit_pdf_bytes
+from bench_wrap import make_days
+
+
+SHOPPING = [
+    {"zone": "AGF", "item": "ui", "amount": "3 stuks"},
+    {"zone": "Vlees/vis/vega", "item": "kipfilet", "amount": "1,2 kg"},
+    {"zone": "Houdbaar", "item": "rijst", "amount": "750 g"},
+]
+
+
+def bench(label: str, fn, repeat: int = 3) -> float:
+    fn()  # warm-up (fonts, worker-processen)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:8.1f} ms")
+    return best
+
+
+def main() -> None:
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    words = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    days = [dict(d, day=i + 1) for i, d in enumerate((make_days(words) * n_days)[:n_days])]
+    print(f"{n_days} dagen × 7 stappen × {words} woorden • {os.cpu_count()} cores")
+
+    bench("canvas (build_vooruit_pdf)", lambda: build_vooruit_pdf(io.BytesIO(), days, 6, SHOPPING))
+    bench("platypus, 1 proces", lambda: render_vooruit_pdf_bytes(days, 6, SHOPPING, workers=0))
+
+    if PdfWriter is not None and workers > 1:
+        bench(f"platypus, {workers} processen", lambda: render_vooruit_pdf_bytes(days, 6, SHOPPING, workers=workers))
+    else:
+        print("parallel overgeslagen (pypdf ontbreekt of 1 worker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# =========================================================
+# BENCHMARK — bereidingsstappen wrappen in de Vooruit-PDF
+# Voor: wrap_lines per stap + opnieuw per regel (nummer-check), join per woord
+# Na:   wrap_text (stringWidth, lineair), één keer per stap
+# Gebruik: python benchmarks/bench_wrap.py [woorden per stap]
+# =========================================================
+
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from apps.peet_kiest_vooruit.pdf_vooruit import build_vooruit_pdf, wrap_text
+
+
+WORDS = (
+    "snijd de ui fijn en fruit hem zachtjes in een scheut olijfolie tot hij glazig is "
+    "voeg de knoflook toe en bak nog een minuut mee roer de tomatenpuree erdoor "
+    "blus af met bouillon laat rustig pruttelen proef en breng op smaak met zout peper"
+).split()
+
+
+# -------------------------------------------------
+# Oude code (pdf_vooruit vóór wrap_text)
+# -------------------------------------------------
+def legacy_wrap_lines(text, max_chars=95):
+    text = text.replace("\n", " ").strip()
+    if not text:
+        return []
+    words = text.split()
+    lines, line = [], []
+    for w0 in words:
+        trial = (" ".join(line + [w0])).strip()
+        if len(trial) <= max_chars:
+            line.append(w0)
+        else:
+            lines.append(" ".join(line))
+            line = [w0]
+    if line:
+        lines.append(" ".join(line))
+    return lines
+
+
+def legacy_steps(days):
+    out = []
+    for d in days:
+        for step_no, step in enumerate(d["preparation"], 1):
+            for ln in legacy_wrap_lines(step, max_chars=100):
+                prefix = f"{step_no}. " if ln == legacy_wrap_lines(step, 100)[0] else "   "
+                out.append((prefix + ln)[:130])
+    return out
+
+
+def new_steps(days):
+    out = []
+    for d in days:
+        prep = d["preparation"]
+        width = 490 - stringWidth(f"{len(prep)}. ", "Helvetica", 10)
+        for step_no, step in enumerate(prep, 1):
+            for i, ln in enumerate(wrap_text(step, width)):
+                out.append((f"{step_no}. " if i == 0 else "   ") + ln)
+    return out
+
+
+def make_days(words_per_step: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "day": day,
+            "kitchen": "NL/BE",
+            "dish_name": f"Gerecht {day}",
+            "nutrition": {"calories_kcal": 1400, "protein_g": 80, "fat_g": 50, "carbs_g": 140},
+            "ingredients": [{"amount": "200 g", "item": "kipfilet"}] * 10,
+            "preparation": [
+                " ".join(rng.choice(WORDS) for _ in range(words_per_step)) + "."
+                for _ in range(7)
+            ],
+        }
+        for day in range(1, 6)
+    ]
+
+
+def bench(label: str, fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best * 1000:8.2f} ms")
+    return best
+
+
+def main() -> None:
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    days = make_days(words)
+
+    print(f"5 dagen × 7 stappen × {words} woorden (beste van 5)")
+    old = bench("oud: wrap_lines (stappen)", lambda: legacy_steps(days))
+    new = bench("nieuw: wrap_text (stappen)", lambda: new_steps(days))
+    bench("nieuw: volledige PDF", lambda: build_vooruit_pdf(io.BytesIO(), days, 2, []))
+
+    print(f"wrappen: {old / new:.1f}× sneller")
+
+
+if __name__ == "__main__":
+    main()
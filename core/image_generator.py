@@ -2,30 +2,59 @@
 
 import os
 import base64
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
 from openai import OpenAI
 
+from core.logging_utils import get_logger
+from core.tracing import span
+from peet_engine.shared.image_store import get_image_store, normalize_dish_name
+
 API_KEY = os.getenv("OPENAI_API_KEY")
 
-_client = OpenAI(api_key=API_KEY)
+# Max. gelijktijdige image-calls (gpt-image-1 is traag en betaald)
+IMAGE_WORKERS = int(os.getenv("PEET_IMAGE_WORKERS", "2"))
+
+log = get_logger("images")
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
 
-OUTPUT_DIR = "output/images"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+def _get_client() -> OpenAI:
+    # lazy: importeren kan ook zonder API-sleutel
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(api_key=API_KEY)
+    return _client
 
 
 def generate_food_image(dish_name: str) -> str:
     """
     Genereert een food afbeelding op basis van gerechtnaam.
-    Geeft pad naar lokaal PNG bestand terug.
+    Geeft pad naar het lokale PNG-origineel in de image store terug
+    (varianten voor scherm/PDF: zie peet_engine.shared.image_store).
     """
 
     if not dish_name:
         return ""
 
-    filename = "".join(c for c in dish_name if c.isalnum() or c in " -_").rstrip()
-    path = os.path.join(OUTPUT_DIR, f"{filename}.png")
+    store = get_image_store()
 
-    # Cache: als al bestaat → niet opnieuw genereren
-    if os.path.exists(path):
+    # Cache: al in de store (of een bijna-gelijke naam) → niet opnieuw genereren
+    path = store.lookup(dish_name)
+    if path:
+        stats = store.stats()
+        log.info(
+            "image uit store voor %r (hit rate %.0f%%)",
+            dish_name,
+            stats["hit_rate"] * 100,
+            extra={"image_store": stats},
+        )
         return path
 
     prompt = f"""
@@ -39,7 +68,7 @@ def generate_food_image(dish_name: str) -> str:
     Geen restaurantstijl, geen studio belichting, geen glamour.
     """
 
-    result = _client.images.generate(
+    result = _get_client().images.generate(
         model="gpt-image-1",
         prompt=prompt,
         size="1024x1024"
@@ -48,7 +77,81 @@ def generate_food_image(dish_name: str) -> str:
     image_base64 = result.data[0].b64_json
     image_bytes = base64.b64decode(image_base64)
 
-    with open(path, "wb") as f:
-        f.write(image_bytes)
-
+    path = store.put(dish_name, image_bytes)
+    log.info(
+        "image gegenereerd voor %r (hit rate %.0f%%)",
+        dish_name,
+        store.stats()["hit_rate"] * 100,
+    )
     return path
+
+
+# -------------------------------------------------
+# Image service (achtergrond, dedup, prefetch)
+# -------------------------------------------------
+class ImageService:
+    """
+    Genereert afbeeldingen op een begrensde thread-pool.
+    - submit() geeft direct een Future (pad naar PNG)
+    - gelijke gerechten die nog lopen delen één Future
+    - prefetch() = submit zonder te wachten
+    """
+
+    def __init__(self, workers: int = IMAGE_WORKERS):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, workers),
+            thread_name_prefix="peet-image",
+        )
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(dish_name: str) -> str:
+        return normalize_dish_name(dish_name)
+
+    def submit(self, dish_name: str) -> Future:
+        key = self._key(dish_name or "")
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+
+            future = self._pool.submit(self._generate, dish_name)
+            self._inflight[key] = future
+
+        future.add_done_callback(lambda f, k=key: self._done(k, f))
+        return future
+
+    @staticmethod
+    def _generate(dish_name: str) -> str:
+        with span("image"):
+            return generate_food_image(dish_name)
+
+    def prefetch(self, dish_name: str) -> None:
+        if dish_name:
+            self.submit(dish_name)
+
+    def _done(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if not future.cancelled() and future.exception() is not None:
+            log.warning("image-gen mislukt: %s", future.exception())
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+
+_service: Optional[ImageService] = None
+
+
+def get_image_service() -> ImageService:
+    global _service
+    if _service is None:
+        with _client_lock:
+            if _service is None:
+                _service = ImageService()
+    return _service
@@ -1,7 +1,10 @@
 import base64
 from openai import OpenAI
 
+from core.logging_utils import get_logger
+
 client = OpenAI()
+log = get_logger("images")
 
 def generate_dish_image_bytes(dish_name: str) -> bytes | None:
     """
@@ -26,5 +29,5 @@ def generate_dish_image_bytes(dish_name: str) -> bytes | None:
 
     except Exception as e:
         # Geen crash in de app, alleen stil falen
-        print(f"[image-gen] {e}")
+        log.warning("image-gen mislukt: %s", e)
         return None
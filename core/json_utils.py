@@ -1,6 +1,8 @@
 # core/json_utils.py
 
+import re
 import json
+from typing import Any, Dict, List, Optional, Tuple
 
 def extract_json(text: str) -> dict:
     start = text.find("{")
@@ -8,3 +10,146 @@ def extract_json(text: str) -> dict:
     if start == -1 or end == -1:
         raise ValueError("Geen JSON gevonden.")
     return json.loads(text[start:end + 1])
+
+
+# -------------------------------------------------
+# Incrementele parser (streaming LLM-output)
+# -------------------------------------------------
+_KEY_RE = re.compile(r'^\s*("(?:[^"\\]|\\.)*")\s*:\s*$', re.DOTALL)
+
+# Events:
+#   ("field", key, value)  → top-level veld is compleet
+#   ("item", key, value)   → element van een top-level lijst is compleet
+Event = Tuple[str, str, Any]
+
+
+class IncrementalJSONParser:
+    """
+    Leest een JSON-object dat in stukjes binnenkomt.
+    - top-level velden komen vrij zodra ze compleet zijn
+    - elementen van top-level lijsten (ingredients, steps) komen
+      per stuk vrij, nog voordat de lijst dicht is
+    Alles vóór de eerste '{' (bv. ```json) wordt overgeslagen.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+
+        self._text = ""
+        self._pos = 0
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+
+        self._member_start = 0
+        self._array_key: Optional[str] = None
+        self._item_start = 0
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> List[Event]:
+        events: List[Event] = []
+
+        if self.done or not chunk:
+            return events
+
+        self._text += chunk
+        text = self._text
+
+        i = self._pos
+        n = len(text)
+
+        while i < n:
+            ch = text[i]
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = i + 1
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+
+            elif ch in "{[":
+                if self._depth == 1 and ch == "[":
+                    # top-level lijst: sleutel nu al bekend
+                    self._array_key = self._member_key(text[self._member_start:i])
+                    self._item_start = i + 1
+                self._depth += 1
+
+            elif ch in "}]":
+                if self._depth == 2 and ch == "]" and self._array_key is not None:
+                    self._emit_item(text[self._item_start:i], events)
+                    self._array_key = None
+
+                self._depth -= 1
+
+                if self._depth == 0:
+                    self._emit_field(text[self._member_start:i], events)
+                    self.done = True
+                    i += 1
+                    break
+
+            elif ch == ",":
+                if self._depth == 1:
+                    self._emit_field(text[self._member_start:i], events)
+                    self._member_start = i + 1
+                elif self._depth == 2 and self._array_key is not None:
+                    self._emit_item(text[self._item_start:i], events)
+                    self._item_start = i + 1
+
+            i += 1
+
+        self._pos = i
+        return events
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+    @staticmethod
+    def _member_key(prefix: str) -> Optional[str]:
+        m = _KEY_RE.match(prefix)
+        if not m:
+            return None
+        try:
+            return json.loads(m.group(1))
+        except Exception:
+            return None
+
+    def _emit_field(self, member: str, events: List[Event]) -> None:
+        if not member.strip():
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except Exception:
+            return
+        for key, value in parsed.items():
+            self.fields[key] = value
+            events.append(("field", key, value))
+
+    def _emit_item(self, raw: str, events: List[Event]) -> None:
+        if not raw.strip():
+            return
+        try:
+            value = json.loads(raw)
+        except Exception:
+            return
+        events.append(("item", self._array_key, value))
@@ -4,140 +4,701 @@
 
 import os
 import time
-from openai import OpenAI, RateLimitError, APIError, APITimeoutError
+import random
+import asyncio
+import hashlib
+import queue
+import sqlite3
+import threading
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional
 
+from openai import AsyncOpenAI, RateLimitError, APIError, APITimeoutError
+
+from core.logging_utils import get_logger
 from core.prompt import PROMPT
 
 
+log = get_logger("llm")
+
+
 # -------------------------------------------------
 # Config
 # -------------------------------------------------
 MODEL = os.getenv("OPENAI_MODEL", "gpt-5.2")
 API_KEY = os.getenv("OPENAI_API_KEY")
 
-_client = OpenAI(api_key=API_KEY)
-
 MAX_RETRIES = 3
-RETRY_DELAY = 1.5  # seconden (exponentieel)
+RETRY_DELAY = 1.5  # seconden (exponentieel, met jitter)
+
+# Max. gelijktijdige LLM-calls over alle sessies heen
+MAX_CONCURRENCY = int(os.getenv("PEET_LLM_CONCURRENCY", "8"))
+
+# Timeout per poging (seconden); per call te overschrijven
+REQUEST_TIMEOUT = float(os.getenv("PEET_LLM_TIMEOUT", "90"))
+
+# Persistente response-cache (overleeft deploys/restarts)
+CACHE_ENABLED = os.getenv("PEET_LLM_CACHE", "1") != "0"
+CACHE_PATH = os.getenv("PEET_LLM_CACHE_PATH", "output/cache/llm_responses.sqlite3")
+CACHE_TTL = float(os.getenv("PEET_LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconden
+CACHE_MAX_BYTES = int(float(os.getenv("PEET_LLM_CACHE_MAX_MB", "50")) * 1024 * 1024)
+
 
 # -------------------------------------------------
-# Public API (unchanged for other scripts)
+# Foutteksten per flow (gebruikersgericht)
 # -------------------------------------------------
-def call_peet_text(user_context: str, *, system_prompt: str = PROMPT):
+_TEXT_MESSAGES: Dict[str, str] = {
+    "no_key": "Peet kan even geen verbinding maken. API-sleutel ontbreekt.",
+    "empty": "Peet is even stil. Refresh nog een keer.",
+    "rate_limit": "Peet heeft het druk. Probeer het zo nog eens.",
+    "timeout": "Peet deed er te lang over. Probeer opnieuw.",
+    "api_error": "Peet had een technisch probleem. Nog een keer proberen helpt meestal.",
+    "unknown": "Peet kon het gerecht niet ophalen. Refresh even.",
+}
+
+_VOORUIT_MESSAGES: Dict[str, str] = {
+    **_TEXT_MESSAGES,
+    "empty": "Peet kwam even niet uit zijn woorden. Probeer opnieuw.",
+    "unknown": "Peet kon het menu niet ophalen. Refresh even.",
+}
+
 
+# -------------------------------------------------
+# Response cache (SQLite, content-addressed)
+# -------------------------------------------------
+class ResponseCache:
+    """
+    Disk-cache voor ruwe LLM output_text.
+    - sleutel: sha256 over (model, system prompt, user context, max_output_tokens)
+    - TTL per entry + LRU-eviction op totale grootte
+    - bewaart timing-metadata (latency, hits, laatst gebruikt)
     """
-    Peet-Card (vandaag)
 
-    - veilig
-    - retry bij tijdelijke errors
-    - backwards compatible
+    def __init__(self, path: str, ttl: float = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                max_output_tokens INTEGER NOT NULL,
+                output_text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                latency_ms REAL NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        user_context: str,
+        max_output_tokens: int,
+    ) -> str:
+        h = hashlib.sha256()
+        for part in (model, system_prompt, user_context, str(max_output_tokens)):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT output_text, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            text, created_at = row
+
+            if now - created_at > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._db.execute(
+                "UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            return text
+
+    def put(
+        self,
+        key: str,
+        output_text: str,
+        *,
+        model: str,
+        max_output_tokens: int,
+        latency_ms: float,
+    ) -> None:
+        now = time.time()
+        size = len(output_text.encode("utf-8"))
+
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, model, max_output_tokens, output_text, size,
+                     latency_ms, created_at, last_used, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (key, model, max_output_tokens, output_text, size, latency_ms, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        # verlopen entries eruit
+        self._db.execute(
+            "DELETE FROM responses WHERE created_at < ?",
+            (now - self.ttl,),
+        )
+
+        # daarna: minst recent gebruikt eruit tot onder de grootte-limiet
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        ).fetchall()
+
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size, hits, latency = self._db.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0),
+                       COALESCE(AVG(latency_ms), 0)
+                FROM responses
+                """
+            ).fetchone()
+
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "avg_latency_ms": round(latency, 1),
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_failed = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Gedeelde cache-instantie; None als uitgeschakeld of niet beschikbaar."""
+    global _response_cache, _response_cache_failed
+
+    if not CACHE_ENABLED or _response_cache_failed:
+        return None
+
+    if _response_cache is None:
+        try:
+            _response_cache = ResponseCache(CACHE_PATH)
+        except Exception:
+            # read-only schijf e.d. → gewoon zonder cache verder
+            _response_cache_failed = True
+            return None
+
+    return _response_cache
+
+
+# -------------------------------------------------
+# Gedeelde async client op één achtergrond-loop
+# -------------------------------------------------
+# Alle calls (sync én async) lopen via deze loop:
+# één connectiepool, één concurrency-limiet, backoff zonder threads te blokkeren.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+_async_client: Optional[AsyncOpenAI] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+# Single-flight: identieke calls die tegelijk lopen delen één task
+_inflight: Dict[str, "asyncio.Task[str]"] = {}
+_coalesce_stats: Dict[str, int] = {"calls": 0, "coalesced": 0}
+
+
+def _client_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever,
+                name="peet-llm-loop",
+                daemon=True,
+            ).start()
+            _loop = loop
+
+    return _loop
+
+
+def _get_async_client() -> AsyncOpenAI:
+    # alleen aanroepen vanaf de client-loop
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(api_key=API_KEY)
+    return _async_client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    # alleen aanroepen vanaf de client-loop
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENCY))
+    return _semaphore
+
+
+async def _on_client_loop(coro: Coroutine[Any, Any, str]) -> str:
+    """Voert coro uit op de client-loop, ook als de caller een eigen loop heeft."""
+    loop = _client_loop()
+
+    if asyncio.get_running_loop() is loop:
+        return await coro
+
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def _run_sync(coro: Coroutine[Any, Any, str]) -> str:
+    """Sync brug: wacht op het resultaat van coro op de client-loop."""
+    return asyncio.run_coroutine_threadsafe(coro, _client_loop()).result()
+
+
+def _backoff(attempt: int) -> float:
+    # exponentieel met jitter: 1.5s, 3s, 6s … × [0.5, 1.5)
+    return RETRY_DELAY * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+async def _cache_get(cache: Optional[ResponseCache], key: str) -> Optional[str]:
+    """Cache-lookup buiten de event-loop; een kapotte cache is een miss."""
+    if cache is None:
+        return None
+    try:
+        return await asyncio.to_thread(cache.get, key)
+    except Exception:
+        log.warning("LLM-cache lezen mislukt", exc_info=True)
+        return None
+
+
+async def _cache_put(cache: Optional[ResponseCache], key: str, text: str, **meta: Any) -> None:
+    """Cache-write buiten de event-loop; een fout kost nooit het (betaalde) antwoord."""
+    if cache is None:
+        return
+    try:
+        await asyncio.to_thread(cache.put, key, text, **meta)
+    except Exception:
+        log.warning("LLM-cache schrijven mislukt", exc_info=True)
+
+
+def coalescing_stats() -> Dict[str, int]:
+    """Aantal LLM-aanvragen en hoeveel daarvan op een lopende call meeliftten."""
+    return dict(_coalesce_stats)
+
+
+async def _respond(
+    user_context: str,
+    *,
+    system_prompt: str,
+    max_output_tokens: int,
+    messages: Dict[str, str],
+    timeout: Optional[float],
+    emit: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    Eén Responses-call, gededupliceerd.
+    Draait altijd op de client-loop; _inflight wordt dus nooit
+    vanuit twee threads tegelijk aangeraakt.
+    Met emit streamt de leider zijn delta's; meeliftende callers
+    (gestreamd of niet) krijgen de eindtekst in één keer.
     """
 
     if not API_KEY:
-        return "Peet kan even geen verbinding maken. API-sleutel ontbreekt."
+        if emit is not None:
+            emit(messages["no_key"])
+        return messages["no_key"]
+
+    key = ResponseCache.make_key(MODEL, system_prompt, user_context, max_output_tokens)
+    _coalesce_stats["calls"] += 1
+
+    task = _inflight.get(key)
+    leader = task is None
+
+    if leader:
+        if emit is not None:
+            call = _stream(
+                key,
+                user_context,
+                system_prompt=system_prompt,
+                max_output_tokens=max_output_tokens,
+                messages=messages,
+                timeout=timeout,
+                emit=emit,
+            )
+        else:
+            call = _fetch(
+                key,
+                user_context,
+                system_prompt=system_prompt,
+                max_output_tokens=max_output_tokens,
+                messages=messages,
+                timeout=timeout,
+            )
+        task = asyncio.ensure_future(call)
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    else:
+        _coalesce_stats["coalesced"] += 1
+
+    # shield: een afhakende caller annuleert de gedeelde call niet
+    text = await asyncio.shield(task)
+
+    if emit is not None and not leader:
+        emit(text)
+
+    return text
+
+
+async def _fetch(
+    key: str,
+    user_context: str,
+    *,
+    system_prompt: str,
+    max_output_tokens: int,
+    messages: Dict[str, str],
+    timeout: Optional[float],
+) -> str:
+    """
+    Eén Responses-call met retry.
+    - concurrency begrensd via semaphore
+    - timeout per poging
+    - backoff via asyncio.sleep (blokkeert niets)
+    - succesvolle output gaat naar de persistente cache
+      (lezen/schrijven in een thread, fouten worden gelogd en genegeerd)
+    """
+
+    cache = get_response_cache()
+
+    cached = await _cache_get(cache, key)
+    if cached is not None:
+        return cached
+
+    client = _get_async_client()
+    limit = _get_semaphore()
+    per_call = REQUEST_TIMEOUT if timeout is None else timeout
 
     attempt = 0
 
     while attempt < MAX_RETRIES:
         try:
-            resp = _client.responses.create(
-                model=MODEL,
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_context},
-                ],
-                max_output_tokens=1500,   # ruim genoeg voor recept
-            )
-
+            async with limit:
+                started = time.perf_counter()
+                resp = await asyncio.wait_for(
+                    client.responses.create(
+                        model=MODEL,
+                        input=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_context},
+                        ],
+                        max_output_tokens=max_output_tokens,
+                    ),
+                    timeout=per_call,
+                )
 
             text = (resp.output_text or "").strip()
 
             if not text:
-                return "Peet is even stil. Refresh nog een keer."
+                return messages["empty"]
+
+            await _cache_put(
+                cache,
+                key,
+                text,
+                model=MODEL,
+                max_output_tokens=max_output_tokens,
+                latency_ms=(time.perf_counter() - started) * 1000,
+            )
 
             return text
 
         except RateLimitError:
             # quota / tijdelijke limiet
             attempt += 1
+            log.warning("LLM rate_limit (poging %d/%d)", attempt, MAX_RETRIES)
             if attempt >= MAX_RETRIES:
-                return "Peet heeft het druk. Probeer het zo nog eens."
+                return messages["rate_limit"]
 
-            time.sleep(RETRY_DELAY * attempt)
+            await asyncio.sleep(_backoff(attempt))
 
-        except APITimeoutError:
+        except (APITimeoutError, asyncio.TimeoutError):
             attempt += 1
+            log.warning("LLM timeout (poging %d/%d)", attempt, MAX_RETRIES)
             if attempt >= MAX_RETRIES:
-                return "Peet deed er te lang over. Probeer opnieuw."
+                return messages["timeout"]
 
-            time.sleep(RETRY_DELAY * attempt)
+            await asyncio.sleep(_backoff(attempt))
 
         except APIError:
             attempt += 1
+            log.warning("LLM api_error (poging %d/%d)", attempt, MAX_RETRIES)
             if attempt >= MAX_RETRIES:
-                return "Peet had een technisch probleem. Nog een keer proberen helpt meestal."
+                return messages["api_error"]
 
-            time.sleep(RETRY_DELAY * attempt)
+            await asyncio.sleep(_backoff(attempt))
 
         except Exception:
             # onbekende fout → geen crash
-            return "Peet kon het gerecht niet ophalen. Refresh even."
+            log.exception("LLM-call mislukt")
+            return messages["unknown"]
+
+    return messages["unknown"]
+
+
+def _error_kind(exc: BaseException) -> str:
+    # volgorde telt: RateLimitError en APITimeoutError zijn ook APIError
+    if isinstance(exc, RateLimitError):
+        return "rate_limit"
+    if isinstance(exc, (APITimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    if isinstance(exc, APIError):
+        return "api_error"
+    return "unknown"
+
+
+async def _stream(
+    key: str,
+    user_context: str,
+    *,
+    system_prompt: str,
+    max_output_tokens: int,
+    messages: Dict[str, str],
+    timeout: Optional[float],
+    emit: Callable[[str], None],
+) -> str:
+    """
+    Streaming-variant van _fetch: geeft tekst-delta's door via emit en
+    geeft de eindtekst terug (voor meeliftende callers en de cache).
+    - cache-hit → volledige tekst in één keer
+    - timeout geldt voor de hele stream, niet alleen voor het openen
+    - retry alleen zolang er nog niets gestreamd is
+    - bij fout vóór de eerste delta: de gewone foutmelding
+    """
 
-# -------------------------------------------------
-# PeetKiest Vooruit — nieuw, geïsoleerd
-# -------------------------------------------------
-def call_peet_vooruit(user_context: str, *, system_prompt: str):
+    cache = get_response_cache()
 
-    """
-    PeetKiest Vooruit (2–5 dagen)
+    cached = await _cache_get(cache, key)
+    if cached is not None:
+        emit(cached)
+        return cached
 
-    - gebruikt eigen prompt
-    - zelfde retry- en foutgedrag
-    - raakt call_peet_text NIET
-    """
+    client = _get_async_client()
+    limit = _get_semaphore()
+    per_call = REQUEST_TIMEOUT if timeout is None else timeout
 
-    if not API_KEY:
-        return "Peet kan even geen verbinding maken. API-sleutel ontbreekt."
+    parts: List[str] = []
+
+    async def consume() -> None:
+        stream = await client.responses.create(
+            model=MODEL,
+            input=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_context},
+            ],
+            max_output_tokens=max_output_tokens,
+            stream=True,
+        )
+
+        async for event in stream:
+            if event.type == "response.output_text.delta" and event.delta:
+                parts.append(event.delta)
+                emit(event.delta)
 
     attempt = 0
 
     while attempt < MAX_RETRIES:
+        parts.clear()
+
         try:
-            resp = _client.responses.create(
-                model=MODEL,
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_context},
-                ],
-                max_output_tokens=3000,  # meer ruimte voor meerdere dagen
-            )
+            async with limit:
+                started = time.perf_counter()
+                await asyncio.wait_for(consume(), timeout=per_call)
 
-            text = (resp.output_text or "").strip()
+            text = "".join(parts).strip()
 
             if not text:
-                return "Peet kwam even niet uit zijn woorden. Probeer opnieuw."
+                emit(messages["empty"])
+                return messages["empty"]
 
+            await _cache_put(
+                cache,
+                key,
+                text,
+                model=MODEL,
+                max_output_tokens=max_output_tokens,
+                latency_ms=(time.perf_counter() - started) * 1000,
+            )
             return text
 
-        except RateLimitError:
-            attempt += 1
-            if attempt >= MAX_RETRIES:
-                return "Peet heeft het druk. Probeer het zo nog eens."
-            time.sleep(RETRY_DELAY * attempt)
+        except Exception as exc:
+            kind = _error_kind(exc)
+            log.warning("LLM stream %s (poging %d/%d)", kind, attempt + 1, MAX_RETRIES)
 
-        except APITimeoutError:
-            attempt += 1
-            if attempt >= MAX_RETRIES:
-                return "Peet deed er te lang over. Probeer opnieuw."
-            time.sleep(RETRY_DELAY * attempt)
+            # al deels gestreamd → niet opnieuw beginnen, caller valt terug;
+            # meeliftende callers krijgen de foutmelding, niet de halve tekst
+            if parts or kind == "unknown":
+                if not parts:
+                    emit(messages["unknown"])
+                return messages[kind]
 
-        except APIError:
             attempt += 1
             if attempt >= MAX_RETRIES:
-                return "Peet had een technisch probleem. Nog een keer proberen helpt meestal."
-            time.sleep(RETRY_DELAY * attempt)
+                emit(messages[kind])
+                return messages[kind]
 
-        except Exception:
-            return "Peet kon het menu niet ophalen. Refresh even."
+            await asyncio.sleep(_backoff(attempt))
+
+    return messages["unknown"]
+
+
+_STREAM_DONE = object()
+
+
+# -------------------------------------------------
+# Async API
+# -------------------------------------------------
+async def acall_peet_text(
+    user_context: str,
+    *,
+    system_prompt: str = PROMPT,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Peet-Card (vandaag), async.
+    Zelfde contract en foutteksten als call_peet_text.
+    """
+    return await _on_client_loop(
+        _respond(
+            user_context,
+            system_prompt=system_prompt,
+            max_output_tokens=1500,   # ruim genoeg voor recept
+            messages=_TEXT_MESSAGES,
+            timeout=timeout,
+        )
+    )
+
+
+async def acall_peet_vooruit(
+    user_context: str,
+    *,
+    system_prompt: str,
+    timeout: Optional[float] = None,
+    max_output_tokens: int = 3000,
+) -> str:
+    """
+    PeetKiest Vooruit (2–5 dagen), async.
+    Zelfde contract en foutteksten als call_peet_vooruit.
+    """
+    return await _on_client_loop(
+        _respond(
+            user_context,
+            system_prompt=system_prompt,
+            max_output_tokens=max_output_tokens,  # meer ruimte voor meerdere dagen
+            messages=_VOORUIT_MESSAGES,
+            timeout=timeout,
+        )
+    )
+
+
+# -------------------------------------------------
+# Public API (unchanged for other scripts)
+# -------------------------------------------------
+def call_peet_text(user_context: str, *, system_prompt: str = PROMPT):
+
+    """
+    Peet-Card (vandaag)
+
+    - veilig
+    - retry bij tijdelijke errors
+    - backwards compatible
+    """
+
+    return _run_sync(acall_peet_text(user_context, system_prompt=system_prompt))
+
+def stream_peet_text(
+    user_context: str,
+    *,
+    system_prompt: str = PROMPT,
+    timeout: Optional[float] = None,
+) -> Iterator[str]:
+    """
+    Peet-Card (vandaag), streaming.
+    Geeft tekst-delta's terug zodra ze binnenkomen; samengevoegd is
+    het dezelfde tekst als call_peet_text (incl. cache, single-flight
+    en foutteksten).
+    """
+
+    chunks: "queue.Queue[Any]" = queue.Queue()
+
+    future = asyncio.run_coroutine_threadsafe(
+        _respond(
+            user_context,
+            system_prompt=system_prompt,
+            max_output_tokens=1500,
+            messages=_TEXT_MESSAGES,
+            timeout=timeout,
+            emit=chunks.put,
+        ),
+        _client_loop(),
+    )
+    future.add_done_callback(lambda _f: chunks.put(_STREAM_DONE))
+
+    while True:
+        chunk = chunks.get()
+        if chunk is _STREAM_DONE:
+            break
+        yield chunk
+
+# -------------------------------------------------
+# PeetKiest Vooruit — nieuw, geïsoleerd
+# -------------------------------------------------
+def call_peet_vooruit(user_context: str, *, system_prompt: str):
+
+    """
+    PeetKiest Vooruit (2–5 dagen)
+
+    - gebruikt eigen prompt
+    - zelfde retry- en foutgedrag
+    - raakt call_peet_text NIET
+    """
+
+    return _run_sync(acall_peet_vooruit(user_context, system_prompt=system_prompt))
 
 # -------------------------------------------------
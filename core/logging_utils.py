@@ -0,0 +1,146 @@
+# core/logging_utils.py
+
+"""
+Logging voor alle Peet-apps (logger-namespace "peet").
+
+Env:
+  PEET_LOG_LEVEL            DEBUG / INFO / WARNING (default) / ERROR
+  PEET_LOG_FORMAT           "json" (één JSON-object per regel) of "text" (default)
+  PEET_LOG_PAYLOADS         "1" → LLM-payloads loggen (default uit)
+  PEET_LOG_PAYLOAD_SAMPLE   fractie van payloads die gelogd wordt (default 1.0)
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from core.tracing import TRACER
+
+
+ROOT_LOGGER = "peet"
+
+LOG_LEVEL = os.getenv("PEET_LOG_LEVEL", "WARNING").upper()
+LOG_FORMAT = os.getenv("PEET_LOG_FORMAT", "text").lower()
+PAYLOADS_ENABLED = os.getenv("PEET_LOG_PAYLOADS", "0") == "1"
+PAYLOAD_SAMPLE = float(os.getenv("PEET_LOG_PAYLOAD_SAMPLE", "1.0"))
+
+# standaardvelden van LogRecord → niet als extra meesturen
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+# -------------------------------------------------
+# Formatter
+# -------------------------------------------------
+class JSONFormatter(logging.Formatter):
+    """Eén JSON-object per regel; extra=... velden komen top-level mee."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                out[key] = value
+
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+# -------------------------------------------------
+# Setup
+# -------------------------------------------------
+_configured = False
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> None:
+    """Eén handler op de "peet"-logger (idempotent, ook bij Streamlit-reruns)."""
+    global _configured
+
+    root = logging.getLogger(ROOT_LOGGER)
+
+    if _configured and level is None and fmt is None:
+        return
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    handler = logging.StreamHandler(sys.stderr)
+
+    if (fmt or LOG_FORMAT) == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root.addHandler(handler)
+    root.setLevel((level or LOG_LEVEL).upper())
+    root.propagate = False
+
+    _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+# -------------------------------------------------
+# Payloads (alleen als expliciet aangezet)
+# -------------------------------------------------
+def log_payload(logger: logging.Logger, label: str, payload: Any) -> None:
+    """
+    Logt een volledige payload op DEBUG, gesampled.
+    Serialiseren gebeurt pas na alle checks: uit = geen kosten.
+    """
+    if not PAYLOADS_ENABLED or not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    if PAYLOAD_SAMPLE < 1.0 and random.random() >= PAYLOAD_SAMPLE:
+        return
+
+    logger.debug("%s %s", label, json.dumps(payload, ensure_ascii=False, default=str))
+
+
+# -------------------------------------------------
+# Stage-timings
+# -------------------------------------------------
+@contextmanager
+def log_stage(logger: logging.Logger, stage: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Meet een stap (monotone klok) en logt duur op INFO:
+        with log_stage(log, "llm", streaming=True) as info:
+            ...
+            info["cache"] = "hit"
+    Extra velden in info komen mee in de logregel.
+    De duur gaat ook naar de tracer (p50/p95/p99, zie core.tracing).
+    """
+    info: Dict[str, Any] = dict(fields)
+    start = time.perf_counter()
+    failed = False
+
+    try:
+        yield info
+    except Exception:
+        failed = True
+        raise
+    finally:
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        TRACER.record(stage, duration_ms, **info)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "stage %s %.1f ms",
+                stage,
+                duration_ms,
+                extra={"stage": stage, "duration_ms": duration_ms, "failed": failed, **info},
+            )
@@ -19,7 +19,6 @@ DOEL
 - Heldere ingrediënten
 - Duidelijke bereiding
 - Volledige voedingswaarden (kcal + macro’s)
-- Eén gezamenlijke boodschappenlijst
 
 ALGEMENE REGELS
 - Output ALLEEN geldige JSON
@@ -73,16 +72,6 @@ PER DAG MOET JE TERUGGEVEN
     - item
 - preparation: lijst van korte, duidelijke stappen
 
-Boodschappenlijst
-- Combineer alle dagen
-- Groepeer per zone:
-    AGF
-    Zuivel & eieren
-    Vlees/vis/vega
-    Houdbaar
-    Kruiden & oliën
-    Overig
-
 JSON STRUCTUUR (VERPLICHT)
 
 {{
@@ -104,13 +93,6 @@ JSON STRUCTUUR (VERPLICHT)
         ""
       ]
     }}
-  ],
-  "shopping_list": [
-    {{
-      "zone": "",
-      "item": "",
-      "amount": ""
-    }}
   ]
 }}
 
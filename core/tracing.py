@@ -0,0 +1,260 @@
+# core/tracing.py
+
+"""
+Lichte tracing per stap (stage) en per request.
+
+    with trace_request("card"):
+        with span("llm"):
+            ...
+
+    @traced("plan")
+    def plan(...): ...
+
+Duur via monotone klok (perf_counter). Per stage worden de laatste
+TRACE_SAMPLES metingen bewaard → p50/p95/p99 en een histogram.
+
+Env:
+  PEET_DEV          "1" → trace-panel zichtbaar in de app
+  PEET_TRACE_FILE   pad → elk afgerond request als JSONL-regel erbij
+  PEET_TRACE_SAMPLES  aantal metingen per stage (default 5000)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+DEV_MODE = os.getenv("PEET_DEV", "0") == "1"
+TRACE_FILE = os.getenv("PEET_TRACE_FILE", "")
+TRACE_SAMPLES = int(os.getenv("PEET_TRACE_SAMPLES", "5000"))
+
+# histogram-grenzen in ms (1-2-5 reeks)
+HISTOGRAM_BOUNDS: Tuple[float, ...] = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 60000,
+)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _Request:
+    __slots__ = ("request_id", "name", "started", "ts", "stages")
+
+    def __init__(self, name: str):
+        self.request_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started = time.perf_counter()
+        self.ts = time.time()
+        self.stages: List[Dict[str, Any]] = []
+
+
+_current: ContextVar[Optional[_Request]] = ContextVar("peet_trace_request", default=None)
+
+
+class Tracer:
+    """
+    Verzamelt stage-duur (ms) en afgeronde requests.
+    Thread-safe; begrensd geheugen (deques).
+    """
+
+    def __init__(self, samples: int = TRACE_SAMPLES, requests: int = 1000, trace_file: str = TRACE_FILE):
+        self.samples = max(1, int(samples))
+        self.trace_file = trace_file
+        self._stages: Dict[str, Deque[float]] = {}
+        self._requests: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(requests)))
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Meten
+    # -----------------------------
+    def record(self, stage: str, duration_ms: float, **fields: Any) -> None:
+        with self._lock:
+            bucket = self._stages.get(stage)
+            if bucket is None:
+                bucket = self._stages[stage] = deque(maxlen=self.samples)
+            bucket.append(duration_ms)
+
+        req = _current.get()
+        if req is not None:
+            req.stages.append({"stage": stage, "duration_ms": round(duration_ms, 3), **fields})
+
+    @contextmanager
+    def span(self, stage: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Meet een blok; extra velden via de geretourneerde dict."""
+        info: Dict[str, Any] = dict(fields)
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000, **info)
+
+    def traced(self, stage: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator: elke aanroep is een span (default: functienaam)."""
+        def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+            name = stage or fn.__name__
+
+            @wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    @contextmanager
+    def request(self, name: str = "request") -> Iterator[_Request]:
+        """
+        Eén request (bv. één Streamlit-run): alle spans daarbinnen
+        komen in hetzelfde record, ook bij st.stop()/st.rerun().
+        """
+        req = _Request(name)
+        token = _current.set(req)
+        try:
+            yield req
+        finally:
+            _current.reset(token)
+            self._finish(req)
+
+    def _finish(self, req: _Request) -> None:
+        if not req.stages:
+            return
+
+        row = {
+            "request_id": req.request_id,
+            "name": req.name,
+            "ts": round(req.ts, 3),
+            "total_ms": round((time.perf_counter() - req.started) * 1000, 3),
+            "stages": req.stages,
+        }
+
+        with self._lock:
+            self._requests.append(row)
+
+            if self.trace_file:
+                try:
+                    with open(self.trace_file, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+                except OSError:
+                    pass
+
+    # -----------------------------
+    # Uitlezen
+    # -----------------------------
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per stage: count, mean, p50, p95, p99, max (ms)."""
+        with self._lock:
+            snapshot = {stage: sorted(values) for stage, values in self._stages.items()}
+
+        out: Dict[str, Dict[str, float]] = {}
+        for stage, values in snapshot.items():
+            if not values:
+                continue
+            out[stage] = {
+                "count": len(values),
+                "mean": round(sum(values) / len(values), 3),
+                "p50": round(_percentile(values, 50), 3),
+                "p95": round(_percentile(values, 95), 3),
+                "p99": round(_percentile(values, 99), 3),
+                "max": round(values[-1], 3),
+            }
+        return out
+
+    def histogram(self, stage: str) -> List[Tuple[str, int]]:
+        """Aantal metingen per bucket ("≤ 10 ms", …, "> 60000 ms")."""
+        with self._lock:
+            values = list(self._stages.get(stage, ()))
+
+        counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        for v in values:
+            for i, bound in enumerate(HISTOGRAM_BOUNDS):
+                if v <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+
+        labels = [f"≤ {b:g} ms" for b in HISTOGRAM_BOUNDS] + [f"> {HISTOGRAM_BOUNDS[-1]:g} ms"]
+        return list(zip(labels, counts))
+
+    def requests(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._requests)
+
+    def to_jsonl(self) -> str:
+        return "".join(
+            json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in self.requests()
+        )
+
+    def dump_jsonl(self, path: str) -> int:
+        """Schrijft alle bewaarde requests naar path; geeft het aantal terug."""
+        rows = self.requests()
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        return len(rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._requests.clear()
+
+
+# -------------------------------------------------
+# Proces-brede tracer
+# -------------------------------------------------
+TRACER = Tracer()
+
+span = TRACER.span
+traced = TRACER.traced
+trace_request = TRACER.request
+
+
+# -------------------------------------------------
+# Dev-panel (Streamlit)
+# -------------------------------------------------
+def render_trace_panel(tracer: Tracer = TRACER) -> None:
+    """Alleen zichtbaar met PEET_DEV=1."""
+    if not DEV_MODE:
+        return
+
+    import streamlit as st
+
+    with st.expander("⏱️ Tracing (dev)", expanded=False):
+        summary = tracer.summary()
+
+        if not summary:
+            st.caption("Nog geen metingen.")
+            return
+
+        st.table([
+            {"stage": stage, **stats}
+            for stage, stats in sorted(summary.items(), key=lambda kv: -kv[1]["p95"])
+        ])
+
+        stage = st.selectbox("Histogram", sorted(summary))
+        st.bar_chart(
+            [{"bucket": label, "count": count} for label, count in tracer.histogram(stage) if count],
+            x="bucket",
+            y="count",
+        )
+
+        st.download_button(
+            "Download traces (JSONL)",
+            data=tracer.to_jsonl(),
+            file_name="peet_traces.jsonl",
+            mime="application/json",
+        )
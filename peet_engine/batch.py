@@ -0,0 +1,179 @@
+# =========================================================
+# PEET ENGINE — BATCH RUNNER (CLI)
+# Nachtelijke planning: JSONL contexts in → JSONL plannen uit
+#
+#   python -m peet_engine.batch contexts.jsonl -o plans.jsonl
+#   python -m peet_engine.batch - --workers 8 --chunk-size 2000 < in.jsonl
+# =========================================================
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Iterable, Iterator, List, Optional, TextIO
+
+from peet_engine.run import call_peet_engine_many
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# ---------------------------------------------------------
+# Werk per chunk (draait in een worker-proces)
+# ---------------------------------------------------------
+def plan_chunk(lines: List[str]) -> List[str]:
+    """
+    Eén chunk JSONL-regels → evenveel JSONL-regels (zelfde volgorde).
+    Ongeldige regels geven {"error": ...}, zodat de volgorde klopt.
+    """
+    parsed: List[Any] = []
+
+    for line in lines:
+        try:
+            raw = json.loads(line)
+        except Exception:
+            parsed.append(ValueError("Ongeldige JSON input voor Peet Engine"))
+            continue
+
+        if not isinstance(raw, dict):
+            parsed.append(ValueError("Context moet een JSON object zijn"))
+            continue
+
+        parsed.append(raw)
+
+    results = call_peet_engine_many(p for p in parsed if isinstance(p, dict))
+
+    out: List[str] = []
+    for p in parsed:
+        if isinstance(p, Exception):
+            out.append(json.dumps({"error": str(p)}, ensure_ascii=False))
+        else:
+            out.append(json.dumps(next(results), ensure_ascii=False))
+
+    return out
+
+
+# ---------------------------------------------------------
+# Sharding
+# ---------------------------------------------------------
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(lines)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(
+    lines: Iterable[str],
+    out: TextIO,
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Plant alle regels en schrijft ze in invoervolgorde naar out.
+    Chunks worden begrensd ingediend (max 2 per worker in de lucht),
+    zodat geheugen niet meegroeit met de invoer.
+    Geeft het aantal geschreven plannen terug.
+    """
+    contexts = (ln for ln in lines if ln.strip())
+    chunks = _chunks(contexts, max(1, chunk_size))
+
+    written = 0
+
+    # 1 worker → in-process, geen pool-overhead
+    if workers <= 1:
+        for chunk in chunks:
+            written += _write(out, plan_chunk(chunk))
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+
+        for chunk in chunks:
+            pending.append(pool.submit(plan_chunk, chunk))
+
+            if len(pending) >= workers * 2:
+                written += _write(out, pending.popleft().result())
+
+        while pending:
+            written += _write(out, pending.popleft().result())
+
+    return written
+
+
+def _write(out: TextIO, rows: List[str]) -> int:
+    for row in rows:
+        out.write(row)
+        out.write("\n")
+    return len(rows)
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m peet_engine.batch",
+        description="Plant JSONL contexts (zelfde vorm als call_peet_engine) in batch.",
+    )
+    parser.add_argument(
+        "input",
+        help="JSONL met één context per regel ('-' = stdin)",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="-",
+        help="JSONL met één plan per regel ('-' = stdout)",
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="aantal worker-processen (1 = in-process)",
+    )
+    parser.add_argument(
+        "-c", "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="aantal contexts per chunk",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    start = time.perf_counter()
+
+    try:
+        count = run_batch(src, dst, workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+
+    # samenvatting naar stderr (stdout kan de output zijn)
+    print(
+        f"{count} plannen in {elapsed:.2f} s • {rate:,.0f} plannen/s "
+        f"• {args.workers} workers • chunk {args.chunk_size}",
+        file=sys.stderr,
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
 from __future__ import annotations
+import re
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from peet_engine.shared.cache import LRUCache
 
 
 # -----------------------------
@@ -74,6 +78,7 @@ class Dish:
     veg: bool
     tags: tuple[str, ...] = ()
     avoid: tuple[str, ...] = ()
+    kitchen: Optional[str] = None  # None = keukenloos (matcht alleen 'vrij')
 
 
 DISHES: List[Dish] = [
@@ -96,6 +101,177 @@ DISHES: List[Dish] = [
     Dish("Stoofpotje met rund en wortel", "Beef and carrot stew", "afronding", False, tags=("stoof",)),
 ]
 
+
+# -----------------------------
+# Dish catalog (index)
+# -----------------------------
+class DishCatalog:
+    """
+    Eenmalig opgebouwde index over een lijst gerechten.
+    - zoektekst per gerecht vooraf lowercase
+    - kandidaten per (profiel, keuken, veg, taal) al op naam gesorteerd
+    - fallback-volgorde per (keuken, veg, taal, gewenst profiel) al gesorteerd
+    - uitsluitingen (allergie + no-go) als bitset, gecached per restrictieset
+
+    Selectie = dict lookup + gefilterde slice.
+    Uitkomst is identiek aan een lineaire scan over DISHES.
+    """
+
+    # Begrenzing van de uitsluitings-cache (aantal restrictiesets)
+    EXCLUSION_CACHE_SIZE = 1024
+
+    def __init__(self, dishes: List[Dish]):
+        self.dishes: tuple[Dish, ...] = tuple(dishes)
+        self.search_text: tuple[str, ...] = tuple(
+            _search_text(d) for d in self.dishes
+        )
+
+        # Eén doorlopende tekst over de hele catalogus (eenmalig).
+        # Offsets wijzen per gerecht naar het begin van zijn stuk tekst.
+        self._offsets: List[int] = []
+        pos = 0
+        for text in self.search_text:
+            self._offsets.append(pos)
+            pos += len(text) + 1
+        self._corpus = "\n".join(self.search_text)
+
+        self._exclusions: Dict[tuple, int] = {}
+        self.names: Dict[str, tuple[str, ...]] = {
+            lang: tuple(_dish_name(d, lang) for d in self.dishes)
+            for lang in ALLOWED_LANG
+        }
+
+        kitchens = {"vrij"} | {d.kitchen for d in self.dishes if d.kitchen}
+
+        self._candidates: Dict[tuple, tuple[int, ...]] = {}
+        self._fallback: Dict[tuple, tuple[int, ...]] = {}
+
+        for lang in ALLOWED_LANG:
+            names = self.names[lang]
+
+            for kitchen in kitchens:
+                for veg in (False, True):
+                    pool = [
+                        i for i, d in enumerate(self.dishes)
+                        if (not veg or d.veg)
+                        and (kitchen == "vrij" or d.kitchen == kitchen)
+                    ]
+
+                    for profile, rank in PROFILE_RANK.items():
+                        # stabiele sortering → zelfde volgorde als voorheen
+                        self._candidates[(profile, kitchen, veg, lang)] = tuple(
+                            sorted(
+                                (i for i in pool if self.dishes[i].profile == profile),
+                                key=names.__getitem__,
+                            )
+                        )
+                        self._fallback[(profile, kitchen, veg, lang)] = tuple(
+                            sorted(
+                                pool,
+                                key=lambda i: (
+                                    abs(PROFILE_RANK[self.dishes[i].profile] - rank),
+                                    names[i],
+                                ),
+                            )
+                        )
+
+    def candidates(
+        self,
+        profile: str,
+        kitchen: str,
+        vegetarian: bool,
+        language: str,
+    ) -> tuple[int, ...]:
+        """Gesorteerde catalogus-indices voor profiel + keuken + veg."""
+        return self._candidates.get((profile, kitchen, bool(vegetarian), language), ())
+
+    def fallback_order(
+        self,
+        profile: str,
+        kitchen: str,
+        vegetarian: bool,
+        language: str,
+    ) -> tuple[int, ...]:
+        """Alle indices binnen keuken + veg, dichtst bij profiel eerst."""
+        return self._fallback.get((profile, kitchen, bool(vegetarian), language), ())
+
+    def exclusion_mask(
+        self,
+        allergies: Iterable[str],
+        nogo: Iterable[str] = (),
+    ) -> int:
+        """
+        Bitset (int) over de catalogus: bit i staat aan als gerecht i
+        een allergie- of no-go-term bevat (substring, lowercase).
+        Herhaalde aanvragen met dezelfde restricties raken de cache.
+        """
+        key = (_restriction_key(allergies), _restriction_key(nogo))
+
+        mask = self._exclusions.get(key)
+        if mask is not None:
+            return mask
+
+        mask = self._match(key[0] + key[1])
+
+        if len(self._exclusions) >= self.EXCLUSION_CACHE_SIZE:
+            # oudste restrictieset eruit (dict houdt invoegvolgorde vast)
+            del self._exclusions[next(iter(self._exclusions))]
+        self._exclusions[key] = mask
+
+        return mask
+
+    def _match(self, terms: tuple[str, ...]) -> int:
+        if not terms:
+            return 0
+
+        # één gecombineerde regex: langste termen eerst
+        pattern = re.compile(
+            "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+        )
+
+        mask = 0
+        offsets = self._offsets
+        pos = 0
+
+        while True:
+            m = pattern.search(self._corpus, pos)
+            if m is None:
+                return mask
+
+            # match → gerecht; daarna direct door naar het volgende gerecht
+            index = bisect_right(offsets, m.start()) - 1
+            mask |= 1 << index
+
+            if index + 1 >= len(offsets):
+                return mask
+            pos = offsets[index + 1]
+
+
+def _dish_name(dish: Dish, language: str) -> str:
+    return dish.name_en if language == "en" else dish.name_nl
+
+
+def _search_text(dish: Dish) -> str:
+    return " ".join(
+        [
+            dish.name_nl.lower(),
+            dish.name_en.lower(),
+            " ".join(dish.tags).lower(),
+            " ".join(dish.avoid).lower(),
+        ]
+    )
+
+
+def _restriction_key(terms: Iterable[str]) -> tuple[str, ...]:
+    return tuple(sorted({str(t).strip().lower() for t in terms if str(t).strip()}))
+
+
+CATALOG = DishCatalog(DISHES)
+
+# Memo voor plan(): begrensd, met hit/miss-tellers
+PLAN_CACHE_SIZE = 1024
+_PLAN_CACHE = LRUCache(maxsize=PLAN_CACHE_SIZE)
+
 # -----------------------------
 # Public API
 # -----------------------------
@@ -108,6 +284,9 @@ def plan(context: Dict[str, Any]) -> Dict[str, Any]:
     - Geen UI
     - Geen LLM-calls hier
     - Wel: expliciete output voor UI en PDF
+
+    Zelfde input → zelfde output, dus gememoized op de canonieke
+    genormaliseerde context. Elke aanroep krijgt een eigen kopie.
     """
 
     # =============================
@@ -115,6 +294,26 @@ def plan(context: Dict[str, Any]) -> Dict[str, Any]:
     # =============================
     ctx = _normalize_context(context)
 
+    key = _canonical_key(ctx)
+    cached = _PLAN_CACHE.get(key)
+
+    if cached is None:
+        cached = _plan_normalized(ctx)
+        _PLAN_CACHE.put(key, cached)
+
+    return _copy_plan(cached)
+
+
+def plan_cache_info() -> Dict[str, int]:
+    """Hits, misses en vulling van de plan-cache."""
+    return _PLAN_CACHE.info()
+
+
+def plan_cache_clear() -> None:
+    _PLAN_CACHE.clear()
+
+
+def _plan_normalized(ctx: Dict[str, Any]) -> Dict[str, Any]:
     days: int = ctx["days"]
     persons: int = ctx["persons"]
     language: str = ctx["language"]
@@ -148,6 +347,7 @@ def plan(context: Dict[str, Any]) -> Dict[str, Any]:
             kitchen=kitchen,
             vegetarian=ctx["vegetarian"],
             allergies=ctx["allergies"],
+            nogo=ctx["nogo"],
             language=language,
             used_names=used_names,
             moment=ctx["moment"],
@@ -163,6 +363,7 @@ def plan(context: Dict[str, Any]) -> Dict[str, Any]:
                 kitchen=kitchen,
                 vegetarian=ctx["vegetarian"],
                 allergies=ctx["allergies"],
+                nogo=ctx["nogo"],
                 language=language,
                 used_names=used_names,
             )
@@ -173,37 +374,98 @@ def plan(context: Dict[str, Any]) -> Dict[str, Any]:
         # =============================
         # 4. Dag-output (rijk, maar stabiel)
         # =============================
-        day_out: Dict[str, Any] = {
-            "day": idx + 1,
-            "profile": profile,
-            "kitchen": kitchen,
-            "dish_name": dish_name,
-            "ambition": day_ambition,
-            "why": _why_line(
-                language=language,
+        out_days.append(
+            _day_output(
+                idx=idx,
                 profile=profile,
                 kitchen=kitchen,
-                moment=ctx["moment"],
-                time=ctx["time"],
+                dish=dish,
+                dish_name=dish_name,
                 ambition=day_ambition,
-            ),
-        }
+                why=_why_line(
+                    language=language,
+                    profile=profile,
+                    kitchen=kitchen,
+                    moment=ctx["moment"],
+                    time=ctx["time"],
+                    ambition=day_ambition,
+                ),
+            )
+        )
+
+    # =============================
+    # 5. Resultaat (engine-contract)
+    # =============================
+    return _plan_result(days=days, persons=persons, out_days=out_days)
 
-        # Optioneel verrijken (alleen als aanwezig)
-        if hasattr(dish, "recipe_text") and dish.recipe_text:
-            day_out["recipe_text"] = dish.recipe_text
 
-        if hasattr(dish, "recipe_steps") and dish.recipe_steps:
-            day_out["recipe_steps"] = dish.recipe_steps
+def plan_many(contexts: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Batch-variant van plan(): per context exact dezelfde uitkomst.
+    - kandidaten één keer gefilterd per restrictieset (veg, allergie, no-go)
+    - ritme + why-regels één keer per (dagen, moment, tijd, ambitie)
+    - per context alleen nog seed + personen toepassen
+    Resultaten komen als stream, in invoervolgorde.
+    """
+    filters: Dict[tuple, _CandidateGroup] = {}
+    rhythms: Dict[tuple, List[tuple]] = {}
+
+    for context in contexts:
+        ctx = _normalize_context(context)
+
+        key = _constraint_key(ctx)
+        group = filters.get(key)
+        if group is None:
+            group = filters[key] = _CandidateGroup(ctx)
+
+        key = _rhythm_key(ctx)
+        rhythm = rhythms.get(key)
+        if rhythm is None:
+            rhythm = rhythms[key] = _day_rhythm(ctx)
+
+        yield group.plan(
+            rhythm=rhythm,
+            variation_seed=ctx["variation_seed"],
+            persons=ctx["persons"],
+        )
 
-        if hasattr(dish, "ingredients") and dish.ingredients:
-            day_out["ingredients"] = dish.ingredients
 
-        out_days.append(day_out)
+def _day_output(
+    idx: int,
+    profile: str,
+    kitchen: str,
+    dish: Dish,
+    dish_name: str,
+    ambition: int,
+    why: str,
+) -> Dict[str, Any]:
+    day_out: Dict[str, Any] = {
+        "day": idx + 1,
+        "profile": profile,
+        "kitchen": kitchen,
+        "dish_name": dish_name,
+        "ambition": ambition,
+        "why": why,
+    }
 
-    # =============================
-    # 5. Resultaat (engine-contract)
-    # =============================
+    # Optioneel verrijken (alleen als aanwezig)
+    if hasattr(dish, "recipe_text") and dish.recipe_text:
+        day_out["recipe_text"] = dish.recipe_text
+
+    if hasattr(dish, "recipe_steps") and dish.recipe_steps:
+        day_out["recipe_steps"] = dish.recipe_steps
+
+    if hasattr(dish, "ingredients") and dish.ingredients:
+        day_out["ingredients"] = dish.ingredients
+
+    return day_out
+
+
+def _plan_result(
+    days: int,
+    persons: int,
+    out_days: List[Dict[str, Any]],
+) -> Dict[str, Any]:
     result: Dict[str, Any] = {
         "days_count": days,
         "persons": persons,
@@ -221,6 +483,175 @@ def plan(context: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
+# -----------------------------
+# Batch internals
+# -----------------------------
+def _canonical_key(ctx: Dict[str, Any]) -> tuple:
+    """Volledige, volgorde-onafhankelijke sleutel voor plan()."""
+    return (
+        _constraint_key(ctx),
+        _rhythm_key(ctx),
+        ctx["persons"],
+        ctx["variation_seed"],
+    )
+
+
+def _copy_plan(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Kopie van een (gecached) plan: callers muteren days[0] achteraf.
+    Alleen dicts en lijsten worden gekopieerd; de rest is immutable.
+    """
+    out = dict(result)
+    out["days"] = [
+        {k: list(v) if isinstance(v, list) else v for k, v in day.items()}
+        for day in result["days"]
+    ]
+    for k in ("recipe_text", "recipe_steps"):
+        if isinstance(out.get(k), list):
+            out[k] = list(out[k])
+    return out
+
+
+def _constraint_key(ctx: Dict[str, Any]) -> tuple:
+    """Alles wat de kandidaten per dag bepaalt (niet persons/seed)."""
+    return (
+        ctx["days"],
+        ctx["vegetarian"],
+        tuple(sorted(set(ctx["allergies"]))),
+        tuple(sorted(set(ctx["nogo"]))),
+        ctx["language"],
+    )
+
+
+def _rhythm_key(ctx: Dict[str, Any]) -> tuple:
+    """Alles wat profiel, keuken, ambitie en why-regel per dag bepaalt."""
+    return (
+        ctx["days"],
+        ctx["language"],
+        ctx["moment"],
+        ctx["time"],
+        ctx["ambition"],
+    )
+
+
+def _day_rhythm(ctx: Dict[str, Any]) -> List[tuple]:
+    """Per dag: (profile, kitchen, ambition, why)."""
+    days = ctx["days"]
+    profiles = determine_day_profiles(days)
+    kitchens = determine_kitchen_sequence(days)
+    ambitions = _spread_ambition(days=days, base=_apply_ambition_caps(ctx))
+
+    return [
+        (
+            profiles[idx],
+            kitchens[idx],
+            ambitions[idx],
+            _why_line(
+                language=ctx["language"],
+                profile=profiles[idx],
+                kitchen=kitchens[idx],
+                moment=ctx["moment"],
+                time=ctx["time"],
+                ambition=ambitions[idx],
+            ),
+        )
+        for idx in range(days)
+    ]
+
+
+class _CandidateGroup:
+    """
+    Voorgefilterde kandidaten voor één restrictieset.
+    Per dag al zonder allergie/no-go; per seed wordt alleen nog
+    een index berekend rond de al gebruikte namen heen.
+    """
+
+    def __init__(self, ctx: Dict[str, Any]):
+        self.days: int = ctx["days"]
+        self.language: str = ctx["language"]
+        self.names = CATALOG.names[self.language]
+
+        excluded = CATALOG.exclusion_mask(ctx["allergies"], ctx["nogo"])
+
+        profiles = determine_day_profiles(self.days)
+        kitchens = determine_kitchen_sequence(self.days)
+
+        # per dag: (kandidaten, posities per naam, fallback-volgorde)
+        self.slots: List[tuple] = []
+
+        for profile, kitchen in zip(profiles, kitchens):
+            candidates = tuple(
+                i
+                for i in CATALOG.candidates(profile, kitchen, ctx["vegetarian"], self.language)
+                if not excluded >> i & 1
+            )
+            fallback = tuple(
+                i
+                for i in CATALOG.fallback_order(profile, kitchen, ctx["vegetarian"], self.language)
+                if not excluded >> i & 1
+            )
+
+            positions: Dict[str, List[int]] = {}
+            for pos, i in enumerate(candidates):
+                positions.setdefault(self.names[i], []).append(pos)
+
+            self.slots.append((candidates, positions, fallback))
+
+    def plan(
+        self,
+        rhythm: List[tuple],
+        variation_seed: int,
+        persons: int,
+    ) -> Dict[str, Any]:
+        names = self.names
+        used_names: Set[str] = set()
+        out_days: List[Dict[str, Any]] = []
+
+        for idx, (day, slot) in enumerate(zip(rhythm, self.slots)):
+            profile, kitchen, ambition, why = day
+            candidates, positions, fallback = slot
+
+            # posities van al gekozen namen → die slaan we over
+            skip = sorted(
+                pos for name in used_names for pos in positions.get(name, ())
+            )
+            remaining = len(candidates) - len(skip)
+
+            dish: Optional[Dish] = None
+
+            if remaining > 0:
+                index = (variation_seed + idx + 1) % remaining
+                for pos in skip:
+                    if pos > index:
+                        break
+                    index += 1
+                dish = CATALOG.dishes[candidates[index]]
+
+            # Harde fallback (mag nooit None blijven)
+            if dish is None:
+                dish = next(
+                    (CATALOG.dishes[i] for i in fallback if names[i] not in used_names),
+                    None,
+                ) or _emergency_dish(profile, kitchen)
+
+            dish_name = _dish_name(dish, self.language)
+            used_names.add(dish_name)
+
+            out_days.append(
+                _day_output(
+                    idx=idx,
+                    profile=profile,
+                    kitchen=kitchen,
+                    dish=dish,
+                    dish_name=dish_name,
+                    ambition=ambition,
+                    why=why,
+                )
+            )
+
+        return _plan_result(days=self.days, persons=persons, out_days=out_days)
+
+
 # -----------------------------
 # Internals
 # -----------------------------
@@ -341,33 +772,21 @@ def _pick_dish(
     time: str,
     ambition: int,
     variation_seed: int,
+    nogo: Optional[List[str]] = None,
 ) -> Optional[Dish]:
 
-    candidates: list[Dish] = []
-
-    for d in DISHES:
-        # profiel afdwingen
-        if d.profile != profile:
-            continue
-
-        # keuken afdwingen (behalve bij 'vrij')
-        if kitchen != "vrij" and d.kitchen != kitchen:
-            continue
-
-        # vegetarisch
-        if vegetarian and not d.veg:
-            continue
-
-        # allergieën
-        if _hits_allergy(d, allergies):
-            continue
+    names = CATALOG.names[language]
+    excluded = CATALOG.exclusion_mask(allergies, nogo or ())
 
+    # profiel + keuken + vegetarisch: al geïndexeerd en gesorteerd
+    candidates = [
+        i
+        for i in CATALOG.candidates(profile, kitchen, vegetarian, language)
+        # allergieën + no-go
+        if not excluded >> i & 1
         # geen herhaling
-        name = d.name_en if language == "en" else d.name_nl
-        if name in used_names:
-            continue
-
-        candidates.append(d)
+        and names[i] not in used_names
+    ]
 
     if not candidates:
         return None
@@ -375,16 +794,10 @@ def _pick_dish(
     # VARIATIE-SEED (deterministisch, niet random)
     seed = variation_seed or 0
 
-
-    # vaste, stabiele sortering
-    candidates.sort(
-        key=lambda d: d.name_en if language == "en" else d.name_nl
-    )
-
-    # seed bepaalt startpunt
+    # seed bepaalt startpunt (volgorde ligt vast in de catalogus)
     index = seed % len(candidates)
 
-    return candidates[index]
+    return CATALOG.dishes[candidates[index]]
 
 
 
@@ -398,60 +811,40 @@ def _fallback_pick(
     allergies: List[str],
     language: str,
     used_names: set[str],
+    nogo: Optional[List[str]] = None,
 ) -> Dish:
-    pool = []
+    names = CATALOG.names[language]
+    excluded = CATALOG.exclusion_mask(allergies, nogo or ())
 
-    for d in DISHES:
-        # vegetarisch
-        if vegetarian and not d.veg:
-            continue
-
-        # allergieën
-        if _hits_allergy(d, allergies):
-            continue
-
-        # keuken afdwingen (behalve bij 'vrij')
-        if kitchen != "vrij" and d.kitchen != kitchen:
+    # zo dicht mogelijk bij gewenst profiel: volgorde ligt vast in de catalogus
+    for i in CATALOG.fallback_order(profile, kitchen, vegetarian, language):
+        # allergieën + no-go
+        if excluded >> i & 1:
             continue
 
         # geen herhaling
-        name = d.name_en if language == "en" else d.name_nl
-        if name in used_names:
+        if names[i] in used_names:
             continue
 
-        pool.append(d)
+        return CATALOG.dishes[i]
 
-    if not pool:
-        # ultieme noodfallback (veilig, maar zeldzaam)
-        return Dish(
-            name_nl="Eenvoudige, veilige groenteschotel",
-            name_en="Simple, safe vegetable dish",
-            profile=profile,
-            kitchen=kitchen,
-            veg=True,
-        )
+    # ultieme noodfallback (veilig, maar zeldzaam)
+    return _emergency_dish(profile, kitchen)
 
-    # zo dicht mogelijk bij gewenst profiel
-    pool.sort(
-        key=lambda d: (
-            abs(PROFILE_RANK[d.profile] - PROFILE_RANK[profile]),
-            d.name_en if language == "en" else d.name_nl,
-        )
-    )
 
-    return pool[0]
+def _emergency_dish(profile: str, kitchen: str) -> Dish:
+    return Dish(
+        name_nl="Eenvoudige, veilige groenteschotel",
+        name_en="Simple, safe vegetable dish",
+        profile=profile,
+        kitchen=kitchen,
+        veg=True,
+    )
 
 
 
 def _hits_allergy(dish: Dish, allergies: List[str]) -> bool:
-    text = " ".join(
-        [
-            dish.name_nl.lower(),
-            dish.name_en.lower(),
-            " ".join(dish.tags).lower(),
-            " ".join(dish.avoid).lower(),
-        ]
-    )
+    text = _search_text(dish)
     return any(a in text for a in allergies)
 
 
@@ -1,11 +1,18 @@
+import hashlib
+import io
+import json
 import os
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
     Spacer,
     Table,
-    TableStyle
+    TableStyle,
+    Image,
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.pagesizes import A4
@@ -14,15 +21,309 @@ from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-pdfmetrics.registerFont(
-    TTFont("RobotoCondensed", "peet_engine/fonts/RobotoCondensed-Regular.ttf")
-)
+from peet_engine.shared.cache import LRUCache
+from peet_engine.shared.image_store import variant_path
 
-pdfmetrics.registerFont(
-    TTFont("RobotoCondensed-Bold", "peet_engine/fonts/RobotoCondensed-Bold.ttf")
-)
 
+# In-memory PDF-cache (aantal PDF's) + optionele disk-tier
+PDF_CACHE_SIZE = int(os.getenv("PEET_PDF_CACHE_SIZE", "128"))
+PDF_CACHE_DIR = os.getenv("PEET_PDF_CACHE_DIR", "")
+
+# Fonts naast deze module, onafhankelijk van de working directory
+FONT_DIR = Path(__file__).resolve().parent / "fonts"
+
+FONTS = {
+    "RobotoCondensed": "RobotoCondensed-Regular.ttf",
+    "RobotoCondensed-Bold": "RobotoCondensed-Bold.ttf",
+}
+
+_font_lock = threading.Lock()
+
+
+def register_fonts() -> None:
+    """Registreert de TTF-fonts één keer per proces."""
+    with _font_lock:
+        registered = set(pdfmetrics.getRegisteredFontNames())
+        for name, filename in FONTS.items():
+            if name not in registered:
+                pdfmetrics.registerFont(TTFont(name, str(FONT_DIR / filename)))
+
+
+# -------------------------------------------------
+# Renderer (styles één keer opbouwen, daarna hergebruiken)
+# -------------------------------------------------
+class PlanPdfRenderer:
+    """
+    Bouwt Peet Card-PDF's.
+    Fonts, stylesheet en tabelstijl worden één keer gemaakt;
+    render() is daarna alleen story + doc.build.
+    """
+
+    def __init__(self) -> None:
+        register_fonts()
+
+        styles = getSampleStyleSheet()
+
+        # -------------------------------------------------
+        # Stijlen
+        # -------------------------------------------------
+
+        styles.add(ParagraphStyle(
+            name="DishTitle",
+            fontSize=18,
+            leading=22,
+            spaceAfter=6,
+            fontName="RobotoCondensed-Bold"
+        ))
+
+        styles.add(ParagraphStyle(
+            name="Tagline",
+            fontSize=10.5,
+            leading=14,
+            spaceAfter=10,
+            textColor=colors.grey
+        ))
+
+        styles.add(ParagraphStyle(
+            name="Macros",
+            fontSize=11,
+            leading=15,
+            spaceAfter=16,
+            spaceBefore=6
+        ))
+
+        styles.add(ParagraphStyle(
+            name="Section",
+            fontSize=13,
+            leading=16,
+            spaceBefore=16,
+            spaceAfter=8,
+            fontName="RobotoCondensed-Bold"
+        ))
+
+        styles.add(ParagraphStyle(
+            name="Body",
+            fontSize=10.5,
+            leading=13,
+            spaceAfter=6
+        ))
+
+        self.styles = styles
+
+        self.ingredient_table_style = TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ("LEFTPADDING", (0, 0), (-1, -1), 2),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 2),
+        ])
+
+    def render(
+        self,
+        target: Union[str, BinaryIO],
+        dish_name,
+        nutrition,
+        ingredients,
+        preparation,
+
+        cook_time_min=None,
+        cook_time_max=None,
+
+        calories_kcal=None,
+        persons=1,
+
+        protein_g=0,
+        fat_g=0,
+        carbs_g=0,
+
+        protein_pct=0,
+        fat_pct=0,
+        carbs_pct=0,
+
+        image_path=None
+    ) -> None:
+        """Schrijft de PDF naar target (pad of binair file-object)."""
+
+        doc = SimpleDocTemplate(
+            target,
+            pagesize=A4,
+            rightMargin=2.2 * cm,
+            leftMargin=2.2 * cm,
+            topMargin=2.0 * cm,
+            bottomMargin=2.0 * cm,
+        )
+
+        story = self.build_story(
+            dish_name=dish_name,
+            ingredients=ingredients,
+            preparation=preparation,
+            cook_time_min=cook_time_min,
+            cook_time_max=cook_time_max,
+            calories_kcal=calories_kcal,
+            persons=persons,
+            protein_g=protein_g,
+            fat_g=fat_g,
+            carbs_g=carbs_g,
+            protein_pct=protein_pct,
+            fat_pct=fat_pct,
+            carbs_pct=carbs_pct,
+            image_path=image_path,
+        )
+
+        doc.build(story)
+
+    def build_story(
+        self,
+        dish_name,
+        ingredients,
+        preparation,
+        cook_time_min=None,
+        cook_time_max=None,
+        calories_kcal=None,
+        persons=1,
+        protein_g=0,
+        fat_g=0,
+        carbs_g=0,
+        protein_pct=0,
+        fat_pct=0,
+        carbs_pct=0,
+        image_path=None,
+    ) -> List[Any]:
+
+        story = []
+
+        # -------------------------------------------------
+        # Afbeelding
+        # -------------------------------------------------
+
+        # voorgeschaalde 12×8 cm JPEG uit de image store (valt terug op het origineel)
+        image_path = variant_path(image_path, "pdf")
+
+        if image_path and os.path.exists(image_path):
+            story.append(Image(image_path, width=12 * cm, height=8 * cm))
+            story.append(Spacer(1, 10))
+
+        story.append(Paragraph(dish_name, self.styles["DishTitle"]))
+        story.append(Paragraph("Peet kiest iets dat vandaag past.", self.styles["Tagline"]))
+    
+        #---------------------------------------------------
+        # Kooktijd + kcal per persoon (header)
+        #---------------------------------------------------
+
+        header_line = ""
+
+        if cook_time_min and cook_time_max:
+            if cook_time_min == cook_time_max:
+                header_line = f"{cook_time_max} min"
+            else:
+                header_line = f"{cook_time_min}–{cook_time_max} min"
+
+        if calories_kcal:
+            kcal_pp = round(calories_kcal / max(1, persons))
+            if header_line:
+                header_line += " • "
+            header_line += f"± {kcal_pp} kcal per persoon"
+
+        if header_line:
+            story.append(Paragraph(header_line, self.styles["Body"]))
+            story.append(Spacer(1, 6))
+
+
+        #---------------------------------------------------
+        # Macro’s per persoon + percentages
+        #---------------------------------------------------
+
+        macro_block = f"""
+        <b>Eiwit:</b> {protein_g} g ({protein_pct}%) &nbsp;&nbsp;
+        <b>Vet:</b> {fat_g} g ({fat_pct}%) &nbsp;&nbsp;
+        <b>Koolhydraten:</b> {carbs_g} g ({carbs_pct}%)
+        """
+
+        story.append(Paragraph(macro_block, self.styles["Macros"]))
+        story.append(Spacer(1, 12))
+
+
+        # -------------------------------------------------
+        # Ingrediënten
+        # -------------------------------------------------
+
+        story.append(Paragraph("Ingrediënten", self.styles["Section"]))
+
+        if ingredients and isinstance(ingredients, list):
+
+            rows = []
+
+            for ing in ingredients:
+
+                if isinstance(ing, dict):
+                    amount = str(ing.get("amount", "")).strip()
+                    item = str(ing.get("item", "")).strip()
+
+                    if amount and item:
+                        rows.append([
+                            Paragraph(amount, self.styles["Body"]),
+                            Paragraph(item, self.styles["Body"])
+                        ])
+
+                elif isinstance(ing, str) and ing.strip():
+                    rows.append([
+                        Paragraph("", self.styles["Body"]),
+                        Paragraph(ing.strip(), self.styles["Body"])
+                    ])
+
+            if rows:
+                table = Table(
+                    rows,
+                    colWidths=[4.5 * cm, 9.5 * cm]   # 👈 breder + beter in balans
+                )
+
+                table.setStyle(self.ingredient_table_style)
+
+                story.append(table)
+
+        else:
+            story.append(Paragraph("Geen ingrediënten beschikbaar.", self.styles["Body"]))
+        
+
+        # -------------------------------------------------
+        # Kleine scheidingsruimte (polish 2)
+        # -------------------------------------------------
+
+        story.append(Spacer(1, 8))
+        story.append(Paragraph("Zo pak je het aan", self.styles["Section"]))
+
+        if preparation:
+
+            if isinstance(preparation, list):
+                for step in preparation:
+                    if str(step).strip():
+                        story.append(Paragraph(step, self.styles["Body"]))
+
+            elif isinstance(preparation, str):
+                for line in preparation.split("\n"):
+                    line = line.strip()
+                    if line:
+                        story.append(Paragraph(line, self.styles["Body"]))
+
+        else:
+            story.append(Paragraph("Bereiding niet beschikbaar.", self.styles["Body"]))
 
+        return story
+
+
+_renderer: Optional[PlanPdfRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer() -> PlanPdfRenderer:
+    """Proces-brede renderer (lazy, thread-safe)."""
+    global _renderer
+
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = PlanPdfRenderer()
+
+    return _renderer
 
 
 def build_plan_pdf(
@@ -60,190 +361,180 @@ def build_plan_pdf(
     os.makedirs(output_dir, exist_ok=True)
     path = os.path.join(output_dir, filename)
 
-    doc = SimpleDocTemplate(
+    get_renderer().render(
         path,
-        pagesize=A4,
-        rightMargin=2.2 * cm,
-        leftMargin=2.2 * cm,
-        topMargin=2.0 * cm,
-        bottomMargin=2.0 * cm,
+        dish_name=dish_name,
+        nutrition=nutrition,
+        ingredients=ingredients,
+        preparation=preparation,
+        cook_time_min=cook_time_min,
+        cook_time_max=cook_time_max,
+        calories_kcal=calories_kcal,
+        persons=persons,
+        protein_g=protein_g,
+        fat_g=fat_g,
+        carbs_g=carbs_g,
+        protein_pct=protein_pct,
+        fat_pct=fat_pct,
+        carbs_pct=carbs_pct,
+        image_path=image_path,
     )
 
-    styles = getSampleStyleSheet()
-
-    # -------------------------------------------------
-    # Stijlen
-    # -------------------------------------------------
-
-    styles.add(ParagraphStyle(
-        name="DishTitle",
-        fontSize=18,
-        leading=22,
-        spaceAfter=6,
-        fontName="RobotoCondensed-Bold"
-    ))
-
-    styles.add(ParagraphStyle(
-        name="Tagline",
-        fontSize=10.5,
-        leading=14,
-        spaceAfter=10,
-        textColor=colors.grey
-    ))
-
-    styles.add(ParagraphStyle(
-        name="Macros",
-        fontSize=11,
-        leading=15,
-        spaceAfter=16,
-        spaceBefore=6
-    ))
-
-    styles.add(ParagraphStyle(
-        name="Section",
-        fontSize=13,
-        leading=16,
-        spaceBefore=16,
-        spaceAfter=8,
-        fontName="RobotoCondensed-Bold"
-    ))
-
-    styles.add(ParagraphStyle(
-        name="Body",
-        fontSize=10.5,
-        leading=13,
-        spaceAfter=6
-    ))
-
-    story = []
-
-    # -------------------------------------------------
-    # Afbeelding
-    # -------------------------------------------------
-
-    from reportlab.platypus import Image
-
-    if image_path and os.path.exists(image_path):
-        story.append(Image(image_path, width=12 * cm, height=8 * cm))
-        story.append(Spacer(1, 10))
-
-    story.append(Paragraph(dish_name, styles["DishTitle"]))
-    story.append(Paragraph("Peet kiest iets dat vandaag past.", styles["Tagline"]))
-    
-    #---------------------------------------------------
-    # Kooktijd + kcal per persoon (header)
-    #---------------------------------------------------
+    return path
 
-    header_line = ""
 
-    if cook_time_min and cook_time_max:
-        if cook_time_min == cook_time_max:
-            header_line = f"{cook_time_max} min"
-        else:
-            header_line = f"{cook_time_min}–{cook_time_max} min"
+# -------------------------------------------------
+# In-memory rendering met content-hash cache
+# -------------------------------------------------
+_PDF_CACHE = LRUCache(PDF_CACHE_SIZE)
+
+# (pad, mtime_ns, size) → sha256 van de afbeelding
+_IMAGE_HASHES = LRUCache(256)
 
-    if calories_kcal:
-        kcal_pp = round(calories_kcal / max(1, persons))
-        if header_line:
-            header_line += " • "
-        header_line += f"± {kcal_pp} kcal per persoon"
 
-    if header_line:
-        story.append(Paragraph(header_line, styles["Body"]))
-        story.append(Spacer(1, 6))
+def pdf_filename(dish_name: str) -> str:
+    safe_name = "".join(c for c in dish_name if c.isalnum() or c in " -_").rstrip()
+    return f"{safe_name or 'peet'}.pdf"
 
 
-    #---------------------------------------------------
-    # Macro’s per persoon + percentages
-    #---------------------------------------------------
+def _image_hash(image_path: Optional[str]) -> Optional[str]:
+    if not image_path or not os.path.exists(image_path):
+        return None
 
-    macro_block = f"""
-    <b>Eiwit:</b> {protein_g} g ({protein_pct}%) &nbsp;&nbsp;
-    <b>Vet:</b> {fat_g} g ({fat_pct}%) &nbsp;&nbsp;
-    <b>Koolhydraten:</b> {carbs_g} g ({carbs_pct}%)
+    stat = os.stat(image_path)
+    key = (image_path, stat.st_mtime_ns, stat.st_size)
+
+    digest = _IMAGE_HASHES.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(image_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _IMAGE_HASHES.put(key, digest)
+
+    return digest
+
+
+def pdf_cache_key(render_kwargs: Dict[str, Any]) -> str:
+    """
+    Hash van de volledige render-input.
+    De afbeelding telt mee via de inhoud (niet het pad).
     """
+    payload = dict(render_kwargs)
+    payload["image_path"] = _image_hash(payload.get("image_path"))
 
-    story.append(Paragraph(macro_block, styles["Macros"]))
-    story.append(Spacer(1, 12))
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
-    # -------------------------------------------------
-    # Ingrediënten
-    # -------------------------------------------------
+def _disk_path(key: str) -> Optional[Path]:
+    return Path(PDF_CACHE_DIR) / f"{key}.pdf" if PDF_CACHE_DIR else None
 
-    story.append(Paragraph("Ingrediënten", styles["Section"]))
 
-    if ingredients and isinstance(ingredients, list):
+def _disk_get(key: str) -> Optional[bytes]:
+    path = _disk_path(key)
+    if path is None:
+        return None
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
 
-        rows = []
 
-        for ing in ingredients:
+def _disk_put(key: str, data: bytes) -> None:
+    path = _disk_path(key)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)  # atomair: lezers zien nooit een halve PDF
+    except OSError:
+        pass
 
-            if isinstance(ing, dict):
-                amount = str(ing.get("amount", "")).strip()
-                item = str(ing.get("item", "")).strip()
 
-                if amount and item:
-                    rows.append([
-                        Paragraph(amount, styles["Body"]),
-                        Paragraph(item, styles["Body"])
-                    ])
+def render_plan_pdf_bytes(
+    dish_name,
+    nutrition,
+    ingredients,
+    preparation,
 
-            elif isinstance(ing, str) and ing.strip():
-                rows.append([
-                    Paragraph("", styles["Body"]),
-                    Paragraph(ing.strip(), styles["Body"])
-                ])
-
-        if rows:
-            table = Table(
-                rows,
-                colWidths=[4.5 * cm, 9.5 * cm]   # 👈 breder + beter in balans
-            )
-
-            table.setStyle(TableStyle([
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-                ("LEFTPADDING", (0, 0), (-1, -1), 2),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 2),
-            ]))
-
-            story.append(table)
-
-    else:
-        story.append(Paragraph("Geen ingrediënten beschikbaar.", styles["Body"]))
-        
+    cook_time_min=None,
+    cook_time_max=None,
+
+    calories_kcal=None,
+    persons=1,
+
+    protein_g=0,
+    fat_g=0,
+    carbs_g=0,
+
+    protein_pct=0,
+    fat_pct=0,
+    carbs_pct=0,
 
-    # -------------------------------------------------
-    # Kleine scheidingsruimte (polish 2)
-    # -------------------------------------------------
+    image_path=None
+) -> bytes:
+    """
+    Zelfde PDF als build_plan_pdf, maar in het geheugen (geen output/-bestand).
+    Gecachet op een hash van de volledige input:
+    geheugen (LRU) → disk (PEET_PDF_CACHE_DIR, optioneel) → renderen.
+    """
 
-    story.append(Spacer(1, 8))
-    story.append(Paragraph("Zo pak je het aan", styles["Section"]))
+    if not dish_name:
+        return b""
+
+    kwargs = dict(
+        dish_name=dish_name,
+        nutrition=nutrition,
+        ingredients=ingredients,
+        preparation=preparation,
+        cook_time_min=cook_time_min,
+        cook_time_max=cook_time_max,
+        calories_kcal=calories_kcal,
+        persons=persons,
+        protein_g=protein_g,
+        fat_g=fat_g,
+        carbs_g=carbs_g,
+        protein_pct=protein_pct,
+        fat_pct=fat_pct,
+        carbs_pct=carbs_pct,
+        image_path=image_path,
+    )
 
-    if preparation:
+    key = pdf_cache_key(kwargs)
 
-        if isinstance(preparation, list):
-            for step in preparation:
-                if str(step).strip():
-                    story.append(Paragraph(step, styles["Body"]))
+    data = cached_plan_pdf_bytes(key)
+    if data is not None:
+        return data
 
-        elif isinstance(preparation, str):
-            for line in preparation.split("\n"):
-                line = line.strip()
-                if line:
-                    story.append(Paragraph(line, styles["Body"]))
+    buf = io.BytesIO()
+    get_renderer().render(buf, **kwargs)
+    data = buf.getvalue()
 
-    else:
-        story.append(Paragraph("Bereiding niet beschikbaar.", styles["Body"]))
+    _disk_put(key, data)
+    _PDF_CACHE.put(key, data)
+    return data
 
 
+def cached_plan_pdf_bytes(key: str) -> Optional[bytes]:
+    """Alleen opzoeken (geheugen → disk), nooit renderen."""
+    data = _PDF_CACHE.get(key)
+    if data is not None:
+        return data
 
+    data = _disk_get(key)
+    if data is not None:
+        _PDF_CACHE.put(key, data)
 
-    # -------------------------------------------------
-    # Build PDF
-    # -------------------------------------------------
+    return data
 
-    doc.build(story)
 
-    return path
+def pdf_cache_info() -> Dict[str, int]:
+    return _PDF_CACHE.info()
+
+
+def pdf_cache_clear() -> None:
+    _PDF_CACHE.clear()
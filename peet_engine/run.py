@@ -4,10 +4,10 @@
 # =========================================================
 
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator
 
 from peet_engine.context import build_context
-from peet_engine.engine import plan
+from peet_engine.engine import plan, plan_many
 
 
 def call_peet_engine(raw_input: str | Dict[str, Any]) -> Dict[str, Any]:
@@ -20,11 +20,7 @@ def call_peet_engine(raw_input: str | Dict[str, Any]) -> Dict[str, Any]:
     """
 
     # 1. JSON → dict indien nodig
-    if isinstance(raw_input, str):
-        try:
-            raw_input = json.loads(raw_input)
-        except Exception as e:
-            raise ValueError("Ongeldige JSON input voor Peet Engine") from e
+    raw_input = _load_raw_input(raw_input)
 
     # 2. Context bouwen
     context = build_context(raw_input)
@@ -32,4 +28,26 @@ def call_peet_engine(raw_input: str | Dict[str, Any]) -> Dict[str, Any]:
     # 3. Engine uitvoeren
     result = plan(context)
 
-    return result
\ No newline at end of file
+    return result
+
+
+def call_peet_engine_many(
+    raw_inputs: Iterable[str | Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Batch-entrypoint (nachtelijke planning).
+    Zelfde input en uitkomst als call_peet_engine, per item,
+    maar via plan_many: gedeelde filtering per restrictieset.
+    Resultaten komen als stream, in invoervolgorde.
+    """
+    contexts = (build_context(_load_raw_input(raw)) for raw in raw_inputs)
+    return plan_many(contexts)
+
+
+def _load_raw_input(raw_input: str | Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(raw_input, str):
+        try:
+            return json.loads(raw_input)
+        except Exception as e:
+            raise ValueError("Ongeldige JSON input voor Peet Engine") from e
+    return raw_input
\ No newline at end of file
@@ -0,0 +1,497 @@
+# peet_engine/shared/image_store.py
+
+"""
+Content-addressed opslag voor gerecht-afbeeldingen.
+
+Sleutel = sha256 van de genormaliseerde gerechtnaam, dus
+"Kip-tikka, met rijst!" en "kip tikka met rijst" delen één afbeelding
+en lange namen raken nooit de bestandsnaam-limiet.
+
+    output/images/ab/ab12…/original.png   volledige 1024×1024 (bron)
+                          /screen.webp    scherm (max 768 px breed)
+                          /pdf.jpg        PDF: 12×8 cm @ 200 dpi, 3:2 bijgesneden
+    output/images/manifest.json           laatst gebruikt + grootte per sleutel
+
+Eviction: minst recent gebruikt eerst, tot onder PEET_IMAGE_STORE_MB
+en PEET_IMAGE_STORE_MAX.
+
+Bijna-gelijke namen ("kip tikka masala met rijst" ↔ "… met basmatirijst")
+vinden elkaar via trigram-Jaccard op de woorden (lookup()), zodat een
+kleine variatie in de LLM-naam geen nieuwe betaalde afbeelding kost.
+Eiwitbron/vega moet exact gelijk zijn: kip ↔ tofu of zalm ↔ kip nooit.
+
+Losse PNG's uit het oude platte schema (output/images/<naam>.png)
+worden bij het aanmaken van de store eenmalig gekopieerd; de bronbestanden
+blijven staan (legacy.json onthoudt wat al gekopieerd is, zodat een
+ge-evicte kopie niet telkens terugkomt).
+
+Env:
+  PEET_IMAGE_DIR        basismap (default output/images)
+  PEET_IMAGE_STORE_MB   max. totale grootte in MB (default 200)
+  PEET_IMAGE_STORE_MAX  max. aantal gerechten (default 500)
+  PEET_IMAGE_SIMILARITY min. trigram-Jaccard voor hergebruik (default 0.6, 0 = uit)
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # zonder Pillow: alleen het origineel
+    PILImage = None
+
+
+IMAGE_DIR = os.getenv("PEET_IMAGE_DIR", "output/images")
+STORE_MAX_MB = float(os.getenv("PEET_IMAGE_STORE_MB", "200"))
+STORE_MAX_ENTRIES = int(os.getenv("PEET_IMAGE_STORE_MAX", "500"))
+SIMILARITY_THRESHOLD = float(os.getenv("PEET_IMAGE_SIMILARITY", "0.6"))
+
+MANIFEST = "manifest.json"
+LEGACY_MARKER = "legacy.json"
+ORIGINAL = "original.png"
+
+# variant → (bestandsnaam, max. breedte px, beeldverhouding of None, formaat, kwaliteit)
+VARIANTS: Dict[str, Tuple[str, int, Optional[float], str, int]] = {
+    "screen": ("screen.webp", 768, None, "WEBP", 80),
+    "pdf": ("pdf.jpg", 945, 12 / 8, "JPEG", 85),  # 12 cm @ 200 dpi
+}
+
+# last_used hoeft niet bij elke lookup naar disk
+_TOUCH_FLUSH_S = 30.0
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# eiwitbron → klasse; verschilt de klasse, dan nooit hergebruiken.
+# Korte termen alleen aan het begin van een woord (kippendij, lamsrack),
+# langere overal (runderstoof, varkenshaas, zalmfilet).
+PROTEIN_TERMS: Dict[str, str] = {
+    "kip": "kip", "kalkoen": "kip", "eend": "eend",
+    "rund": "rund", "biefstuk": "rund", "gehakt": "gehakt", "burger": "gehakt",
+    "hamburger": "gehakt", "varken": "varken", "spek": "varken", "ham": "varken",
+    "worst": "worst", "lam": "lam",
+    "zalm": "vis", "kabeljauw": "vis", "tonijn": "vis", "vis": "vis",
+    "garnaal": "schaaldier", "garnalen": "schaaldier", "mossel": "schaaldier",
+    "tofu": "vega", "tempeh": "vega", "seitan": "vega", "vega": "vega",
+    "vegetarisch": "vega", "halloumi": "vega", "kikkererwt": "peulvrucht",
+    "linzen": "peulvrucht", "bonen": "peulvrucht", "eieren": "ei",
+}
+
+_PROTEIN_RE = re.compile("|".join(
+    (r"\b" + re.escape(term)) if len(term) <= 3 else re.escape(term)
+    for term in sorted(PROTEIN_TERMS, key=len, reverse=True)
+))
+
+# vulwoorden zeggen niets over het gerecht
+_STOPWORDS = frozenset({
+    "met", "en", "in", "op", "uit", "van", "de", "het", "een", "aan", "voor", "of",
+})
+
+
+# -------------------------------------------------
+# Sleutels
+# -------------------------------------------------
+def normalize_dish_name(name: str) -> str:
+    """"Crème-brûlée, voor 2!" → "creme brulee voor 2"."""
+    s = unicodedata.normalize("NFKD", str(name or ""))
+    s = "".join(c for c in s if not unicodedata.combining(c)).lower()
+    return _NON_ALNUM_RE.sub(" ", s).strip()
+
+
+def image_key(name: str) -> str:
+    return hashlib.sha256(normalize_dish_name(name).encode("utf-8")).hexdigest()[:32]
+
+
+def name_trigrams(name: str) -> FrozenSet[str]:
+    """Trigrammen per woord (met randspaties), zonder vulwoorden en getallen."""
+    grams: Set[str] = set()
+    for word in normalize_dish_name(name).split():
+        if word in _STOPWORDS or word.isdigit():
+            continue
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def protein_classes(name: str) -> FrozenSet[str]:
+    """"Romige pasta met kip en spinazie" → {"kip"}; leeg = geen herkende eiwitbron."""
+    return frozenset(PROTEIN_TERMS[m.group(0)] for m in _PROTEIN_RE.finditer(normalize_dish_name(name)))
+
+
+def variant_path(image_path: Optional[str], variant: str) -> Optional[str]:
+    """
+    Pad van een variant naast een origineel uit de store.
+    Valt terug op image_path zelf (oude of externe afbeelding).
+    """
+    if not image_path:
+        return image_path
+
+    spec = VARIANTS.get(variant)
+    if spec is not None:
+        candidate = Path(image_path).parent / spec[0]
+        if candidate.exists():
+            return str(candidate)
+
+    return image_path
+
+
+# -------------------------------------------------
+# Varianten maken
+# -------------------------------------------------
+def _make_variant(source: "PILImage.Image", width: int, ratio: Optional[float], fmt: str, quality: int) -> bytes:
+    img = source.convert("RGB")
+
+    if ratio is not None:
+        # midden bijsnijden naar de beeldverhouding van het PDF-kader
+        w, h = img.size
+        if w / h > ratio:
+            new_w = int(round(h * ratio))
+            left = (w - new_w) // 2
+            img = img.crop((left, 0, left + new_w, h))
+        else:
+            new_h = int(round(w / ratio))
+            top = (h - new_h) // 2
+            img = img.crop((0, top, w, top + new_h))
+
+    if img.width > width:
+        img = img.resize((width, int(round(img.height * width / img.width))), PILImage.LANCZOS)
+
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, quality=quality)
+    return buf.getvalue()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# -------------------------------------------------
+# Store
+# -------------------------------------------------
+class ImageStore:
+    """
+    get(naam, variant) → pad of None · put(naam, png_bytes) → pad origineel.
+    Thread-safe binnen het proces; het manifest wordt atomair geschreven.
+    """
+
+    def __init__(
+        self,
+        root: str = IMAGE_DIR,
+        max_bytes: int = int(STORE_MAX_MB * 1024 * 1024),
+        max_entries: int = STORE_MAX_ENTRIES,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, Dict[str, Any]]] = None
+        self._last_flush = 0.0
+
+        # trigram → sleutels (lazy opgebouwd uit het manifest)
+        self._index: Optional[Dict[str, Set[str]]] = None
+        self._grams: Dict[str, FrozenSet[str]] = {}
+        self._proteins: Dict[str, FrozenSet[str]] = {}
+
+        self.counts = {"exact": 0, "similar": 0, "miss": 0}
+
+        self._migrate_legacy()
+
+    # -----------------------------
+    # Manifest
+    # -----------------------------
+    def _entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._manifest is None:
+            try:
+                data = json.loads((self.root / MANIFEST).read_text(encoding="utf-8"))
+                self._manifest = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _flush(self) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            _write_atomic(
+                self.root / MANIFEST,
+                json.dumps(self._entries(), ensure_ascii=False, indent=1).encode("utf-8"),
+            )
+            self._last_flush = time.monotonic()
+        except OSError:
+            pass
+
+    def _dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    # -----------------------------
+    # Similarity-index
+    # -----------------------------
+    def _ensure_index(self) -> Dict[str, Set[str]]:
+        if self._index is None:
+            self._index = {}
+            self._grams = {}
+            self._proteins = {}
+            for key, entry in self._entries().items():
+                self._index_add(key, entry.get("name", ""))
+        return self._index
+
+    def _index_add(self, key: str, name: str) -> None:
+        if self._index is None:
+            return
+        grams = name_trigrams(name)
+        self._grams[key] = grams
+        self._proteins[key] = protein_classes(name)
+        for gram in grams:
+            self._index.setdefault(gram, set()).add(key)
+
+    def _index_remove(self, key: str) -> None:
+        if self._index is None:
+            return
+        self._proteins.pop(key, None)
+        for gram in self._grams.pop(key, ()):
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+    def find_similar(self, name: str, threshold: float = SIMILARITY_THRESHOLD) -> Optional[Tuple[str, float]]:
+        """
+        Beste bestaande gerecht met trigram-Jaccard ≥ threshold én
+        dezelfde eiwitbron(nen) (geen vleesfoto bij een vega-gerecht).
+        Geeft (sleutel, score) of None. Alleen kandidaten die minstens
+        één trigram delen worden bekeken (inverted index).
+        """
+        if threshold <= 0:
+            return None
+
+        query = name_trigrams(name)
+        if not query:
+            return None
+
+        proteins = protein_classes(name)
+
+        with self._lock:
+            index = self._ensure_index()
+
+            shared: Counter = Counter()
+            for gram in query:
+                shared.update(index.get(gram, ()))
+
+            best: Optional[Tuple[str, float]] = None
+            for key, overlap in shared.items():
+                if self._proteins[key] != proteins:
+                    continue
+                score = overlap / (len(query) + len(self._grams[key]) - overlap)
+                if score >= threshold and (best is None or score > best[1]):
+                    best = (key, score)
+
+        return best
+
+    # -----------------------------
+    # Lezen
+    # -----------------------------
+    def get(self, name: str, variant: str = "original") -> Optional[str]:
+        """Pad van de gevraagde variant (of het origineel als die ontbreekt)."""
+        if not name:
+            return None
+
+        key = image_key(name)
+        folder = self._dir(key)
+        original = folder / ORIGINAL
+
+        if not original.exists():
+            return None
+
+        with self._lock:
+            entry = self._entries().get(key)
+            if entry is not None:
+                entry["last_used"] = time.time()
+                if time.monotonic() - self._last_flush > _TOUCH_FLUSH_S:
+                    self._flush()
+
+        if variant == "original":
+            return str(original)
+        return variant_path(str(original), variant)
+
+    def lookup(
+        self,
+        name: str,
+        variant: str = "original",
+        threshold: float = SIMILARITY_THRESHOLD,
+    ) -> Optional[str]:
+        """
+        Zoals get(), maar valt terug op het meest gelijkende gerecht.
+        Telt exact / similar / miss mee voor stats()["hit_rate"].
+        """
+        path = self.get(name, variant)
+        if path:
+            self._count("exact")
+            return path
+
+        match = self.find_similar(name, threshold)
+        if match is not None:
+            key, _score = match
+            with self._lock:
+                entry = self._entries().get(key)
+                match_name = entry.get("name", "") if entry else ""
+            path = self.get(match_name, variant) if match_name else None
+            if path:
+                self._count("similar")
+                return path
+
+        self._count("miss")
+        return None
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self.counts[kind] += 1
+
+    def _migrate_legacy(self) -> int:
+        """
+        Oude platte PNG's (<gerechtnaam>.png in de basismap) → kopie in de
+        store, zodat ze meedoen in find_similar() en in eviction.
+        Het bronbestand wordt nooit aangeraakt.
+        """
+        try:
+            legacy = sorted(p for p in self.root.glob("*.png") if p.is_file())
+        except OSError:
+            return 0
+
+        if not legacy:
+            return 0
+
+        marker = self.root / LEGACY_MARKER
+        try:
+            done = set(json.loads(marker.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            done = set()
+
+        todo = [p for p in legacy if p.name not in done]
+        if not todo:
+            return 0
+
+        migrated = 0
+        for path in todo:
+            try:
+                if image_key(path.stem) not in self._entries():
+                    self.put(path.stem, path.read_bytes())
+                    migrated += 1
+                done.add(path.name)
+            except OSError:
+                continue
+
+        if done:
+            try:
+                _write_atomic(marker, json.dumps(sorted(done), ensure_ascii=False, indent=1).encode("utf-8"))
+            except OSError:
+                pass
+        return migrated
+
+    # -----------------------------
+    # Schrijven
+    # -----------------------------
+    def put(self, name: str, image_bytes: bytes) -> str:
+        """Slaat origineel + varianten op, werkt manifest bij, evict indien nodig."""
+        key = image_key(name)
+        folder = self._dir(key)
+        folder.mkdir(parents=True, exist_ok=True)
+
+        _write_atomic(folder / ORIGINAL, image_bytes)
+        sizes = {"original": len(image_bytes)}
+
+        if PILImage is not None:
+            try:
+                with PILImage.open(io.BytesIO(image_bytes)) as source:
+                    source.load()
+                    for variant, (filename, width, ratio, fmt, quality) in VARIANTS.items():
+                        data = _make_variant(source, width, ratio, fmt, quality)
+                        _write_atomic(folder / filename, data)
+                        sizes[variant] = len(data)
+            except (OSError, ValueError):
+                pass  # onleesbaar of formaat niet ondersteund → alleen origineel
+
+        with self._lock:
+            now = time.time()
+            self._entries()[key] = {
+                "name": normalize_dish_name(name),
+                "created": now,
+                "last_used": now,
+                "bytes": sum(sizes.values()),
+                "variants": sorted(sizes),
+            }
+            self._index_remove(key)
+            self._index_add(key, normalize_dish_name(name))
+            self._evict(keep=key)
+            self._flush()
+
+        return str(folder / ORIGINAL)
+
+    # -----------------------------
+    # Eviction
+    # -----------------------------
+    def _evict(self, keep: Optional[str] = None) -> int:
+        entries = self._entries()
+        total = sum(int(e.get("bytes", 0)) for e in entries.values())
+        removed = 0
+
+        for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0)):
+            over_size = self.max_bytes and total > self.max_bytes
+            over_count = len(entries) > self.max_entries
+            if not (over_size or over_count):
+                break
+            if key == keep:
+                continue
+
+            total -= int(entries[key].get("bytes", 0))
+            del entries[key]
+            self._index_remove(key)
+            shutil.rmtree(self._dir(key), ignore_errors=True)
+            removed += 1
+
+        return removed
+
+    def evict(self) -> int:
+        """Handmatig opruimen; geeft het aantal verwijderde gerechten terug."""
+        with self._lock:
+            removed = self._evict()
+            if removed:
+                self._flush()
+            return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._entries()
+            lookups = sum(self.counts.values())
+            hits = self.counts["exact"] + self.counts["similar"]
+            return {
+                "entries": len(entries),
+                "bytes": sum(int(e.get("bytes", 0)) for e in entries.values()),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                **self.counts,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_store: Optional[ImageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ImageStore()
+    return _store
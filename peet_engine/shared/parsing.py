@@ -1,6 +1,8 @@
 # peet_engine/shared/parsing.py
 
-from typing import Any, List
+import re
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional, Tuple
 
 
 def safe_int(value: Any, default: int = 0) -> int:
@@ -28,3 +30,134 @@ def normalize_str(value: Any) -> str:
     if value is None:
         return ""
     return str(value).strip().lower()
+
+
+# -------------------------------------------------
+# Ingrediënten: "200 g" + "kipfilet" → gestructureerd record
+# -------------------------------------------------
+class Ingredient(NamedTuple):
+    """
+    Compact record per ingrediënt.
+    qty_low/qty_high: bereik ("2-3" → 2.0, 3.0), None als er geen getal is
+    amount: weergavetekst ("200 g", "2-3 stuks", of de ruwe tekst zoals "snufje")
+    """
+    qty_low: Optional[float]
+    qty_high: Optional[float]
+    unit: str
+    item: str
+    note: str
+    amount: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.item} ({self.note})" if self.note else self.item
+
+
+UNIT_WORDS = (
+    "g", "gr", "gram", "kg", "kilo",
+    "ml", "cl", "dl", "l", "liter",
+    "el", "eetlepel", "eetlepels", "tl", "theelepel", "theelepels",
+    "stuk", "stuks", "st", "teen", "teentje", "teentjes", "tenen",
+    "blik", "blikken", "blikje", "blikjes", "bos", "bosje", "bosjes",
+    "zak", "zakje", "zakjes", "cm",
+)
+
+_NUM = r"\d+(?:[.,]\d+)?(?:\s*/\s*\d+)?|[½¼¾]"
+
+# langste eenheid eerst, en nooit midden in een woord ("2 grote" ≠ 2 g)
+_AMOUNT_RE = re.compile(
+    rf"^\s*(?P<low>{_NUM})(?:\s*[-–]\s*(?P<high>{_NUM}))?\s*"
+    rf"(?:(?P<unit>{'|'.join(sorted(UNIT_WORDS, key=len, reverse=True))})\.?(?![\w]))?"
+    r"\s*(?P<rest>.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_GLYPHS = {"½": 0.5, "¼": 0.25, "¾": 0.75}
+
+# woorden na een kaal getal die het nog steeds "stuks" laten ("2 grote");
+# elk ander woord ("1 snufje", "1 handje") maakt de hoeveelheid tekst
+SIZE_WORDS = frozenset(("grote", "kleine", "middelgrote", "flinke", "rijpe"))
+
+
+def _number(raw: str) -> Optional[float]:
+    raw = raw.replace(" ", "").replace(",", ".")
+    if raw in _GLYPHS:
+        return _GLYPHS[raw]
+    try:
+        if "/" in raw:
+            num, den = raw.split("/", 1)
+            return float(num) / float(den)
+        return float(raw)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _split_amount(amount: str) -> Optional[Tuple[Optional[float], Optional[float], str, str, str]]:
+    """
+    "2-3 teentjes, geperst" → (2.0, 3.0, "teentjes", "2-3 teentjes", "geperst").
+    Gememoiseerd: LLM-hoeveelheden herhalen zich sterk ("1 el", "200 g").
+    """
+    m = _AMOUNT_RE.match(amount)
+    if not m:
+        return None
+
+    low_raw, high_raw = m.group("low"), m.group("high")
+    low = _number(low_raw)
+    high = _number(high_raw) if high_raw else low
+    unit = (m.group("unit") or "").lower()
+
+    num = f"{low_raw}-{high_raw}" if high_raw else low_raw
+    text = f"{num} {unit}" if unit else num
+
+    return low, high, unit, text, m.group("rest")
+
+
+def parse_ingredient(raw: Any) -> Optional[Ingredient]:
+    """
+    Eén ingrediënt → Ingredient, of None zonder item.
+    raw:
+      - dict {"amount", "item", "note"?} (LLM-contract)
+      - of string "200 g kipfilet"
+    Tekst na de hoeveelheid ("2 grote", "1 el, afgestreken") gaat naar note.
+    """
+    if isinstance(raw, dict):
+        item = str(raw.get("item") or "").strip()
+        if not item:
+            return None
+
+        amount = str(raw.get("amount") or "").strip()
+        note = str(raw.get("note") or "").strip()
+
+        parts = _split_amount(amount) if amount else None
+        if parts is None:
+            return Ingredient(None, None, "", item, note, amount)
+
+        low, high, unit, text, rest = parts
+        rest = rest.strip(" ,()")
+        if rest and not unit and rest.split(None, 1)[0].lower() not in SIZE_WORDS:
+            return Ingredient(None, None, "", item, note, amount)
+        if rest:
+            note = f"{note}, {rest}".strip(", ") if note else rest
+
+        return Ingredient(low, high, unit, item, note, text)
+
+    if isinstance(raw, str):
+        parts = _split_amount(raw.strip())
+        if parts is None:
+            item = raw.strip()
+            return Ingredient(None, None, "", item, "", "") if item else None
+
+        low, high, unit, text, rest = parts
+        item = rest.strip()
+        return Ingredient(low, high, unit, item, "", text) if item else None
+
+    return None
+
+
+def parse_ingredients(raw_list: Any) -> List[Ingredient]:
+    """Batch: lijst van dicts/strings → Ingredients (lege items vallen weg)."""
+    if not isinstance(raw_list, list):
+        return []
+    parse = parse_ingredient
+    return [ing for ing in map(parse, raw_list) if ing is not None]
@@ -0,0 +1,278 @@
+# peet_engine/shopping.py
+
+"""
+Boodschappenlijst — deterministisch, lokaal.
+Voegt de ingrediënten ({amount, item}) van alle dagen samen:
+- hoeveelheid + eenheid parsen
+- eenheden normaliseren (g/kg, ml/l, el/tl, stuks)
+- gelijke items over dagen optellen
+- winkelzone toekennen (ZONES_ORDER)
+"""
+
+import re
+from fractions import Fraction
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from peet_engine.shared.parsing import Ingredient, parse_ingredient, parse_ingredients
+
+
+# Winkelvolgorde (ook gebruikt door de Vooruit-PDF)
+ZONES_ORDER = [
+    "AGF",
+    "Brood & ontbijt",
+    "Zuivel & eieren",
+    "Vlees/vis/vega",
+    "Houdbaar",
+    "Kruiden & oliën",
+    "Koeling/diepvries",
+    "Overig",
+]
+
+# Langste match over alle zones wint ("bloemkool" → AGF, niet "bloem" → Houdbaar);
+# bij gelijke lengte de eerste zone in deze lijst.
+ZONE_KEYWORDS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("Koeling/diepvries", (
+        "diepvries", "bevroren", "doperwten", "spinazie à la crème",
+    )),
+    ("Houdbaar", (
+        "kokosmelk", "pasta", "spaghetti", "penne", "rijst", "couscous",
+        "bulgur", "linzen", "kikkererwten", "bonen in", "tomatenblok",
+        "passata", "tomatenpuree", "bouillon", "blik", "bloem", "noedels",
+        "mie", "gnocchi", "suiker", "honing", "pinda", "noten", "kidneybonen",
+    )),
+    ("Kruiden & oliën", (
+        "olie", "zout", "peper", "mosterd", "kerrie", "curry", "komijn",
+        "paprikapoeder", "kaneel", "oregano", "tijm", "rozemarijn",
+        "laurier", "nootmuskaat", "azijn", "sojasaus", "ketjap", "saus",
+        "sambal", "gember", "kurkuma", "chilivlokken",
+    )),
+    ("Vlees/vis/vega", (
+        "kip", "gehakt", "rund", "varken", "worst", "spek", "ham",
+        "lam", "biefstuk", "schnitzel", "vis", "zalm", "kabeljauw",
+        "tonijn", "garnalen", "mosselen", "tofu", "tempeh", "vegaburger",
+    )),
+    ("Zuivel & eieren", (
+        "melk", "room", "kaas", "yoghurt", "kwark", "boter", "crème fraîche",
+        "ei", "eieren", "mozzarella", "parmezaan", "feta",
+    )),
+    ("Brood & ontbijt", (
+        "brood", "stokbrood", "wrap", "tortilla", "pita", "broodje",
+        "havermout", "muesli",
+    )),
+    ("AGF", (
+        "ui", "sjalot", "knoflook", "prei", "paprika", "tomaat", "tomaten",
+        "wortel", "courgette", "aubergine", "spinazie", "sla", "citroen",
+        "limoen", "boon", "broccoli", "bloemkool", "venkel", "appel",
+        "peer", "krieltjes", "aardappel", "peterselie", "dille", "basilicum",
+        "koriander", "bieslook", "boerenkool", "champignon", "paddenstoel",
+        "selderij", "komkommer", "witloof", "spruitjes", "pompoen",
+        "zoete aardappel", "avocado", "rucola", "andijvie", "lente-ui",
+        "uien", "sperziebonen", "snijbonen", "suikerschoten",
+    )),
+]
+
+# alias → (basiseenheid, factor)
+UNITS: Dict[str, Tuple[str, Fraction]] = {
+    "g": ("g", Fraction(1)),
+    "gr": ("g", Fraction(1)),
+    "gram": ("g", Fraction(1)),
+    "kg": ("g", Fraction(1000)),
+    "kilo": ("g", Fraction(1000)),
+    "ml": ("ml", Fraction(1)),
+    "cl": ("ml", Fraction(10)),
+    "dl": ("ml", Fraction(100)),
+    "l": ("ml", Fraction(1000)),
+    "liter": ("ml", Fraction(1000)),
+    "tl": ("tl", Fraction(1)),
+    "theelepel": ("tl", Fraction(1)),
+    "theelepels": ("tl", Fraction(1)),
+    "el": ("tl", Fraction(3)),
+    "eetlepel": ("tl", Fraction(3)),
+    "eetlepels": ("tl", Fraction(3)),
+    "stuk": ("stuks", Fraction(1)),
+    "stuks": ("stuks", Fraction(1)),
+    "st": ("stuks", Fraction(1)),
+    "teen": ("teen", Fraction(1)),
+    "teentje": ("teen", Fraction(1)),
+    "teentjes": ("teen", Fraction(1)),
+    "tenen": ("teen", Fraction(1)),
+    "blik": ("blik", Fraction(1)),
+    "blikken": ("blik", Fraction(1)),
+    "blikje": ("blik", Fraction(1)),
+    "blikjes": ("blik", Fraction(1)),
+    "bos": ("bos", Fraction(1)),
+    "bosje": ("bos", Fraction(1)),
+    "bosjes": ("bos", Fraction(1)),
+    "zak": ("zak", Fraction(1)),
+    "zakje": ("zak", Fraction(1)),
+    "zakjes": ("zak", Fraction(1)),
+}
+
+
+# meervoud → enkelvoud, zodat "1 ui" en "2 uien" samen optellen
+PLURALS: Dict[str, str] = {
+    "uien": "ui",
+    "sjalotten": "sjalot",
+    "tomaten": "tomaat",
+    "aardappelen": "aardappel",
+    "aardappels": "aardappel",
+    "wortels": "wortel",
+    "wortelen": "wortel",
+    "paprika's": "paprika",
+    "courgettes": "courgette",
+    "aubergines": "aubergine",
+    "citroenen": "citroen",
+    "limoenen": "limoen",
+    "champignons": "champignon",
+    "eieren": "ei",
+}
+
+
+def _zone_pattern(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    # korte termen ("ui", "ei", "sla") alleen aan het begin of eind van een
+    # woord (uien, ijsbergsla), langere overal (olijfolie, geitenkaas)
+    parts = [
+        (rf"\b{re.escape(kw)}|{re.escape(kw)}\b") if len(kw) <= 3 else re.escape(kw)
+        for kw in sorted(keywords, key=len, reverse=True)
+    ]
+    return re.compile("|".join(parts))
+
+
+_ZONE_PATTERNS = [(zone, _zone_pattern(kws)) for zone, kws in ZONE_KEYWORDS]
+
+_NOTE_RE = re.compile(r"\s*\(.*?\)\s*")
+_SPACE_RE = re.compile(r"\s+")
+
+
+# -------------------------------------------------
+# Parsing
+# -------------------------------------------------
+def _quantity(ing: Ingredient) -> Optional[Tuple[Fraction, str]]:
+    """
+    Hoeveelheid in basiseenheid.
+    Bereik ("2-3 stuks") → bovengrens (liever iets over).
+    Geen getal of niet-optelbare eenheid (cm) → None.
+    """
+    if ing.qty_high is None:
+        return None
+
+    qty = Fraction(ing.qty_high).limit_denominator(1000)
+
+    if not ing.unit:
+        return qty, "stuks"
+
+    if ing.unit not in UNITS:
+        return None
+
+    base, factor = UNITS[ing.unit]
+    return qty * factor, base
+
+
+def parse_amount(amount: Any) -> Optional[Tuple[Fraction, str]]:
+    """"1,5 kg" → (1500, "g") · "2 el" → (6, "tl") · "3" → (3, "stuks")."""
+    ing = parse_ingredient({"amount": amount, "item": "-"})
+    return _quantity(ing) if ing is not None else None
+
+
+def normalize_item(item: Any) -> str:
+    """Sleutel om items over dagen te matchen: zonder notities, lowercase, enkelvoud."""
+    s = str(item or "").lower()
+    s = _NOTE_RE.sub(" ", s)
+    s = s.split(",", 1)[0]
+    words = _SPACE_RE.sub(" ", s).strip().split(" ")
+    words[-1] = PLURALS.get(words[-1], words[-1])
+    return " ".join(words)
+
+
+def zone_for(item: str) -> str:
+    """Zone met de langste keyword-match; gelijke lengte → eerste zone."""
+    words = normalize_item(item)
+
+    best_zone, best_len = "Overig", 0
+    for zone, pattern in _ZONE_PATTERNS:
+        for m in pattern.finditer(words):
+            if len(m.group(0)) > best_len:
+                best_zone, best_len = zone, len(m.group(0))
+
+    return best_zone
+
+
+# -------------------------------------------------
+# Formatteren
+# -------------------------------------------------
+def _fmt_number(q: Fraction) -> str:
+    if q.denominator == 1:
+        return str(q.numerator)
+    if q in (Fraction(1, 2), Fraction(1, 4), Fraction(3, 4)):
+        return f"{q.numerator}/{q.denominator}"
+    return f"{float(q):.2f}".rstrip("0").rstrip(".").replace(".", ",")
+
+
+def format_quantity(qty: Fraction, unit: str) -> str:
+    if unit == "g" and qty >= 1000:
+        return f"{_fmt_number(qty / 1000)} kg"
+    if unit == "ml" and qty >= 1000:
+        return f"{_fmt_number(qty / 1000)} l"
+    if unit == "tl" and qty >= 3 and (qty % 3) == 0:
+        return f"{_fmt_number(qty / 3)} el"
+    if unit == "teen":
+        return f"{_fmt_number(qty)} {'teen' if qty <= 1 else 'tenen'}"
+    if unit == "blik":
+        return f"{_fmt_number(qty)} {'blik' if qty <= 1 else 'blikken'}"
+    return f"{_fmt_number(qty)} {unit}"
+
+
+# -------------------------------------------------
+# Aggregatie
+# -------------------------------------------------
+def build_shopping_list(days: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-dag ingrediënten → één boodschappenlijst.
+    Uitvoer: [{"zone", "item", "amount"}], gesorteerd op ZONES_ORDER,
+    binnen een zone in volgorde van eerste voorkomen.
+    Niet-optelbare hoeveelheden ("snufje") blijven als tekst staan.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+
+    for day in days:
+        if not isinstance(day, dict):
+            continue
+
+        for ing in parse_ingredients(day.get("ingredients", [])):
+            item = ing.item
+            key = normalize_item(item)
+            if not key:
+                continue
+
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {
+                    "item": _NOTE_RE.sub(" ", item).split(",", 1)[0].strip(),
+                    "totals": {},
+                    "other": [],
+                }
+
+            parsed = _quantity(ing)
+
+            if parsed is not None:
+                qty, unit = parsed
+                entry["totals"][unit] = entry["totals"].get(unit, 0) + qty
+            elif ing.amount and ing.amount.lower() not in entry["other"]:
+                entry["other"].append(ing.amount.lower())
+
+    rank = {z: i for i, z in enumerate(ZONES_ORDER)}
+    out: List[Dict[str, Any]] = []
+
+    for entry in merged.values():
+        parts = [format_quantity(q, u) for u, q in entry["totals"].items()]
+        parts.extend(entry["other"])
+
+        out.append({
+            "zone": zone_for(entry["item"]),
+            "item": entry["item"],
+            "amount": " + ".join(parts),
+        })
+
+    # sorted is stabiel → volgorde van eerste voorkomen blijft binnen een zone
+    out.sort(key=lambda it: rank[it["zone"]])
+    return out
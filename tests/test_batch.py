@@ -0,0 +1,59 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine.batch import main, run_batch
+from peet_engine.run import call_peet_engine
+
+
+LINES = [
+    json.dumps({"days": "1", "persons": "3", "allergies": "kip"}),
+    "",
+    "geen json",
+    json.dumps({"persons": "2", "nogo": "zalm, pasta", "language": "en"}),
+    json.dumps(["geen", "object"]),
+    json.dumps({"days": "3", "persons": "4"}),
+]
+
+
+def _expected():
+    out = []
+    for line in LINES:
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except Exception:
+            out.append({"error": "Ongeldige JSON input voor Peet Engine"})
+            continue
+        if not isinstance(raw, dict):
+            out.append({"error": "Context moet een JSON object zijn"})
+            continue
+        out.append(call_peet_engine(raw))
+    return out
+
+
+def test_run_batch_in_process_keeps_order():
+    out = io.StringIO()
+
+    count = run_batch(LINES, out, workers=1, chunk_size=2)
+
+    rows = [json.loads(r) for r in out.getvalue().splitlines()]
+    assert count == 5
+    assert rows == _expected()
+
+
+def test_cli_process_pool_matches_in_process(tmp_path, capsys):
+    src = tmp_path / "contexts.jsonl"
+    src.write_text("\n".join(LINES * 20) + "\n", encoding="utf-8")
+    dst = tmp_path / "plans.jsonl"
+
+    assert main([str(src), "-o", str(dst), "--workers", "2", "--chunk-size", "7"]) == 0
+
+    rows = [json.loads(r) for r in dst.read_text(encoding="utf-8").splitlines()]
+    assert rows == _expected() * 20
+    assert "plannen/s" in capsys.readouterr().err
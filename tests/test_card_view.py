@@ -0,0 +1,48 @@
+import json
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from apps.peet_card import app as card
+
+
+RAW = json.dumps({
+    "dish_name": "Kip met rijst",
+    "cook_time": {"min": 20, "max": 25},
+    "ingredients": [{"amount": "200 g", "item": "kip"}],
+    "steps": ["Kook de rijst.", "Bak de kip."],
+    "nutrition": {"calories_kcal": "900", "protein_g": 60, "fat_g": 20, "carbs_g": 100},
+})
+
+
+def test_card_view_derives_everything_with_one_plan_call(monkeypatch):
+    calls = []
+    real_plan = card.plan
+    monkeypatch.setattr(card, "plan", lambda ctx: calls.append(ctx) or real_plan(ctx))
+
+    view = card.build_card_view(RAW, 2, [], ["vis"])
+
+    assert len(calls) == 1 and calls[0]["nogo"] == ["vis"]
+    assert view.dish_name == "Kip met rijst"
+    assert view.days[0]["dish_name"] == "Kip met rijst"
+    assert (view.calories_kcal, view.kcal_per_person) == (900, 450)
+    assert (view.protein_g, view.fat_g, view.carbs_g) == (30.0, 10.0, 50.0)
+    assert view.protein_pct + view.fat_pct + view.carbs_pct == 100
+
+
+def test_card_view_memoizes_pdf_input_per_image():
+    view = card.build_card_view(RAW, 2, [], [])
+
+    pdf_input, key = view.pdf(None)
+    assert view.pdf(None) == (pdf_input, key)
+    assert view.pdf(None)[0] is pdf_input
+    assert pdf_input["protein_pct"] == view.protein_pct
+
+
+def test_card_view_without_dish_name_skips_plan(monkeypatch):
+    monkeypatch.setattr(card, "plan", lambda ctx: (_ for _ in ()).throw(AssertionError("plan")))
+
+    view = card.build_card_view("geen json", 2, [], [])
+    assert view.dish_name == "" and view.days == []
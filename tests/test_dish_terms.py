@@ -0,0 +1,50 @@
+import json
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from apps.peet_kiest_vooruit.dish_terms import DishQueryBuilder, TermMatcher, simplify_dish_name
+
+
+def test_simplify_dish_name_matches_dictionary_priority():
+    assert simplify_dish_name("Stamppot boerenkool met rookworst en jus") == (
+        "kale gravy sausage plated restaurant meal close up"
+    )
+    assert simplify_dish_name("Stamppot boerenkool met rookworst en jus", vegetarian=True) == (
+        "kale vegetarian gravy vegetarian sausage plated restaurant meal close up"
+    )
+    assert simplify_dish_name("Shakshuka") == "shakshuka plated restaurant meal close up"
+
+
+def test_simplify_dish_name_keeps_old_slots_and_drops_duplicates_after():
+    # zelfde 2 secundaire slots als de oude dict-scan; pas daarna dedup
+    assert simplify_dish_name("preifrieten") == "fries plated restaurant meal close up"
+    assert simplify_dish_name("runderworst mosselen champignon") == (
+        "mussels sausage plated restaurant meal close up"
+    )
+    assert simplify_dish_name("prei met friet") == "fries leek plated restaurant meal close up"
+
+
+def test_matcher_finds_overlapping_and_nested_terms():
+    matcher = TermMatcher({"g": {"worst": "sausage", "runderworst": "beef sausage", "rund": "beef", "der": "x"}})
+
+    # alle vier komen voor in "runderworst", in volgorde van de data
+    assert matcher.find("runderworst") == {"g": ["sausage", "beef sausage", "beef", "x"]}
+    assert matcher.find("kip") == {}
+
+
+def test_builder_loads_larger_dictionary_from_file(tmp_path):
+    terms = {
+        "primary": {f"gerecht{i:04d}": f"dish {i}" for i in range(2000)},
+        "secondary": {f"saus{i:04d}": f"side {i}" for i in range(2000)},
+        "vegetarian": {"saus0007": "veggie side"},
+    }
+    path = tmp_path / "terms.json"
+    path.write_text(json.dumps(terms), encoding="utf-8")
+
+    builder = DishQueryBuilder.from_file(str(path))
+
+    assert builder.query("Gerecht1999 met saus0007") == "dish 1999 side 7 plated restaurant meal close up"
+    assert builder.query("gerecht0012 met saus0007", vegetarian=True).startswith("dish 12 veggie side")
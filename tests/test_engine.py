@@ -0,0 +1,216 @@
+import sys
+import random
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine.engine import (
+    CATALOG,
+    DISHES,
+    PROFILE_RANK,
+    Dish,
+    DishCatalog,
+    _fallback_pick,
+    _hits_allergy,
+    _pick_dish,
+    plan,
+    plan_cache_clear,
+    plan_cache_info,
+    plan_many,
+)
+from peet_engine import engine
+
+
+ALLERGY_SETS = [[], ["kip"], ["pasta", "zalm"], ["citroen"], ["oven", "soep", "vis"]]
+
+
+def _linear_pick(profile, kitchen, vegetarian, allergies, language, used_names, seed):
+    candidates = [
+        d for d in DISHES
+        if d.profile == profile
+        and (kitchen == "vrij" or d.kitchen == kitchen)
+        and not (vegetarian and not d.veg)
+        and not _hits_allergy(d, allergies)
+        and (d.name_en if language == "en" else d.name_nl) not in used_names
+    ]
+    if not candidates:
+        return None
+    candidates.sort(key=lambda d: d.name_en if language == "en" else d.name_nl)
+    return candidates[seed % len(candidates)]
+
+
+def test_catalog_pick_matches_linear_scan():
+    used = {"Bolognese met salade", "Lemon couscous with herbs and vegetables"}
+
+    for profile in PROFILE_RANK:
+        for vegetarian in (False, True):
+            for allergies in ALLERGY_SETS:
+                for language in ("nl", "en"):
+                    for seed in range(6):
+                        expected = _linear_pick(
+                            profile, "vrij", vegetarian, allergies, language, used, seed
+                        )
+                        got = _pick_dish(
+                            profile=profile,
+                            kitchen="vrij",
+                            vegetarian=vegetarian,
+                            allergies=allergies,
+                            language=language,
+                            used_names=used,
+                            moment="doordeweeks",
+                            time="normaal",
+                            ambition=2,
+                            variation_seed=seed,
+                        )
+                        assert got == expected
+
+
+def test_catalog_indexes_by_kitchen():
+    dishes = [
+        Dish("Stamppot", "Mash", "licht", True, kitchen="nl_be"),
+        Dish("Minestrone", "Minestrone", "licht", True, kitchen="italiaans"),
+        Dish("Andijvie", "Endive", "licht", True, kitchen="nl_be"),
+    ]
+    catalog = DishCatalog(dishes)
+
+    nl_be = catalog.candidates("licht", "nl_be", False, "nl")
+    assert [catalog.names["nl"][i] for i in nl_be] == ["Andijvie", "Stamppot"]
+
+    vrij = catalog.candidates("licht", "vrij", False, "en")
+    assert [catalog.names["en"][i] for i in vrij] == ["Endive", "Mash", "Minestrone"]
+
+    assert catalog.candidates("licht", "frans", False, "nl") == ()
+
+
+def test_fallback_prefers_nearest_profile():
+    used = {d.name_nl for d in DISHES if d.profile == "afronding"}
+
+    dish = _fallback_pick(
+        profile="afronding",
+        kitchen="vrij",
+        vegetarian=True,
+        allergies=[],
+        language="nl",
+        used_names=used,
+    )
+
+    assert dish.profile == "vol"
+    assert dish.veg is True
+
+
+def test_plan_multi_day_uses_emergency_dish_without_kitchen_match():
+    result = plan({"mode": "vooruit", "days": 3})
+
+    assert result["days_count"] == 3
+    assert [d["kitchen"] for d in result["days"]] == ["nl_be", "italiaans", "aziatisch"]
+    assert all(d["dish_name"] for d in result["days"])
+
+
+def test_catalog_is_built_once():
+    assert len(CATALOG.dishes) == len(DISHES)
+
+
+def test_exclusion_mask_matches_substring_scan():
+    for allergies in ALLERGY_SETS + [["ijs"], ["n"], ["salmon", "rund"]]:
+        mask = CATALOG.exclusion_mask(allergies)
+        for i, dish in enumerate(CATALOG.dishes):
+            assert bool(mask >> i & 1) == _hits_allergy(dish, allergies)
+
+
+def test_exclusion_mask_is_cached_per_restriction_set():
+    catalog = DishCatalog(DISHES)
+
+    first = catalog.exclusion_mask(["Kip", "pasta"], ["zalm"])
+    again = catalog.exclusion_mask(["pasta", "kip"], ["zalm "])
+
+    assert first == again
+    assert len(catalog._exclusions) == 1
+
+
+def test_plan_enforces_nogo():
+    base = plan({"variation_seed": 0})
+    chosen = base["days"][0]["dish_name"]
+
+    result = plan({"variation_seed": 0, "nogo": [chosen.split()[0]]})
+
+    assert result["days"][0]["dish_name"] != chosen
+
+
+def _random_contexts(n, seed=3):
+    rng = random.Random(seed)
+    terms = ["kip", "pasta", "zalm", "citroen", "oven", "rund", "tofu", "groenten"]
+    return [
+        {
+            "mode": rng.choice(["vandaag", "vooruit"]),
+            "days": rng.choice([1, 2, 3, 5]),
+            "persons": rng.randint(0, 10),
+            "vegetarian": rng.random() < 0.3,
+            "allergies": rng.sample(terms, rng.randint(0, 2)),
+            "nogo": rng.sample(terms, rng.randint(0, 2)),
+            "moment": rng.choice(["doordeweeks", "weekend"]),
+            "time": rng.choice(["snel", "normaal"]),
+            "ambition": rng.randint(1, 4),
+            "language": rng.choice(["nl", "en"]),
+            "variation_seed": rng.randint(-3, 500),
+        }
+        for _ in range(n)
+    ]
+
+
+def test_plan_many_matches_plan():
+    contexts = _random_contexts(2000)
+
+    assert list(plan_many(contexts)) == [plan(c) for c in contexts]
+
+
+def test_plan_many_matches_plan_with_kitchen_catalog(monkeypatch):
+    kitchens = ["nl_be", "italiaans", "aziatisch", "mediterraan", "frans"]
+    dishes = [
+        Dish(f"{d.name_nl} {k}", f"{d.name_en} {k}", d.profile, d.veg, d.tags, kitchen=k)
+        for d in DISHES
+        for k in kitchens
+    ]
+    # dubbele naam binnen één keuken: beide vallen af zodra gebruikt
+    dishes.append(Dish("Bolognese met salade nl_be", "Bolognese", "licht", False, kitchen="nl_be"))
+    monkeypatch.setattr(engine, "CATALOG", DishCatalog(dishes))
+    plan_cache_clear()
+
+    contexts = _random_contexts(2000, seed=11)
+
+    assert list(plan_many(contexts)) == [plan(c) for c in contexts]
+    plan_cache_clear()
+
+
+def test_plan_many_streams_independent_results():
+    results = plan_many([{"variation_seed": 1}, {"variation_seed": 1}])
+
+    first = next(results)
+    first["days"][0]["dish_name"] = "aangepast"
+
+    assert next(results)["days"][0]["dish_name"] != "aangepast"
+
+
+def test_plan_cache_shares_entry_for_equivalent_inputs():
+    plan_cache_clear()
+
+    first = plan({"allergies": ["Kip", "zalm"], "language": "EN", "moment": "Weekend"})
+    second = plan({"moment": "weekend", "language": "en", "allergies": ["zalm", " kip "]})
+
+    assert first == second
+    assert plan_cache_info()["hits"] == 1
+    assert plan_cache_info()["misses"] == 1
+
+
+def test_plan_cache_returns_copies():
+    plan_cache_clear()
+
+    first = plan({"variation_seed": 4})
+    first["days"][0].update({"dish_name": "aangepast", "steps": ["x"]})
+    first["days"].append({})
+
+    second = plan({"variation_seed": 4})
+
+    assert second["days"][0]["dish_name"] != "aangepast"
+    assert "steps" not in second["days"][0]
+    assert len(second["days"]) == 1
@@ -0,0 +1,36 @@
+import sys
+import threading
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core import image_generator
+from core.image_generator import ImageService
+
+
+def test_image_service_deduplicates_inflight_requests(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_generate(dish_name):
+        calls.append(dish_name)
+        release.wait(5)
+        return f"/tmp/{dish_name}.png"
+
+    monkeypatch.setattr(image_generator, "generate_food_image", fake_generate)
+
+    service = ImageService(workers=2)
+    first = service.submit("Kip  Tikka")
+    second = service.submit("kip tikka")
+    other = service.submit("Zalm")
+
+    assert first is second and first is not other
+    assert not first.done()
+
+    release.set()
+    assert first.result(timeout=5) == "/tmp/Kip  Tikka.png"
+    other.result(timeout=5)
+
+    assert sorted(calls) == ["Kip  Tikka", "Zalm"]
+    assert service.pending() == 0
@@ -0,0 +1,114 @@
+import io
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image
+
+from peet_engine.shared.image_store import ImageStore, image_key, variant_path
+
+
+def _png(color="orange", size=(1024, 1024)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_key_ignores_case_punctuation_and_accents():
+    assert image_key("Crème-brûlée, voor 2!") == image_key("creme brulee voor 2")
+    assert image_key("Kip tikka") != image_key("Kip korma")
+    assert len(image_key("x" * 500)) == 32
+
+
+def test_put_creates_sized_variants(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    original = store.put("Kip tikka", _png())
+
+    assert store.get("kip-tikka!") == original
+
+    with Image.open(store.get("Kip tikka", "pdf")) as pdf:
+        assert pdf.format == "JPEG"
+        assert pdf.size == (945, 630)  # 12×8 cm @ 200 dpi
+
+    with Image.open(variant_path(original, "screen")) as screen:
+        assert screen.format == "WEBP"
+        assert screen.width == 768
+
+    assert (tmp_path / "manifest.json").exists()
+
+
+def test_lru_eviction_by_count(tmp_path):
+    store = ImageStore(root=str(tmp_path), max_entries=2)
+
+    store.put("a", _png("red", (64, 64)))
+    store.put("b", _png("green", (64, 64)))
+    store._entries()[image_key("a")]["last_used"] += 10  # a recent gebruikt
+    store.put("c", _png("blue", (64, 64)))
+
+    assert store.get("a") and store.get("c")
+    assert store.get("b") is None
+    assert store.stats()["entries"] == 2
+
+
+def test_legacy_flat_file_is_adopted(tmp_path):
+    (tmp_path / "Zalm met dille.png").write_bytes(_png("pink", (64, 64)))
+
+    store = ImageStore(root=str(tmp_path))
+    path = store.get("Zalm met dille", "pdf")
+
+    assert path and path.endswith("pdf.jpg")
+
+
+def test_legacy_files_survive_and_are_copied_once(tmp_path):
+    legacy = tmp_path / "Zalm met dille.png"
+    legacy.write_bytes(_png("pink", (64, 64)))
+    before = legacy.read_bytes()
+
+    store = ImageStore(root=str(tmp_path))
+    assert legacy.read_bytes() == before
+
+    # ge-evict → bij een nieuwe store niet opnieuw gekopieerd
+    store.max_entries = 1
+    store.put("Linzensoep", _png("green", (64, 64)))
+    assert store.get("Zalm met dille") is None
+
+    assert ImageStore(root=str(tmp_path)).get("Zalm met dille") is None
+    assert legacy.read_bytes() == before
+
+
+def test_legacy_flat_file_is_similar_candidate_and_evictable(tmp_path):
+    (tmp_path / "Kip tikka masala met rijst.png").write_bytes(_png("red", (64, 64)))
+    (tmp_path / "Zalm met dille.png").write_bytes(_png("pink", (64, 64)))
+
+    store = ImageStore(root=str(tmp_path), max_entries=2)
+    assert store.lookup("Kip tikka masala met basmatirijst")
+
+    store.put("Linzensoep", _png("green", (64, 64)))
+    assert store.stats()["entries"] == 2
+
+
+def test_lookup_never_swaps_protein(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    store.put("Romige pasta met kip en spinazie", _png("red", (64, 64)))
+    store.put("Zalm uit de oven met groenten", _png("pink", (64, 64)))
+
+    assert store.lookup("Romige pasta met tofu en spinazie") is None
+    assert store.lookup("Kip uit de oven met groenten") is None
+    assert store.lookup("Romige pasta met kip en verse spinazie")
+
+
+def test_lookup_reuses_near_duplicate_name(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    original = store.put("Kip tikka masala met rijst", _png("red", (64, 64)))
+    store.put("Zalm met dille", _png("pink", (64, 64)))
+
+    assert store.lookup("Kip tikka masala met basmatirijst") == original
+    assert store.lookup("Kip korma met rijst") is None
+    assert store.lookup("Kip tikka masala met basmatirijst", threshold=0) is None
+    assert store.lookup("kip tikka masala, met rijst") == original
+
+    stats = store.stats()
+    assert (stats["exact"], stats["similar"], stats["miss"]) == (1, 1, 2)
+    assert stats["hit_rate"] == 0.5
@@ -0,0 +1,54 @@
+import sys
+import json
+import random
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.json_utils import IncrementalJSONParser, extract_json
+
+
+DOC = {
+    "dish_name": "Pasta met \"pesto\", {spinazie}",
+    "cook_time": {"min": 20, "max": 25},
+    "ingredients": [
+        {"amount": "200 g", "item": "pasta"},
+        {"amount": "1 el", "item": "pesto [vers]"},
+    ],
+    "steps": ["Kook de pasta.", "Meng, en serveer."],
+    "nutrition": {"calories_kcal": 540, "macro_ratio": {"protein_pct": 15}},
+}
+
+
+def test_incremental_parser_matches_full_parse_for_any_chunking():
+    text = "```json\n" + json.dumps(DOC, ensure_ascii=False) + "\n```"
+    rng = random.Random(7)
+
+    for _ in range(50):
+        parser = IncrementalJSONParser()
+        items = {"ingredients": [], "steps": []}
+
+        pos = 0
+        while pos < len(text):
+            step = rng.randint(1, 12)
+            for kind, key, value in parser.feed(text[pos:pos + step]):
+                if kind == "item":
+                    items[key].append(value)
+            pos += step
+
+        assert parser.done
+        assert parser.fields == DOC
+        assert items["ingredients"] == DOC["ingredients"]
+        assert items["steps"] == DOC["steps"]
+        assert extract_json(parser.text) == DOC
+
+
+def test_incremental_parser_releases_items_before_array_closes():
+    parser = IncrementalJSONParser()
+
+    events = parser.feed('{"dish_name": "Soep", "steps": ["Snijd.", "Kook')
+
+    assert ("field", "dish_name", "Soep") in events
+    assert ("item", "steps", "Snijd.") in events
+    assert not parser.done
@@ -0,0 +1,214 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from openai import APITimeoutError, RateLimitError
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import core.llm as llm
+from core.llm import ResponseCache
+
+
+class StubResponses:
+    """Neppe client.responses: telt upstream-calls, streamt desgewenst."""
+
+    def __init__(self, text="Peet kiest", delay=0.02, first_delta_delay=0.0):
+        self.text = text
+        self.delay = delay
+        self.first_delta_delay = first_delta_delay
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if kwargs.get("stream"):
+            return self._events()
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(output_text=self.text)
+
+    async def _events(self):
+        await asyncio.sleep(self.first_delta_delay)
+        for word in self.text.split(" "):
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(type="response.output_text.delta", delta=word + " ")
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    responses = StubResponses()
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm, "API_KEY", "test")
+    monkeypatch.setattr(llm, "_async_client", SimpleNamespace(responses=responses))
+    monkeypatch.setattr(llm, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(llm, "_backoff", lambda attempt: 0)
+    responses.cache = cache
+    return responses
+
+
+def _astream(context, deltas, timeout=None):
+    return llm._on_client_loop(
+        llm._respond(
+            context,
+            system_prompt=llm.PROMPT,
+            max_output_tokens=1500,
+            messages=llm._TEXT_MESSAGES,
+            timeout=timeout,
+            emit=deltas.append,
+        )
+    )
+
+
+def test_stream_and_plain_call_share_one_upstream_request(stub):
+    deltas, follower = [], []
+
+    async def run():
+        leader = asyncio.ensure_future(_astream("stream-sf", deltas))
+        await asyncio.sleep(0.01)
+        return await asyncio.gather(
+            leader,
+            llm.acall_peet_text("stream-sf"),
+            _astream("stream-sf", follower),
+        )
+
+    results = asyncio.run(run())
+
+    assert stub.calls == 1
+    assert results == ["Peet kiest"] * 3
+    assert "".join(deltas).strip() == "Peet kiest" and len(deltas) == 2
+    assert follower == ["Peet kiest"]
+
+
+def test_finished_stream_is_cached(stub):
+    list(llm.stream_peet_text("stream-cache"))
+    assert "".join(llm.stream_peet_text("stream-cache")) == "Peet kiest"
+    assert llm.call_peet_text("stream-cache") == "Peet kiest"
+    assert stub.calls == 1
+
+
+def test_stream_deadline_covers_the_whole_stream(stub):
+    stub.first_delta_delay = 1.0
+
+    text = "".join(llm.stream_peet_text("stream-timeout", timeout=0.05))
+
+    assert text == llm._TEXT_MESSAGES["timeout"]
+    assert stub.calls == llm.MAX_RETRIES
+    assert stub.cache.get(
+        ResponseCache.make_key(llm.MODEL, llm.PROMPT, "stream-timeout", 1500)
+    ) is None
+
+
+# -------------------------------------------------
+# Async API + retry (stub client)
+# -------------------------------------------------
+def _api_error(cls):
+    # zonder HTTP-response; retry kijkt alleen naar het type
+    return cls.__new__(cls)
+
+
+class FlakyResponses(StubResponses):
+    """Gooit eerst de opgegeven fouten, daarna een normaal antwoord."""
+
+    def __init__(self, errors, text="Peet kiest"):
+        super().__init__(text=text, delay=0)
+        self.errors = list(errors)
+
+    async def create(self, **kwargs):
+        if self.errors:
+            self.calls += 1
+            raise self.errors.pop(0)
+        return await super().create(**kwargs)
+
+
+def test_async_entry_points_work_from_a_foreign_loop(stub):
+    async def run():
+        return await asyncio.gather(
+            llm.acall_peet_text("async-today"),
+            llm.acall_peet_vooruit("async-vooruit", system_prompt="vooruit"),
+        )
+
+    assert asyncio.run(run()) == ["Peet kiest", "Peet kiest"]
+    assert llm.call_peet_vooruit("async-vooruit", system_prompt="vooruit") == "Peet kiest"
+    assert stub.calls == 2
+
+
+def test_retry_recovers_after_transient_errors(stub, monkeypatch):
+    flaky = FlakyResponses([_api_error(APITimeoutError), _api_error(RateLimitError)])
+    waits = []
+    monkeypatch.setattr(llm, "_async_client", SimpleNamespace(responses=flaky))
+    monkeypatch.setattr(llm, "_backoff", lambda attempt: waits.append(attempt) or 0)
+
+    assert llm.call_peet_text("retry-ok") == "Peet kiest"
+    assert flaky.calls == 3
+    assert waits == [1, 2]
+
+
+def test_retry_gives_up_with_flow_message(stub, monkeypatch):
+    flaky = FlakyResponses([_api_error(RateLimitError) for _ in range(llm.MAX_RETRIES)])
+    monkeypatch.setattr(llm, "_async_client", SimpleNamespace(responses=flaky))
+
+    text = asyncio.run(llm.acall_peet_vooruit("retry-fail", system_prompt="vooruit"))
+
+    assert text == llm._VOORUIT_MESSAGES["rate_limit"]
+    assert flaky.calls == llm.MAX_RETRIES
+
+
+def test_backoff_grows_exponentially():
+    for attempt in (1, 2, 3):
+        base = llm.RETRY_DELAY * 2 ** (attempt - 1)
+        assert base * 0.5 <= llm._backoff(attempt) < base * 1.5
+
+
+# -------------------------------------------------
+# Single-flight
+# -------------------------------------------------
+def test_identical_concurrent_calls_make_one_upstream_request(stub):
+    before = llm.coalescing_stats()
+
+    async def run():
+        return await asyncio.gather(*(llm.acall_peet_text("sf-many") for _ in range(8)))
+
+    assert asyncio.run(run()) == ["Peet kiest"] * 8
+    assert stub.calls == 1
+
+    after = llm.coalescing_stats()
+    assert after["calls"] - before["calls"] == 8
+    assert after["coalesced"] - before["coalesced"] == 7
+    assert not llm._inflight
+
+
+def test_cancelled_follower_does_not_cancel_leader(stub):
+    stub.delay = 0.1
+
+    async def run():
+        leader = asyncio.ensure_future(llm.acall_peet_text("sf-cancel"))
+        await asyncio.sleep(0.02)
+        follower = asyncio.ensure_future(llm.acall_peet_text("sf-cancel"))
+        await asyncio.sleep(0.02)
+
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+
+        return await leader
+
+    assert asyncio.run(run()) == "Peet kiest"
+    assert stub.calls == 1
+
+
+def test_cancelled_leader_caller_keeps_call_alive_for_follower(stub):
+    stub.delay = 0.1
+
+    async def run():
+        leader = asyncio.ensure_future(llm.acall_peet_text("sf-leader"))
+        await asyncio.sleep(0.02)
+        follower = asyncio.ensure_future(llm.acall_peet_text("sf-leader"))
+        await asyncio.sleep(0.02)
+
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == "Peet kiest"
+    assert stub.calls == 1
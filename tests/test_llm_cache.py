@@ -0,0 +1,99 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import core.llm as llm
+from core.llm import ResponseCache
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(tmp_path, monkeypatch, **kw):
+    clock = _Clock()
+    monkeypatch.setattr(llm.time, "time", clock)
+    return ResponseCache(str(tmp_path / "llm.sqlite3"), **kw), clock
+
+
+def _put(cache, key, text):
+    cache.put(key, text, model="m", max_output_tokens=10, latency_ms=1.0)
+
+
+def test_cache_hit_counts(tmp_path, monkeypatch):
+    cache, _ = _cache(tmp_path, monkeypatch)
+    key = ResponseCache.make_key("m", "sys", "ctx", 10)
+
+    assert cache.get(key) is None
+    _put(cache, key, "antwoord")
+
+    assert cache.get(key) == "antwoord"
+    assert cache.get(key) == "antwoord"
+    assert cache.stats()["hits"] == 2
+    assert key != ResponseCache.make_key("m", "sys", "ctx", 11)
+
+
+def test_cache_entry_expires_after_ttl(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch, ttl=60)
+    _put(cache, "k", "antwoord")
+
+    clock.now += 59
+    assert cache.get("k") == "antwoord"
+
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch, max_bytes=10)
+
+    _put(cache, "a", "aaaa")
+    clock.now += 1
+    _put(cache, "b", "bbbb")
+    clock.now += 1
+    assert cache.get("a") == "aaaa"  # a is nu recenter dan b
+
+    clock.now += 1
+    _put(cache, "c", "cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+
+
+class _BrokenCache:
+    def get(self, key):
+        raise RuntimeError("database disk image is malformed")
+
+    def put(self, key, text, **meta):
+        raise RuntimeError("database is locked")
+
+
+class _StubResponses:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(output_text="  betaald antwoord  ")
+
+
+def test_broken_cache_never_loses_the_response(monkeypatch):
+    responses = _StubResponses()
+    monkeypatch.setattr(llm, "API_KEY", "test")
+    monkeypatch.setattr(llm, "_async_client", SimpleNamespace(responses=responses))
+    monkeypatch.setattr(llm, "get_response_cache", lambda: _BrokenCache())
+
+    text = asyncio.run(llm.acall_peet_text("broken-cache-context"))
+
+    assert text == "betaald antwoord"
+    assert responses.calls == 1
@@ -0,0 +1,52 @@
+import sys
+import io
+import json
+import logging
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core import logging_utils
+from core.logging_utils import JSONFormatter, get_logger, log_payload, log_stage
+
+
+def _capture(logger):
+    buf = io.StringIO()
+    handler = logging.StreamHandler(buf)
+    handler.setFormatter(JSONFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    return buf, handler
+
+
+def test_stage_logs_json_with_duration_and_fields():
+    log = get_logger("test.stage")
+    buf, handler = _capture(log)
+
+    try:
+        with log_stage(log, "parse", source="stream") as info:
+            info["items"] = 4
+    finally:
+        log.removeHandler(handler)
+
+    row = json.loads(buf.getvalue().splitlines()[-1])
+    assert row["stage"] == "parse"
+    assert row["source"] == "stream" and row["items"] == 4
+    assert row["duration_ms"] >= 0 and row["failed"] is False
+
+
+def test_payloads_only_logged_when_enabled(monkeypatch):
+    log = get_logger("test.payload")
+    buf, handler = _capture(log)
+
+    try:
+        monkeypatch.setattr(logging_utils, "PAYLOADS_ENABLED", False)
+        log_payload(log, "llm json output", {"dish_name": "Soep"})
+        assert buf.getvalue() == ""
+
+        monkeypatch.setattr(logging_utils, "PAYLOADS_ENABLED", True)
+        log_payload(log, "llm json output", {"dish_name": "Soep"})
+        assert "Soep" in buf.getvalue()
+    finally:
+        log.removeHandler(handler)
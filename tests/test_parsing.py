@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine.shared.parsing import Ingredient, parse_ingredient, parse_ingredients
+
+
+def test_parse_ingredient_splits_amount_unit_and_note():
+    ing = parse_ingredient({"amount": "2-3 teentjes, geperst", "item": "knoflook"})
+
+    assert ing == Ingredient(2.0, 3.0, "teentjes", "knoflook", "geperst", "2-3 teentjes")
+    assert ing.label == "knoflook (geperst)"
+
+    # eenheid nooit midden in een woord
+    grote = parse_ingredient({"amount": "2 grote", "item": "uien"})
+    assert (grote.unit, grote.note, grote.amount) == ("", "grote", "2")
+
+    assert parse_ingredient({"amount": "1,5 kg", "item": "aardappelen"}).qty_low == 1.5
+    assert parse_ingredient("200 g kipfilet")[:4] == (200.0, 200.0, "g", "kipfilet")
+
+
+def test_parse_ingredients_keeps_free_text_and_drops_empty_items():
+    rows = parse_ingredients([
+        {"amount": "snufje", "item": "zout"},
+        {"amount": "100 g", "item": ""},
+        None,
+        "peper",
+    ])
+
+    assert [(r.amount, r.label) for r in rows] == [("snufje", "zout"), ("", "peper")]
+    assert rows[0].qty_low is None
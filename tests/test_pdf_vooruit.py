@@ -0,0 +1,75 @@
+import io
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from apps.peet_kiest_vooruit.pdf_vooruit import build_vooruit_pdf, render_vooruit_pdf_bytes, wrap_text
+
+
+def test_wrap_text_fits_width_and_keeps_words():
+    text = "Snijd de ui fijn en fruit hem glazig in een scheut olijfolie. " * 20
+    lines = wrap_text(text, 200)
+
+    assert len(lines) > 1
+    assert all(stringWidth(ln, "Helvetica", 10) <= 200 for ln in lines)
+    assert " ".join(lines).split() == text.split()
+    assert wrap_text("   ", 200) == []
+
+
+def test_wrap_text_splits_overlong_word():
+    lines = wrap_text("kort " + "x" * 200 + " eind", 100)
+
+    assert lines[0] == "kort"
+    assert lines[-1].endswith("eind")
+    assert "".join(lines[1:]).replace(" ", "")[:-4] == "x" * 200
+    assert all(stringWidth(ln, "Helvetica", 10) <= 100 for ln in lines)
+
+
+def test_build_vooruit_pdf_with_long_steps(tmp_path):
+    step = "Laat alles rustig pruttelen en proef tussendoor. " * 15
+    days = [{
+        "day": 1,
+        "kitchen": "NL/BE",
+        "dish_name": "Stamppot",
+        "nutrition": {},
+        "ingredients": [{"amount": "1 kg", "item": "aardappelen"}],
+        "preparation": [step, step],
+    }]
+
+    out = build_vooruit_pdf(str(tmp_path / "v.pdf"), days, 2, [{"zone": "AGF", "item": "ui", "amount": "1"}])
+    assert Path(out).read_bytes().startswith(b"%PDF")
+
+
+def _days(n):
+    step = "Laat alles rustig pruttelen & proef <tussendoor>. " * 40
+    return [{
+        "day": i,
+        "kitchen": "NL/BE",
+        "dish_name": f"Stamppot {i} met worst & jus",
+        "nutrition": {"calories_kcal": 1400},
+        "ingredients": [{"amount": "1 kg", "item": "aardappelen"}],
+        "preparation": [step] * 4,
+    } for i in range(1, n + 1)]
+
+
+def test_platypus_renderer_paginates_and_escapes_markup():
+    data = render_vooruit_pdf_bytes(_days(2), 4, [{"zone": "AGF", "item": "ui", "amount": "2 stuks"}], workers=0)
+
+    assert data.startswith(b"%PDF")
+    assert data.count(b"/Type /Page\n") >= 5  # lange stappen lopen door op vervolgpagina's
+
+
+def test_parallel_sections_merge_to_same_page_count():
+    pypdf = pytest.importorskip("pypdf")
+
+    days = _days(3)
+    sequential = pypdf.PdfReader(io.BytesIO(render_vooruit_pdf_bytes(days, 4, [], workers=0)))
+    parallel = pypdf.PdfReader(io.BytesIO(render_vooruit_pdf_bytes(days, 4, [], workers=2)))
+
+    assert len(parallel.pages) == len(sequential.pages)
+    assert any("Stamppot 3" in page.extract_text() for page in parallel.pages)
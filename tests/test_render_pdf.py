@@ -0,0 +1,55 @@
+import io
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine.render_pdf import get_renderer
+
+
+def test_renderer_is_shared_and_independent_of_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    renderer = get_renderer()
+    assert get_renderer() is renderer
+
+    buf = io.BytesIO()
+    renderer.render(
+        buf,
+        dish_name="Soep",
+        nutrition={},
+        ingredients=[{"amount": "1 l", "item": "bouillon"}],
+        preparation=["Warm op."],
+    )
+
+    assert buf.getvalue().startswith(b"%PDF")
+
+
+def test_pdf_bytes_cached_by_content_with_disk_tier(tmp_path, monkeypatch):
+    from peet_engine import render_pdf
+
+    monkeypatch.setattr(render_pdf, "PDF_CACHE_DIR", str(tmp_path / "pdf"))
+    render_pdf.pdf_cache_clear()
+
+    recipe = dict(
+        dish_name="Stamppot",
+        nutrition={},
+        ingredients=[{"amount": "1 kg", "item": "aardappelen"}],
+        preparation=["Kook.", "Stamp."],
+        persons=2,
+    )
+
+    first = render_pdf.render_plan_pdf_bytes(**recipe)
+    assert first.startswith(b"%PDF")
+    assert render_pdf.render_plan_pdf_bytes(**recipe) is first
+    assert render_pdf.pdf_cache_info()["hits"] == 1
+
+    # andere input → andere sleutel
+    other = dict(recipe, persons=4)
+    assert render_pdf.pdf_cache_key(other) != render_pdf.pdf_cache_key(recipe)
+
+    # geheugen leeg → disk-tier levert dezelfde bytes zonder te renderen
+    render_pdf.pdf_cache_clear()
+    monkeypatch.setattr(render_pdf, "get_renderer", lambda: None)
+    assert render_pdf.render_plan_pdf_bytes(**recipe) == first
@@ -0,0 +1,83 @@
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from peet_engine.shopping import ZONES_ORDER, build_shopping_list, parse_amount, zone_for
+
+
+def test_parse_amount_normalizes_units():
+    assert parse_amount("1,5 kg") == (Fraction(1500), "g")
+    assert parse_amount("2 el") == (Fraction(6), "tl")
+    assert parse_amount("1/2 l") == (Fraction(500), "ml")
+    assert parse_amount("2-3") == (Fraction(3), "stuks")
+    assert parse_amount("snufje") is None
+
+
+def test_shopping_list_merges_days_and_orders_by_zone():
+    days = [
+        {"ingredients": [
+            {"amount": "200 g", "item": "Kipfilet (in reepjes)"},
+            {"amount": "2 el", "item": "olijfolie"},
+            {"amount": "1", "item": "ui"},
+        ]},
+        {"ingredients": [
+            {"amount": "0,5 kg", "item": "kipfilet"},
+            {"amount": "1 tl", "item": "olijfolie"},
+            {"amount": "2", "item": "Ui, gesnipperd"},
+            {"amount": "snufje", "item": "zout"},
+        ]},
+    ]
+
+    rows = {r["item"].lower(): r for r in build_shopping_list(days)}
+
+    assert rows["kipfilet"]["amount"] == "700 g"
+    assert rows["olijfolie"]["amount"] == "7 tl"
+    assert rows["ui"]["amount"] == "3 stuks"
+    assert rows["zout"]["amount"] == "snufje"
+
+    zones = [r["zone"] for r in build_shopping_list(days)]
+    assert zones == sorted(zones, key=ZONES_ORDER.index)
+
+
+def test_zone_for_handles_compounds_and_short_terms():
+    assert zone_for("rundergehakt") == "Vlees/vis/vega"
+    assert zone_for("kokosmelk") == "Houdbaar"
+    assert zone_for("kruimige aardappelen") == "AGF"
+    assert zone_for("rode uien") == "AGF"
+
+
+def test_zone_for_prefers_longest_keyword():
+    assert zone_for("bloemkool") == "AGF"
+    assert zone_for("bloemkoolrijst") == "AGF"
+    assert zone_for("suikerschoten") == "AGF"
+    assert zone_for("eikenbladsla") == "AGF"
+    assert zone_for("bloem") == "Houdbaar"
+
+
+def test_unknown_word_after_number_is_not_summed():
+    assert parse_amount("1 snufje") is None
+    assert parse_amount("1 handje") is None
+    assert parse_amount("2 grote") == (Fraction(2), "stuks")
+
+    days = [
+        {"ingredients": [
+            {"amount": "1 snufje", "item": "zout"},
+            {"amount": "1 handje", "item": "rucola"},
+            {"amount": "1", "item": "ui"},
+        ]},
+        {"ingredients": [
+            {"amount": "1 snufje", "item": "zout"},
+            {"amount": "2", "item": "rode uien"},
+            {"amount": "2 grote", "item": "uien"},
+        ]},
+    ]
+
+    rows = {r["item"].lower(): r for r in build_shopping_list(days)}
+
+    assert rows["zout"]["amount"] == "1 snufje"
+    assert rows["rucola"]["amount"] == "1 handje"
+    assert rows["ui"]["amount"] == "3 stuks"
+    assert rows["rode uien"]["amount"] == "2 stuks"
@@ -0,0 +1,49 @@
+import sys
+import json
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.tracing import Tracer
+
+
+def test_percentiles_and_histogram():
+    tracer = Tracer(samples=1000, trace_file="")
+
+    for ms in range(1, 101):
+        tracer.record("llm", float(ms))
+
+    stats = tracer.summary()["llm"]
+    assert stats["count"] == 100
+    assert (stats["p50"], stats["p95"], stats["p99"], stats["max"]) == (50.0, 95.0, 99.0, 100.0)
+
+    hist = dict(tracer.histogram("llm"))
+    assert hist["≤ 1 ms"] == 1
+    assert hist["≤ 100 ms"] == 50
+    assert sum(hist.values()) == 100
+
+
+def test_request_groups_spans_and_dumps_jsonl(tmp_path):
+    tracer = Tracer(trace_file="")
+
+    @tracer.traced("plan")
+    def plan():
+        return "ok"
+
+    try:
+        with tracer.request("card"):
+            with tracer.span("parse") as info:
+                info["items"] = 3
+            plan()
+            raise RuntimeError("st.stop()")
+    except RuntimeError:
+        pass
+
+    out = tmp_path / "traces.jsonl"
+    assert tracer.dump_jsonl(str(out)) == 1
+
+    row = json.loads(out.read_text(encoding="utf-8"))
+    assert row["name"] == "card"
+    assert [s["stage"] for s in row["stages"]] == ["parse", "plan"]
+    assert row["stages"][0]["items"] == 3
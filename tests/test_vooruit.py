@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from apps.peet_kiest_vooruit.vooruit_context import (
+    MAIN_POOL,
+    compute_kitchen_plan,
+    compute_main_plan,
+)
+from apps.peet_kiest_vooruit.vooruit_days import build_day_prompt
+
+
+def test_main_plan_varies_per_day_and_respects_nogo():
+    for veg in (False, True):
+        for rot in range(3):
+            plan = compute_main_plan(5, rot, veg)
+            assert len(set(plan.values())) == 5
+
+    plan = compute_main_plan(4, 0, False, ["vis"])
+    assert "vis" not in plan.values()
+
+
+def test_main_plan_rotates_over_pool_shrunk_by_nogo():
+    plan = compute_main_plan(5, 1, False, ["kip", "vis", "rund"])
+
+    assert set(plan.values()) == {"vega", "varkensvlees"}
+    assert all(plan[d] != plan[d + 1] for d in range(1, 5))
+
+    # alles geblokkeerd → niets vastpinnen
+    assert set(compute_main_plan(5, 0, False, MAIN_POOL).values()) == {""}
+
+
+def test_main_plan_never_pins_an_allergen():
+    for rot in range(5):
+        plan = compute_main_plan(5, rot, False, allergies=["vis"])
+        assert "vis" not in plan.values()
+
+        plan = compute_main_plan(5, rot, True, allergies=["eieren", "lactose"])
+        assert not {"ei", "kaas"} & set(plan.values())
+
+    context = {
+        "days": 2,
+        "persons": 2,
+        "vegetarian": False,
+        "allergies": ["vis"],
+        "nogo": ["kip", "rund", "vega", "varkensvlees"],
+        "fridge": "",
+        "kitchen_plan": compute_kitchen_plan(2, 0),
+        "main_plan": compute_main_plan(2, 0, False, ["kip", "rund", "vega", "varkensvlees"], ["vis"]),
+    }
+
+    assert "- gebruik: vrij" in build_day_prompt(context, 1)
+
+
+def test_day_prompt_excludes_other_days_main_components():
+    context = {
+        "days": 3,
+        "persons": 2,
+        "vegetarian": False,
+        "allergies": [],
+        "nogo": [],
+        "fridge": "",
+        "kitchen_plan": compute_kitchen_plan(3, 0),
+        "main_plan": {1: "kip", 2: "vis", 3: "rund"},
+    }
+
+    prompt = build_day_prompt(context, 2)
+
+    assert "- gebruik: vis" in prompt
+    assert "niet gebruiken (andere dagen): kip, rund" in prompt
+    assert "KEUKEN: Italiaans" in prompt
@@ -0,0 +1,100 @@
+import json
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Zorg dat projectroot in sys.path zit
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from apps.peet_kiest_vooruit import vooruit_images
+from apps.peet_kiest_vooruit.vooruit_images import (
+    FALLBACK_IMAGE_URL,
+    UrlCache,
+    resolve_image_urls,
+    simplify_dish_name,
+)
+
+
+@pytest.fixture
+def pexels_stub(monkeypatch):
+    """Lokale Pexels-stub: 0,3 s per request; "fail" in de query → 500."""
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)["query"][0]
+            calls.append(query)
+            time.sleep(0.3)
+
+            if "fail" in query:
+                self.send_response(500)
+                self.end_headers()
+                return
+
+            photos = [] if "nothing" in query else [
+                {"src": {"landscape": f"https://img.test/{urllib.parse.quote(query)}"}}
+            ]
+            body = json.dumps({"photos": photos}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("PEXELS_API_KEY", "test")
+    monkeypatch.setattr(vooruit_images, "PEXELS_URL", f"http://127.0.0.1:{server.server_port}/v1/search")
+
+    yield calls
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_days_are_resolved_concurrently_and_cached(pexels_stub, tmp_path):
+    cache = UrlCache(str(tmp_path / "urls.json"), ttl_s=3600)
+    dishes = ["Zalm met prei", "Witloof met ham", "Boerenkool stamppot", "Mosselen met friet", "Kabeljauw"]
+
+    start = time.perf_counter()
+    urls = resolve_image_urls(dishes, cache=cache)
+    elapsed = time.perf_counter() - start
+
+    assert len(pexels_stub) == 5
+    assert elapsed < 1.0  # sequentieel ≥ 1,5 s
+    assert urls[0] == "https://img.test/" + urllib.parse.quote(simplify_dish_name(dishes[0]))
+
+    # nieuwe cache-instantie leest van disk → geen requests meer
+    again = resolve_image_urls(dishes, cache=UrlCache(str(tmp_path / "urls.json"), ttl_s=3600))
+    assert again == urls
+    assert len(pexels_stub) == 5
+
+
+def test_errors_fall_back_without_caching(pexels_stub, tmp_path):
+    cache = UrlCache(str(tmp_path / "urls.json"), ttl_s=3600)
+
+    assert resolve_image_urls(["fail soep", "nothing burger"], cache=cache) == [FALLBACK_IMAGE_URL] * 2
+
+    resolve_image_urls(["fail soep", "nothing burger"], cache=cache)
+    assert pexels_stub.count(simplify_dish_name("fail soep")) == 2
+    assert pexels_stub.count(simplify_dish_name("nothing burger")) == 1
+
+
+def test_expired_entries_are_refetched(pexels_stub, tmp_path):
+    cache = UrlCache(str(tmp_path / "urls.json"), ttl_s=0)
+
+    resolve_image_urls(["Zalm"], cache=cache)
+    time.sleep(0.01)
+    resolve_image_urls(["Zalm"], cache=cache)
+
+    assert len(pexels_stub) == 2